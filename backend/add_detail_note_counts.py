@@ -0,0 +1,68 @@
+import sys
+import os
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import func, inspect, text
+from app.db import engine, SessionLocal
+from app.models import PhaseDetail, PhaseDetailNote
+
+def migrate():
+    """
+    phase_details.note_count, phase_detail_notes.author_id kolonlarını ve not indekslerini
+    ekler; SQLite ve MySQL'de çalışır. Eski notların author_id'si boş kalır (yazar adı
+    benzersiz olmadığından eşlenmez); bu notları yalnızca proje yöneticileri silebilir.
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns("phase_details")}
+    if "note_count" in existing:
+        print("Column 'note_count' already exists.")
+    else:
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("ALTER TABLE phase_details ADD COLUMN note_count INTEGER NOT NULL DEFAULT 0"))
+                conn.commit()
+                print("Column 'note_count' added.")
+            except Exception as e:
+                print(f"Error adding 'note_count': {e}")
+    note_columns = {c["name"] for c in inspect(engine).get_columns("phase_detail_notes")}
+    if "author_id" in note_columns:
+        print("Column 'author_id' already exists.")
+    else:
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("ALTER TABLE phase_detail_notes ADD COLUMN author_id INTEGER NULL REFERENCES users(id) ON DELETE SET NULL"))
+                conn.commit()
+                print("Column 'author_id' added.")
+            except Exception as e:
+                print(f"Error adding 'author_id': {e}")
+    for index in PhaseDetailNote.__table__.indexes:
+        try:
+            index.create(bind=engine, checkfirst=True)
+            print(f"Index {index.name} ok.")
+        except Exception as e:
+            print(f"Error creating {index.name}: {e}")
+
+def backfill():
+    """note_count'u mevcut notlardan (gruplu tek sorgu) yeniden yazar."""
+    db = SessionLocal()
+    try:
+        counts = dict(
+            db.query(PhaseDetailNote.detail_id, func.count(PhaseDetailNote.id))
+            .group_by(PhaseDetailNote.detail_id)
+            .all()
+        )
+        db.query(PhaseDetail).update(
+            {PhaseDetail.note_count: 0, PhaseDetail.updated_at: PhaseDetail.updated_at},
+            synchronize_session=False,
+        )
+        if counts:
+            db.bulk_update_mappings(PhaseDetail, [{"id": i, "note_count": n} for i, n in counts.items()])
+        db.commit()
+        print(f"{len(counts)} detail(s) with notes updated.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
+    backfill()
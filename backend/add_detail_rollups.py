@@ -0,0 +1,35 @@
+import sys
+import os
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import inspect, text
+from app.db import engine
+
+COLUMNS = (
+    ("rollup_effort", "NUMERIC(12, 2) NOT NULL DEFAULT 0"),
+    ("rollup_total", "INTEGER NOT NULL DEFAULT 0"),
+    ("rollup_done", "INTEGER NOT NULL DEFAULT 0"),
+    ("rollup_start", "DATETIME NULL"),
+    ("rollup_end", "DATETIME NULL"),
+)
+
+def migrate():
+    """phase_details tablosuna alt ağaç toplam kolonlarını ekler; SQLite ve MySQL'de çalışır.
+    Değerleri doldurmak için ardından rebuild_detail_rollups.py çalıştırılmalı."""
+    existing = {c["name"] for c in inspect(engine).get_columns("phase_details")}
+    with engine.connect() as conn:
+        for name, ddl in COLUMNS:
+            if name in existing:
+                print(f"Column '{name}' already exists.")
+                continue
+            try:
+                conn.execute(text(f"ALTER TABLE phase_details ADD COLUMN {name} {ddl}"))
+                conn.commit()
+                print(f"Column '{name}' added.")
+            except Exception as e:
+                print(f"Error adding '{name}': {e}")
+
+if __name__ == "__main__":
+    migrate()
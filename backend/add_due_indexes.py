@@ -0,0 +1,26 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import engine
+from app.models import PhaseDetail, PhaseTask, Project
+
+def migrate():
+    """
+    Gecikme taraması için yalnızca açık kayıtları kapsayan indeksleri mevcut
+    veritabanına ekler (due_digest tablosu create_all ile oluşur).
+    """
+    for model in (Project, PhaseTask, PhaseDetail):
+        for index in model.__table__.indexes:
+            if not index.name.endswith(("_open_end", "_open_due")):
+                continue
+            try:
+                index.create(bind=engine, checkfirst=True)
+                print(f"Index {index.name} ok.")
+            except Exception as e:
+                print(f"Error creating {index.name}: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,54 @@
+import sys
+import os
+import hashlib
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import inspect, text
+from app.db import engine, SessionLocal
+from app.models import ProjectFile
+
+CHUNK_SIZE = 1024 * 1024
+
+def migrate():
+    """project_files.sha256 kolonunu ve indeksini ekler; SQLite ve MySQL'de çalışır."""
+    existing = {c["name"] for c in inspect(engine).get_columns("project_files")}
+    if "sha256" in existing:
+        print("Column 'sha256' already exists.")
+    else:
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("ALTER TABLE project_files ADD COLUMN sha256 VARCHAR(64) NULL"))
+                conn.commit()
+                print("Column 'sha256' added.")
+            except Exception as e:
+                print(f"Error adding 'sha256': {e}")
+    for index in ProjectFile.__table__.indexes:
+        if "sha256" in index.columns:
+            index.create(bind=engine, checkfirst=True)
+            print(f"Index {index.name} ok.")
+
+def backfill():
+    """sha256'sı boş dosyaların özetini diskteki içerikten (parça parça okuyarak) hesaplar."""
+    db = SessionLocal()
+    try:
+        done = missing = 0
+        for pf in db.query(ProjectFile).filter(ProjectFile.sha256.is_(None)):
+            if not os.path.exists(pf.stored_path):
+                missing += 1
+                continue
+            h = hashlib.sha256()
+            with open(pf.stored_path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    h.update(chunk)
+            pf.sha256 = h.hexdigest()
+            done += 1
+        db.commit()
+        print(f"{done} file(s) hashed, {missing} missing on disk.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
+    backfill()
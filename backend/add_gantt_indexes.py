@@ -0,0 +1,25 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import engine
+from app.models import PhaseDetail
+
+def migrate():
+    """
+    GET /projects/{pid}/gantt tarih penceresi indeksini mevcut veritabanına ekler.
+    (create_all var olan tablolara indeks eklemez.)
+    """
+    for index in PhaseDetail.__table__.indexes:
+        if "start_date" not in index.columns:
+            continue
+        try:
+            index.create(bind=engine, checkfirst=True)
+            print(f"Index {index.name} ok.")
+        except Exception as e:
+            print(f"Error creating {index.name}: {e}")
+
+if __name__ == "__main__":
+    migrate()
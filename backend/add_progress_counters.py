@@ -0,0 +1,29 @@
+import sys
+import os
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import inspect, text
+from app.db import engine
+
+COLUMNS = ("detail_total", "detail_done", "task_total", "task_done")
+
+def migrate():
+    """project_phases tablosuna ilerleme sayaç kolonlarını ekler; SQLite ve MySQL'de çalışır.
+    Değerleri doldurmak için ardından rebuild_progress.py çalıştırılmalı."""
+    existing = {c["name"] for c in inspect(engine).get_columns("project_phases")}
+    with engine.connect() as conn:
+        for name in COLUMNS:
+            if name in existing:
+                print(f"Column '{name}' already exists.")
+                continue
+            try:
+                conn.execute(text(f"ALTER TABLE project_phases ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+                conn.commit()
+                print(f"Column '{name}' added.")
+            except Exception as e:
+                print(f"Error adding '{name}': {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,33 @@
+import sys
+import os
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import inspect, text
+from app.db import engine
+
+COLUMNS = {
+    "member_count": "INTEGER NOT NULL DEFAULT 0",
+    "owner_name": "VARCHAR(120) NULL",
+    "department_name": "VARCHAR(120) NULL",
+}
+
+def migrate():
+    """projects tablosuna denormalize özet kolonlarını ekler; SQLite ve MySQL'de çalışır.
+    Değerleri doldurmak için ardından repair_project_summary.py çalıştırılmalı."""
+    existing = {c["name"] for c in inspect(engine).get_columns("projects")}
+    with engine.connect() as conn:
+        for name, ddl in COLUMNS.items():
+            if name in existing:
+                print(f"Column '{name}' already exists.")
+                continue
+            try:
+                conn.execute(text(f"ALTER TABLE projects ADD COLUMN {name} {ddl}"))
+                conn.commit()
+                print(f"Column '{name}' added.")
+            except Exception as e:
+                print(f"Error adding '{name}': {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,25 @@
+import sys
+import os
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import inspect, text
+from app.db import engine
+
+def migrate():
+    """projects.version (ETag sayacı) kolonunu ekler; SQLite ve MySQL'de çalışır."""
+    columns = {c["name"] for c in inspect(engine).get_columns("projects")}
+    if "version" in columns:
+        print("Column 'version' already exists.")
+        return
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("ALTER TABLE projects ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+            conn.commit()
+            print("Column 'version' added.")
+        except Exception as e:
+            print(f"Error: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,75 @@
+import sys
+import os
+from itertools import groupby
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import inspect, text
+from app.db import engine, SessionLocal
+from app.core.ordering import RANK_KEY_LENGTH, append_rank, keys_between
+from app.models import PhaseDetail, PhaseTask, ProjectPhase
+
+# model → kapsam kolonları (aynı kapsamdaki satırlar birbirine göre sıralanır)
+SCOPES = (
+    (ProjectPhase, ("project_id",)),
+    (PhaseTask, ("phase_id",)),
+    (PhaseDetail, ("phase_id", "parent_id")),
+)
+
+def add_columns():
+    """rank_key kolonlarını ve (kapsam, rank_key) indekslerini ekler; SQLite ve MySQL'de çalışır."""
+    for model, _ in SCOPES:
+        table = model.__tablename__
+        existing = {c["name"] for c in inspect(engine).get_columns(table)}
+        if "rank_key" in existing:
+            print(f"Column '{table}.rank_key' already exists.")
+        else:
+            with engine.connect() as conn:
+                try:
+                    conn.execute(text(
+                        f"ALTER TABLE {table} ADD COLUMN rank_key VARCHAR({RANK_KEY_LENGTH}) NOT NULL DEFAULT ''"
+                    ))
+                    conn.commit()
+                    print(f"Column '{table}.rank_key' added.")
+                except Exception as e:
+                    print(f"Error adding '{table}.rank_key': {e}")
+        for index in model.__table__.indexes:
+            if "rank_key" in index.columns:
+                index.create(bind=engine, checkfirst=True)
+                print(f"Index {index.name} ok.")
+
+def backfill():
+    """
+    Boş rank_key'leri eski (sort_order, id) sırasına göre doldurur.
+    Kapsamın tümü yeniden yazılır ki mevcut (boş olmayan) anahtarlarla çakışmasın.
+    """
+    db = SessionLocal()
+    try:
+        for model, scope_cols in SCOPES:
+            cols = [getattr(model, c) for c in scope_cols]
+            pending = {
+                tuple(row) for row in db.query(*cols).filter(model.rank_key == "").distinct()
+            }
+            rows = (
+                db.query(*cols, model.id)
+                .order_by(*cols, model.sort_order.asc(), model.id.asc())
+                .all()
+            )
+            mappings = []
+            for scope, group in groupby(rows, key=lambda r: tuple(r[:-1])):
+                if scope not in pending:
+                    continue
+                ids = [r[-1] for r in group]
+                keys = keys_between(None, append_rank(), len(ids))
+                mappings.extend({"id": i, "rank_key": k} for i, k in zip(ids, keys))
+            if mappings:
+                db.bulk_update_mappings(model, mappings)
+            db.commit()
+            print(f"{model.__tablename__}: {len(pending)} scope(s), {len(mappings)} row(s) backfilled.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    add_columns()
+    backfill()
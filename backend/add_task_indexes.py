@@ -0,0 +1,23 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import engine
+from app.models import PhaseTask
+
+def migrate():
+    """
+    /me/tasks ve /users/{id}/tasks için (assignee_id, status, due_date) indeksini
+    mevcut veritabanına ekler. (create_all var olan tablolara indeks eklemez.)
+    """
+    for index in PhaseTask.__table__.indexes:
+        try:
+            index.create(bind=engine, checkfirst=True)
+            print(f"Index {index.name} ok.")
+        except Exception as e:
+            print(f"Error creating {index.name}: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,113 @@
+# backend/app/core/access_index.py
+"""
+Kullanıcı başına erişilebilir proje indeksi (user_project_access).
+
+Satır = kullanıcı projenin sahibi (Project.owner_id) ya da üyesi.
+Admin / departman başkanı görünürlüğü burada tutulmaz; onlar zaten
+tek koşullu sorgularla (filtre yok / department_id) okunur.
+
+Yazma yolları (üye ekleme/çıkarma, proje oluşturma/silme, owner değişimi)
+aynı transaction içinde grant/revoke/sync çağırır. Okuma tarafında
+accessible_project_ids() sık gelen kullanıcılar için süreç içi önbellekli
+bir frozenset döner.
+"""
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.orm import Query, Session
+
+from app.core.cache import TTLCache, invalidate_on_commit
+from app.core.config import settings
+from app.models import Project, ProjectMember, UserProjectAccess
+
+_ids_cache = TTLCache(
+    maxsize=getattr(settings, "ACCESS_INDEX_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "ACCESS_INDEX_CACHE_TTL_SECONDS", 120),
+)
+
+# Bu sayının üstünde IN listesi yerine indeks tablosuna subquery kullanılır
+_IN_LIST_LIMIT = 500
+
+
+def _touch(db: Session, *user_ids: int) -> None:
+    """Önbelleği hemen ve commit sonrasında tekrar düşür."""
+    def _pop() -> None:
+        for uid in user_ids:
+            _ids_cache.pop(uid)
+    invalidate_on_commit(db, _pop)
+
+
+# ---------------- yazma tarafı ----------------
+def grant_access(db: Session, project_id: int, user_id: int) -> None:
+    if db.get(UserProjectAccess, (user_id, project_id)) is None:
+        db.add(UserProjectAccess(user_id=user_id, project_id=project_id))
+    _touch(db, user_id)
+
+
+def revoke_access(db: Session, project_id: int, user_id: int) -> None:
+    db.query(UserProjectAccess).filter_by(user_id=user_id, project_id=project_id).delete(
+        synchronize_session=False
+    )
+    _touch(db, user_id)
+
+
+def sync_access(db: Session, project_id: int, user_id: int) -> None:
+    """Tek bir (kullanıcı, proje) çiftini owner/üyelik durumuna göre yeniden hesaplar."""
+    db.flush()
+    is_owner = db.query(Project.id).filter(
+        Project.id == project_id, Project.owner_id == user_id
+    ).first() is not None
+    is_member = db.query(ProjectMember.id).filter(
+        ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
+    ).first() is not None
+    if is_owner or is_member:
+        grant_access(db, project_id, user_id)
+    else:
+        revoke_access(db, project_id, user_id)
+
+
+def drop_project_access(db: Session, project_id: int) -> None:
+    """Proje silinirken indeks satırlarını temizler (SQLite FK cascade'e güvenmeyiz)."""
+    uids = [uid for (uid,) in db.query(UserProjectAccess.user_id).filter_by(project_id=project_id)]
+    db.query(UserProjectAccess).filter_by(project_id=project_id).delete(synchronize_session=False)
+    _touch(db, *uids)
+
+
+def rebuild_access_index(db: Session) -> int:
+    """Tüm indeksi owner_id + project_members'tan toplu olarak yeniden kurar."""
+    db.query(UserProjectAccess).delete(synchronize_session=False)
+    pairs = {
+        (uid, pid)
+        for uid, pid in db.query(Project.owner_id, Project.id).filter(Project.owner_id.isnot(None))
+    }
+    pairs.update(db.query(ProjectMember.user_id, ProjectMember.project_id).all())
+    if pairs:
+        db.execute(
+            UserProjectAccess.__table__.insert(),
+            [{"user_id": uid, "project_id": pid} for uid, pid in pairs],
+        )
+    _ids_cache.clear()
+    return len(pairs)
+
+
+# ---------------- okuma tarafı ----------------
+def accessible_project_ids(db: Session, user_id: int) -> frozenset:
+    """Kullanıcının sahibi/üyesi olduğu proje id'leri (önbellekli)."""
+    ids = _ids_cache.get(user_id)
+    if ids is None:
+        ids = frozenset(
+            pid for (pid,) in db.query(UserProjectAccess.project_id).filter(
+                UserProjectAccess.user_id == user_id
+            )
+        )
+        _ids_cache.set(user_id, ids)
+    return ids
+
+
+def filter_accessible(q: Query, db: Session, user_id: int) -> Query:
+    """Project sorgusunu kullanıcının sahibi/üyesi olduğu projelerle sınırlar."""
+    ids = accessible_project_ids(db, user_id)
+    if len(ids) <= _IN_LIST_LIMIT:
+        return q.filter(Project.id.in_(ids))
+    sub = select(UserProjectAccess.project_id).where(UserProjectAccess.user_id == user_id)
+    return q.filter(Project.id.in_(sub))
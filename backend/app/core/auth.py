@@ -1,16 +1,21 @@
 # backend/app/core/auth.py
 
 from datetime import datetime, timedelta, timezone
+import time
 from typing import Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from starlette.concurrency import run_in_threadpool
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.db import get_db
+from app.core.hashing import hashing_pool
+from app.db import SessionLocal, get_db
 from app.models import User
 
 # Swagger "Authorize" butonu bu endpointten token alacak
@@ -49,37 +54,93 @@ get_password_hash = hash_password
 # -----------------------------
 # Kimlik doğrulama
 # -----------------------------
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    # DEBUG: gerekirse bırak, üretimde yorum satırı yapabilirsin
-    print(f"AUTH DEBUG: lookup email -> {email}")
+def _is_inactive(user: User) -> bool:
+    # Şemanda is_active yoksa sorun değil; varsa kontrol et
+    return hasattr(user, "is_active") and getattr(user, "is_active") in (0, False)
 
+
+def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    """
+    Senkron doğrulama (script'ler için). Hash yükseltmesi burada yapılmaz;
+    login akışı bunu upgrade_password_hash ile yanıt sonrasına erteler.
+    """
     user = db.query(User).filter(User.email == email).first()
-    print("AUTH DEBUG: user found?", bool(user))
     if not user:
         return None
-
-    ok = verify_password(password, user.password_hash)
-    print("AUTH DEBUG: verify password =", ok, "| hash prefix =", (user.password_hash or "")[:7])
-    if not ok:
+    if not verify_password(password, user.password_hash):
+        return None
+    if _is_inactive(user):
         return None
+    return user
+
 
-    # Eski hash'leri girişte otomatik bcrypt'e yükselt (opsiyonel)
+def _load_login_user(db: Session, email: str) -> Optional[User]:
+    """
+    Kullanıcıyı okur, session'dan ayırır ve transaction'ı kapatır: bağlantı
+    bcrypt beklenirken havuza döner. Ayrılan nesnenin yüklü kolonları okunabilir.
+    """
     try:
-        if pwd_context.needs_update(user.password_hash):
-            user.password_hash = hash_password(password)
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            print("AUTH DEBUG: password hash migrated to bcrypt")
+        user = db.query(User).filter(User.email == email).first()
+        if user is not None:
+            db.expunge(user)
+    finally:
+        db.rollback()
+    return user
+
+
+async def authenticate_user_async(
+    db: Session, email: str, password: str
+) -> tuple[Optional[User], bool]:
+    """
+    /auth/login için: bcrypt doğrulaması ayrılmış hash havuzunda çalışır.
+    (user, needs_rehash) döner; needs_rehash True ise çağıran taraf
+    upgrade_password_hash'i arka plan işi olarak planlamalı.
+
+    Havuzda yer sorgudan önce ayrılır (doluysa DB'ye hiç gidilmeden 503);
+    DB bağlantısı bcrypt beklenirken tutulmaz.
+    """
+    with hashing_pool.slot():
+        user = await run_in_threadpool(_load_login_user, db, email)
+        print("AUTH DEBUG: user found?", bool(user))
+        if not user:
+            return None, False
+        ok = await hashing_pool.submit(verify_password, password, user.password_hash)
+
+    if not ok or _is_inactive(user):
+        return None, False
+
+    try:
+        needs_rehash = pwd_context.needs_update(user.password_hash)
     except Exception:
-        # migrasyon başarısız olursa login'i engelleme
-        pass
+        needs_rehash = False
+    return user, needs_rehash
 
-    # Şemanda is_active yoksa sorun değil; varsa kontrol et
-    if hasattr(user, "is_active") and getattr(user, "is_active") in (0, False):
-        return None
 
-    return user
+async def upgrade_password_hash(user_id: int, old_hash: str, password: str) -> None:
+    """
+    Eski hash'i (ör. pbkdf2) bcrypt'e yükseltir. Login yanıtı döndükten sonra
+    BackgroundTasks ile çalışır; hata olursa sessizce bir sonraki login'e kalır.
+    """
+    try:
+        new_hash = await hashing_pool.run(hash_password, password)
+    except HTTPException:
+        return  # havuz dolu → sonraki girişte tekrar denenir
+
+    def _store() -> None:
+        db = SessionLocal()
+        try:
+            # Arada parola değiştiyse üzerine yazma
+            db.query(User).filter(
+                User.id == user_id, User.password_hash == old_hash
+            ).update({"password_hash": new_hash}, synchronize_session=False)
+            db.commit()
+            print("AUTH DEBUG: password hash migrated to bcrypt")
+        except Exception:
+            db.rollback()
+        finally:
+            db.close()
+
+    await run_in_threadpool(_store)
 
 # -----------------------------
 # JWT üretimi
@@ -106,6 +167,91 @@ def create_access_token(
 
     return jwt.encode(payload, secret, algorithm=alg)
 
+# -----------------------------
+# Principal önbelleği
+# -----------------------------
+# token subject (e-posta ya da id) → User kolon değerleri (password_hash hariç).
+# Kayıt ömrü token'ın exp'ini ve PRINCIPAL_CACHE_TTL_SECONDS'ı aşmaz.
+# Geçersizleştirme süreç içidir ve yalnızca ORM flush'ında (after_update) tetiklenir:
+# toplu Query.update ya da başka bir worker'daki değişiklik (ör. kullanıcıyı pasife
+# alma) diğer süreçlerde ancak TTL dolunca etkili olur. Çok worker'lı kurulumda
+# gecikme kabul edilemiyorsa PRINCIPAL_CACHE_TTL_SECONDS düşürülmeli (0 → kapalı).
+_principal_cache = TTLCache(
+    maxsize=getattr(settings, "PRINCIPAL_CACHE_SIZE", 2048),
+    ttl=getattr(settings, "PRINCIPAL_CACHE_TTL_SECONDS", 300),
+)
+
+# Değişince yetkilendirme sonucunu etkileyen User alanları (name: not yazarı gösterimi)
+_PRINCIPAL_FIELDS = ("role", "department_id", "is_active", "email", "name")
+
+# Önbelleğe hiç yazılmayan kolonlar; erişilirse DB'den yüklenir
+_PRINCIPAL_EXCLUDED = frozenset({"password_hash"})
+
+
+def _user_snapshot(user: User) -> dict:
+    return {
+        attr.key: getattr(user, attr.key)
+        for attr in sa_inspect(User).column_attrs
+        if attr.key not in _PRINCIPAL_EXCLUDED
+    }
+
+
+def _user_from_snapshot(db: Session, snapshot: dict) -> User:
+    """Önbellekteki değerlerden, SELECT atmadan bu session'a bağlı bir User üretir."""
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def invalidate_principal(*subjects) -> None:
+    """Verilen subject'lere (e-posta / id) ait önbellek kayıtlarını siler."""
+    for subject in subjects:
+        if subject is not None:
+            _principal_cache.pop(str(subject))
+
+
+def _principal_keys(target: User) -> set:
+    keys = {str(target.id), target.email}
+    old_emails = sa_inspect(target).attrs.email.history.deleted or ()
+    keys.update(e for e in old_emails if e)
+    return keys
+
+
+@event.listens_for(User, "after_update")
+def _on_user_update(mapper, connection, target: User):
+    state = sa_inspect(target)
+    changed = any(
+        name in state.attrs and state.attrs[name].history.has_changes()
+        for name in _PRINCIPAL_FIELDS
+    )
+    if not changed:
+        return
+    keys = _principal_keys(target)
+    invalidate_principal(*keys)
+    # commit'ten önce başka bir istek eski satırı tekrar önbelleğe alabilir;
+    # commit sonrasında bir kez daha temizle.
+    session = state.session
+    if session is not None:
+        session.info.setdefault("principal_invalidate", set()).update(keys)
+
+
+@event.listens_for(User, "after_delete")
+def _on_user_delete(mapper, connection, target: User):
+    invalidate_principal(*_principal_keys(target))
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_principal_invalidations(session: Session):
+    keys = session.info.pop("principal_invalidate", None)
+    if keys:
+        invalidate_principal(*keys)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_principal_invalidations(session: Session, previous_transaction):
+    session.info.pop("principal_invalidate", None)
+
+
 # -----------------------------
 # Protected endpoint'lerde current user
 # -----------------------------
@@ -116,6 +262,8 @@ def get_current_user(
     """
     Authorization: Bearer <token> header'ındaki JWT'yi çözer.
     'sub' e-posta ya da kullanıcı id olabilir.
+    Kullanıcı, token subject'i ile principal önbelleğinden okunur;
+    önbellekte yoksa DB'den çekilip önbelleğe yazılır.
     """
     credentials_exc = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -133,6 +281,11 @@ def get_current_user(
     except JWTError:
         raise credentials_exc
 
+    subject = str(subject)
+    cached = _principal_cache.get(subject)
+    if cached is not None:
+        return _user_from_snapshot(db, cached)
+
     # Önce e-posta gibi dene
     user = db.query(User).filter(User.email == subject).first()
     if not user:
@@ -148,7 +301,11 @@ def get_current_user(
         raise credentials_exc
 
     # Eğer is_active sütunu varsa ve false ise 401 ver
-    if hasattr(user, "is_active") and getattr(user, "is_active") in (0, False):
+    if _is_inactive(user):
         raise credentials_exc
 
+    exp = payload.get("exp")
+    ttl = (float(exp) - time.time()) if exp is not None else None
+    _principal_cache.set(subject, _user_snapshot(user), ttl=ttl)
+
     return user
\ No newline at end of file
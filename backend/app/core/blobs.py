@@ -0,0 +1,124 @@
+# backend/app/core/blobs.py
+"""
+Proje dosyaları için içerik adresli (SHA-256) ve tekilleştirilmiş depo.
+
+Blob yolu: UPLOAD_DIR/blobs/ab/cd/abcd...  (iki seviyeli shard; dizin başına dosya sayısı sınırlı)
+Yüklemeler önce UPLOAD_DIR/blobs/tmp altına ".part" olarak yazılır (aynı dosya sistemi → atomik taşıma).
+file_blobs.ref_count, içeriğe işaret eden ProjectFile satırı sayısıdır.
+
+Dosyanın diskte olup olmadığına, yalnızca file_blobs satırının kilidi tutulurken karar verilir:
+  - yükleme : acquire_blob / register_blob (satır kilitlenir) → place_blob (dosya yoksa
+              part yerine taşınır, varsa part silinir) → commit
+  - silme   : release_blob ref_count'u düşürür (sıfırda satır silinmez) → commit →
+              remove_unreferenced ayrı kısa bir transaction'da satırı yalnızca
+              ref_count hâlâ 0 ise siler, dosyayı bu kilit altında kaldırır → commit
+Böylece "kontrol et, sonra sil" ile eşzamanlı bir yeniden kullanım arasında yarış kalmaz:
+ya yükleme satırı önce kilitler (silme 0 satır görür, dosyaya dokunmaz) ya da silme
+önce biter (yükleme satırı yeniden ekler ve dosyayı kendi part'ından yerine koyar).
+Blob'a taşınmamış eski dosyalar (projects/{pid}/<uuid>) paylaşılmaz; silinince doğrudan kaldırılır.
+Eski dosyaları taşımak / artıkları temizlemek için: rebuild_file_blobs.py
+"""
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import UPLOAD_DIR
+from app.models import FileBlob, ProjectFile
+
+BLOB_ROOT = os.path.join(UPLOAD_DIR, "blobs")
+BLOB_TMP = os.path.join(BLOB_ROOT, "tmp")
+
+
+def blob_path(sha256: str) -> str:
+    return os.path.join(BLOB_ROOT, sha256[:2], sha256[2:4], sha256)
+
+
+def _blob_sha(path: str) -> Optional[str]:
+    """path bir blob yoluysa sha256'sını döner."""
+    sha = os.path.basename(path)
+    return sha if len(sha) == 64 and path == blob_path(sha) else None
+
+
+def acquire_blob(db: Session, sha256: str) -> bool:
+    """Mevcut blob'a bir referans ekler (satırı kilitler); satır yoksa False (çağıran register_blob'u çağırır)."""
+    result = db.execute(
+        update(FileBlob).where(FileBlob.sha256 == sha256).values(ref_count=FileBlob.ref_count + 1)
+    )
+    return result.rowcount > 0
+
+
+def register_blob(db: Session, sha256: str, size_bytes: int) -> bool:
+    """
+    Yeni blob'u ref_count=1 ile kaydeder; True → yeni satır.
+    Aynı içerik eşzamanlı başka bir yüklemeyle kaydedildiyse ona referans eklenir (False).
+    """
+    try:
+        with db.begin_nested():
+            db.add(FileBlob(sha256=sha256, size_bytes=size_bytes, ref_count=1))
+    except IntegrityError:
+        acquire_blob(db, sha256)
+        return False
+    return True
+
+
+def place_blob(part_path: str, sha256: str) -> None:
+    """
+    acquire_blob/register_blob'dan sonra, aynı transaction içinde çağrılır:
+    blob diskte yoksa part yerine taşınır, varsa part silinir.
+    """
+    target = blob_path(sha256)
+    if os.path.exists(target):
+        os.remove(part_path)
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(part_path, target)
+
+
+def release_blob(db: Session, pf: ProjectFile) -> Optional[str]:
+    """
+    Dosya kaydının referansını bırakır; commit'ten sonra remove_unreferenced'a verilecek yolu döner
+    (son referanssa blob yolu, blob'a taşınmamış eski dosyada kendi yolu, aksi halde None).
+    """
+    if pf.sha256 and pf.stored_path == blob_path(pf.sha256):
+        released = db.execute(
+            update(FileBlob).where(FileBlob.sha256 == pf.sha256).values(ref_count=FileBlob.ref_count - 1)
+        ).rowcount
+        if released:
+            left = db.scalar(select(FileBlob.ref_count).where(FileBlob.sha256 == pf.sha256))
+            return blob_path(pf.sha256) if (left or 0) <= 0 else None
+    return pf.stored_path
+
+
+def remove_unreferenced(db: Session, path: str) -> None:
+    """
+    release_blob'un commit'inden sonra çağrılır. Blob için: satır ref_count hâlâ 0 ise
+    silinir ve dosya, satır kilidi tutulurken kaldırılır; o arada yeniden referans
+    aldıysa hiçbir şey yapılmaz. Eski (blob olmayan) dosya doğrudan silinir.
+    """
+    sha = _blob_sha(path)
+    if sha is not None:
+        try:
+            gone = db.execute(
+                delete(FileBlob).where(FileBlob.sha256 == sha, FileBlob.ref_count <= 0)
+            ).rowcount
+            if gone:
+                _unlink(path)
+            db.commit()
+        except Exception:
+            # satır ref_count=0 ile kalır; sonraki yükleme onu yeniden kullanır
+            db.rollback()
+        return
+    _unlink(path)
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        # dosya yoksa ya da izin hatası varsa kayıt zaten silinmiş durumda
+        pass
@@ -0,0 +1,96 @@
+# backend/app/core/cache.py
+"""
+Süreç içi (in-process) küçük önbellek yardımcıları.
+
+TTLCache: boyutu sınırlı bir LRU; her kaydın kendi son kullanma anı vardır.
+Thread-safe'tir (FastAPI sync endpoint'leri threadpool'da çalışır).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """Boyutu sınırlı, kayıt başına TTL'li LRU önbellek."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= now:
+                # süresi dolmuş → sil
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """ttl verilmezse varsayılan TTL kullanılır; ttl <= 0 ise hiç saklanmaz."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)  # en eski (LRU) kaydı at
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Anahtarı predicate'i sağlayan tüm kayıtları siler."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+# ------------------------------------------------------------
+# Commit'e bağlı geçersiz kılma
+# ------------------------------------------------------------
+# Önbelleği sadece yazma anında temizlemek yetmez: commit'ten önce gelen başka
+# bir istek eski veriyi tekrar önbelleğe koyabilir. invalidate_on_commit verilen
+# fonksiyonu hemen çalıştırır ve transaction bitince (commit/rollback) bir kez daha.
+
+def invalidate_on_commit(db: Session, fn: Callable[[], None]) -> None:
+    fn()
+    db.info.setdefault("cache_invalidations", []).append(fn)
+
+
+def _run_invalidations(session: Session) -> None:
+    for fn in session.info.pop("cache_invalidations", ()):
+        fn()
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session):
+    _run_invalidations(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session: Session, previous_transaction):
+    _run_invalidations(session)
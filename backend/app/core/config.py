@@ -9,6 +9,30 @@ class Settings(BaseSettings):
     JWT_ALG: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # get_current_user principal önbelleği (token subject → kullanıcı). Geçersizleştirme
+    # süreç içidir: çok worker'da rol/pasiflik değişikliği diğer worker'larda TTL sonunda görülür
+    PRINCIPAL_CACHE_SIZE: int = 2048
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+
+    # Kullanıcı → erişilebilir proje id'leri önbelleği (sık gelen kullanıcılar için)
+    ACCESS_INDEX_CACHE_SIZE: int = 1024
+    ACCESS_INDEX_CACHE_TTL_SECONDS: int = 120
+
+    # /projects/overview sonuç önbelleği (scope başına, kısa ömürlü)
+    OVERVIEW_CACHE_TTL_SECONDS: int = 30
+
+    # /projects/{pid}/schedule kritik yol önbelleği (proje başına, sürümle doğrulanır)
+    SCHEDULE_CACHE_SIZE: int = 256
+    SCHEDULE_CACHE_TTL_SECONDS: int = 600
+
+    # Gecikme taraması (core/due_scanner.py): periyot (0 → kapalı) ve "yakında" penceresi
+    DUE_SCAN_INTERVAL_SECONDS: int = 300
+    DUE_SOON_DAYS: int = 3
+
+    # bcrypt havuzu (login): iş parçacığı sayısı ve kuyrukta bekleyebilecek en fazla iş
+    HASH_POOL_WORKERS: int = 2
+    HASH_POOL_MAX_PENDING: int = 32
+
     # Dosya yükleme dizini (backend/ altında)
     UPLOAD_DIR: str = "uploads"
 
@@ -0,0 +1,143 @@
+# backend/app/core/detail_closure.py
+"""
+PhaseDetail hiyerarşisi için closure tablosu (phase_detail_closure) bakımı ve sorguları.
+
+Her detay için kendisiyle (depth=0) ve tüm atalarıyla birer satır tutulur.
+Böylece derinlikten bağımsız olarak:
+  - alt ağaç   : WHERE ancestor_id = X            (birincil anahtar öneki)
+  - atalar     : WHERE descendant_id = X AND depth > 0  (ix_..._desc_depth)
+  - döngü testi: (X, Y) satırı var mı
+tek indeksli sorgudur.
+
+Bakım mapper event'leriyle, flush sırasında aynı bağlantıda yapılır:
+  - ekleme        → kendisi + ebeveynin ataları
+  - parent_id değişimi → alt ağacın eski ata bağları silinir, yeni atalarla çarpılarak eklenir
+  - ORM silme     → düğüme ait satırlar (SQLite'ta FK cascade yok)
+Toplu (Core) silmeler event tetiklemez; onlar delete_details() kullanır.
+Toplu onarım: rebuild_detail_closure() (bkz. rebuild_detail_closure.py).
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import delete, event, insert, inspect as sa_inspect, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.schedule import delete_dependencies
+from app.models import PhaseDetail, PhaseDetailClosure, PhaseDetailNote
+
+C = PhaseDetailClosure
+
+
+# ------------------------------------------------------------
+# Sorgular
+# ------------------------------------------------------------
+def subtree_ids(db: Session, root_id: int) -> list[int]:
+    """Düğüm ve tüm torunlarının id'leri (üstten alta)."""
+    return list(db.scalars(
+        select(C.descendant_id).where(C.ancestor_id == root_id).order_by(C.depth, C.descendant_id)
+    ))
+
+
+def subtree_details(db: Session, root_id: int) -> list[PhaseDetail]:
+    """Düğüm ve tüm torunları — tek JOIN sorgusu."""
+    return (
+        db.query(PhaseDetail)
+        .join(C, C.descendant_id == PhaseDetail.id)
+        .filter(C.ancestor_id == root_id)
+        .all()
+    )
+
+
+def ancestor_details(db: Session, detail_id: int) -> list[PhaseDetail]:
+    """Düğümün ataları, kökten başlayarak (düğümün kendisi hariç)."""
+    return (
+        db.query(PhaseDetail)
+        .join(C, C.ancestor_id == PhaseDetail.id)
+        .filter(C.descendant_id == detail_id, C.depth > 0)
+        .order_by(C.depth.desc())
+        .all()
+    )
+
+
+def is_in_subtree(db: Session, root_id: int, detail_id: int) -> bool:
+    """detail_id, root_id'nin kendisi ya da torunu mu? (taşımada döngü kontrolü)"""
+    return db.scalar(
+        select(C.depth).where(C.ancestor_id == root_id, C.descendant_id == detail_id)
+    ) is not None
+
+
+def delete_details(db: Session, detail_ids: Iterable[int]) -> None:
+    """Detayları notları, bağımlılıkları ve closure satırlarıyla birlikte toplu siler (ORM cascade yüklemesi yok)."""
+    ids = list(detail_ids)
+    if not ids:
+        return
+    db.execute(delete(PhaseDetailNote).where(PhaseDetailNote.detail_id.in_(ids)))
+    delete_dependencies(db, ids)
+    db.execute(delete(C).where(C.descendant_id.in_(ids)))
+    db.execute(
+        delete(PhaseDetail).where(PhaseDetail.id.in_(ids)),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def rebuild_detail_closure(db: Session) -> int:
+    """Closure tablosunu parent_id'lerden baştan kurar; yazılan satır sayısını döner."""
+    parents = dict(db.execute(select(PhaseDetail.id, PhaseDetail.parent_id)).all())
+    rows = []
+    for detail_id in parents:
+        node, depth, seen = detail_id, 0, set()
+        while node is not None and node in parents and node not in seen:
+            seen.add(node)
+            rows.append({"ancestor_id": node, "descendant_id": detail_id, "depth": depth})
+            node, depth = parents[node], depth + 1
+    db.execute(delete(C))
+    if rows:
+        db.execute(insert(C), rows)
+    return len(rows)
+
+
+# ------------------------------------------------------------
+# Mapper event'leri
+# ------------------------------------------------------------
+@event.listens_for(PhaseDetail, "after_insert")
+def _on_detail_insert(mapper, connection, target: PhaseDetail):
+    connection.execute(insert(C).values(ancestor_id=target.id, descendant_id=target.id, depth=0))
+    if target.parent_id:
+        connection.execute(insert(C).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(C.ancestor_id, literal(target.id), C.depth + 1).where(C.descendant_id == target.parent_id),
+        ))
+
+
+@event.listens_for(PhaseDetail, "after_update")
+def _on_detail_update(mapper, connection, target: PhaseDetail):
+    if not sa_inspect(target).attrs.parent_id.history.has_changes():
+        return
+    subtree = connection.execute(
+        select(C.descendant_id, C.depth).where(C.ancestor_id == target.id)
+    ).all() or [(target.id, 0)]
+    old_ancestors = list(connection.scalars(
+        select(C.ancestor_id).where(C.descendant_id == target.id, C.depth > 0)
+    ))
+    if old_ancestors:
+        connection.execute(delete(C).where(
+            C.descendant_id.in_([d for d, _ in subtree]),
+            C.ancestor_id.in_(old_ancestors),
+        ))
+    if target.parent_id:
+        new_ancestors = connection.execute(
+            select(C.ancestor_id, C.depth).where(C.descendant_id == target.parent_id)
+        ).all()
+        rows = [
+            {"ancestor_id": a, "descendant_id": d, "depth": a_depth + d_depth + 1}
+            for a, a_depth in new_ancestors
+            for d, d_depth in subtree
+        ]
+        if rows:
+            connection.execute(insert(C), rows)
+
+
+@event.listens_for(PhaseDetail, "after_delete")
+def _on_detail_delete(mapper, connection, target: PhaseDetail):
+    connection.execute(delete(C).where(or_(C.descendant_id == target.id, C.ancestor_id == target.id)))
@@ -0,0 +1,147 @@
+# backend/app/core/due_scanner.py
+"""
+Gecikmiş / yakında teslim kayıtları için periyodik tarama ve özet tablo (due_digest).
+
+Taranan kaynaklar, yalnızca açık kayıtları kapsayan indekslerle okunur:
+  - projects.end_date       (status != closed)        ix_projects_open_end
+  - phase_tasks.due_date    (status IN todo/doing)    ix_phase_tasks_open_due
+  - phase_details.end_date  (is_completed = false)    ix_phase_details_open_end
+Detaylarda yalnızca "task" tipindekiler sayılır (core/progress.detail_counts ile aynı kural).
+
+Her tarama özet tabloyu tek transaction'da baştan yazar; okuyucular
+(/projects/overview, /due/*) canlı tabloları taramaz. Özet en fazla
+DUE_SCAN_INTERVAL_SECONDS kadar eskidir.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.overview_cache import overview_cache
+from app.db import SessionLocal
+from app.models import DueDigest, PhaseDetail, PhaseTask, Project, ProjectPhase, ProjectStatus, TaskStatus
+
+log = logging.getLogger(__name__)
+
+OVERDUE = "overdue"
+DUE_SOON = "due_soon"
+
+# IN listesi SQL'e sabit olarak yazılır; SQLite kısmi indeksi ancak koşul
+# indeksinkiyle birebir eşleşirse (parametresiz) kullanır
+_OPEN_TASK_STATUSES = bindparam(
+    "open_task_statuses", [TaskStatus.todo, TaskStatus.doing], expanding=True, literal_execute=True,
+)
+
+
+def scan_due(db: Session, now: Optional[datetime] = None) -> int:
+    """Özet tabloyu yeniden yazar (commit çağırana aittir); yazılan satır sayısını döner."""
+    now = now or datetime.utcnow()
+    horizon = now + timedelta(days=getattr(settings, "DUE_SOON_DAYS", 3))
+    rows = []
+
+    def _add(kind, ref_id, project_id, title, due_at, phase_id=None, assignee_id=None):
+        rows.append({
+            "kind": kind, "ref_id": ref_id, "project_id": project_id, "phase_id": phase_id,
+            "assignee_id": assignee_id, "title": (title or "")[:200], "due_at": due_at,
+            "state": OVERDUE if due_at < now else DUE_SOON, "scanned_at": now,
+        })
+
+    for pid, title, end in db.execute(
+        select(Project.id, Project.title, Project.end_date)
+        .where(Project.status != ProjectStatus.closed, Project.end_date < horizon)
+    ):
+        _add("project", pid, pid, title, end)
+
+    for tid, pid, phase_id, assignee_id, title, due in db.execute(
+        select(PhaseTask.id, PhaseTask.project_id, PhaseTask.phase_id, PhaseTask.assignee_id,
+               PhaseTask.title, PhaseTask.due_date)
+        .where(PhaseTask.status.in_(_OPEN_TASK_STATUSES), PhaseTask.due_date < horizon)
+    ):
+        _add("task", tid, pid, title, due, phase_id, assignee_id)
+
+    for did, pid, phase_id, title, end in db.execute(
+        select(PhaseDetail.id, ProjectPhase.project_id, PhaseDetail.phase_id, PhaseDetail.title,
+               PhaseDetail.end_date)
+        .join(ProjectPhase, ProjectPhase.id == PhaseDetail.phase_id)
+        .where(
+            PhaseDetail.is_completed == False,  # noqa: E712 (kısmi indeks koşuluyla birebir)
+            PhaseDetail.end_date < horizon,
+            or_(PhaseDetail.item_type.is_(None), PhaseDetail.item_type == "task"),
+        )
+    ):
+        _add("detail", did, pid, title, end, phase_id)
+
+    db.execute(delete(DueDigest))
+    if rows:
+        db.execute(insert(DueDigest), rows)
+    return len(rows)
+
+
+def run_scan() -> int:
+    """Kendi session'ıyla tarar ve commit eder (arka plan işi / betikler için)."""
+    db = SessionLocal()
+    try:
+        count = scan_due(db)
+        db.commit()
+    finally:
+        db.close()
+    overview_cache.clear()  # is_overdue özetten okunur
+    return count
+
+
+def overdue_project_ids(db: Session, project_ids: Iterable[int]) -> set[int]:
+    """project_ids içinden gecikmiş olanlar — özet tablodan tek sorgu (uq_due_digest_kind_ref)."""
+    ids = list(project_ids)
+    if not ids:
+        return set()
+    return set(db.scalars(
+        select(DueDigest.ref_id).where(
+            DueDigest.kind == "project", DueDigest.ref_id.in_(ids), DueDigest.state == OVERDUE,
+        )
+    ))
+
+
+class DueScanner:
+    """
+    Süreç içi periyodik tarayıcı (daemon thread). interval <= 0 ise başlamaz.
+    last_scan_at, bu süreçte tamamlanan son taramanın zamanıdır; None ise özet
+    tablo güncel sayılmaz ve okuyucular canlı kontrole düşer (bkz. digest_ready).
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last_scan_at: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def digest_ready(self) -> bool:
+        return self.interval > 0 and self.last_scan_at is not None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                run_scan()
+                self.last_scan_at = datetime.utcnow()
+            except Exception:
+                log.exception("due scan failed")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="due-scanner", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+due_scanner = DueScanner(getattr(settings, "DUE_SCAN_INTERVAL_SECONDS", 300))
@@ -0,0 +1,75 @@
+# backend/app/core/hashing.py
+"""
+Parola hash işlemleri (bcrypt) için ayrılmış, boyutu sınırlı iş havuzu.
+
+bcrypt CPU-yoğundur; login fırtınasında Starlette'in ortak threadpool'unu
+doldurup alakasız endpoint'leri bekletmesin diye ayrı bir executor'da
+çalıştırılır. Kuyruk doluysa beklemek yerine hemen 503 döner.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwd-hash")
+        self._pending = 0  # çalışan + kuyrukta bekleyen iş sayısı
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Havuzda bir iş yeri ayırır; havuz doluysa hemen 503 fırlatır.
+        Çağıran, pahalı hazırlığa (ör. DB sorgusu) girmeden önce yer ayırıp
+        blok içinde submit ile çalıştırabilir.
+        """
+        if not self._acquire():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """fn(*args)'ı havuzda çalıştırır; yer slot() ile önceden ayrılmış olmalı."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """fn(*args)'ı havuzda çalıştırır; havuz doluysa 503 fırlatır."""
+        with self.slot():
+            return await self.submit(fn, *args)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(
+    workers=getattr(settings, "HASH_POOL_WORKERS", 2),
+    max_pending=getattr(settings, "HASH_POOL_MAX_PENDING", 32),
+)
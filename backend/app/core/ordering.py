@@ -0,0 +1,278 @@
+# backend/app/core/ordering.py
+"""
+Kesirli (fractional) sıralama anahtarları — fazlar, görevler ve faz detayları için.
+
+Her satır `rank_key` adında bir string taşır; sıralama (rank_key, id) ile
+yapılır. Anahtarlar base36 (0-9a-z) rakamlardan oluşur, sözlük sırasıyla
+karşılaştırılır ve hiçbiri "0" ile bitmez; böylece iki anahtar arasına her
+zaman yeni bir anahtar üretilebilir:
+  - Taşıma (move): yalnızca taşınan satırın anahtarı yeniden yazılır.
+  - Ekleme: anahtar zamandan üretilir (append_rank), MAX(sort_order) sorgusu yok.
+  - Toplu sıralama (reorder): yeni sırada en uzun artan alt dizi (LIS) yerinde
+    kalır, sadece geri kalan satırlara yeni anahtar verilir.
+Art arda araya eklemeler anahtarları uzatır; REBALANCE_KEY_LENGTH aşılınca
+kapsam (ör. bir projenin fazları) arka planda rebalance_scope ile yeniden dağıtılır.
+
+Kapsam (scope) {kolon_adı: değer} sözlüğüdür, ör. {"project_id": 5} ya da
+{"phase_id": 3, "parent_id": None}.
+"""
+from __future__ import annotations
+
+import bisect
+import time
+from typing import Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+RANK_KEY_LENGTH = 64          # kolon genişliği
+REBALANCE_KEY_LENGTH = 32     # bu uzunluğu aşan anahtar üretilirse kapsam yeniden dağıtılır
+_TIME_WIDTH = 11              # mikro saniye, base36 → 2080'lere kadar sabit genişlik
+
+
+# ============================================================
+# SAF ANAHTAR FONKSİYONLARI
+# ============================================================
+def _encode(n: int, width: int) -> str:
+    out = []
+    while n:
+        n, r = divmod(n, BASE)
+        out.append(DIGITS[r])
+    return "".join(reversed(out)).rjust(width, "0")
+
+
+def _time_key(micros: int) -> str:
+    # sondaki "1": anahtar asla "0" ile bitmesin
+    return _encode(micros, _TIME_WIDTH) + "1"
+
+
+def append_rank() -> str:
+    """Kapsamın sonuna ekleme anahtarı (sorgu yok; zamanla monoton artar)."""
+    return _time_key(time.time_ns() // 1000)
+
+
+def append_ranks(n: int) -> list[str]:
+    """Aynı istekte sona eklenecek n satır için artan anahtarlar."""
+    now = time.time_ns() // 1000
+    return keys_between(_time_key(now), _time_key(now + 1), n)
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """a < b (b None → +sonsuz); ikisi de '0' ile bitmez. Aradaki kısa bir anahtar."""
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    da = DIGITS.index(a[0]) if a else 0
+    db = DIGITS.index(b[0]) if b is not None else BASE
+    if db - da > 1:
+        return DIGITS[(da + db + 1) // 2]
+    # ardışık rakamlar
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[da] + _midpoint(a[1:], None)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """a ile b arasında bir anahtar (a None → en baş, b None → en son)."""
+    a = a or ""
+    if b is not None and a >= b:
+        raise ValueError(f"rank keys out of order: {a!r} >= {b!r}")
+    return _midpoint(a, b)
+
+
+def keys_between(a: Optional[str], b: Optional[str], n: int) -> list[str]:
+    """a ile b arasında artan n anahtar; uzunluklar log(n) mertebesinde kalır."""
+    if n <= 0:
+        return []
+    if n == 1:
+        return [key_between(a, b)]
+    if b is None:
+        keys, prev = [], a
+        for _ in range(n):
+            prev = key_between(prev, None)
+            keys.append(prev)
+        return keys
+    mid = n // 2
+    c = key_between(a, b)
+    return keys_between(a, c, mid) + [c] + keys_between(c, b, n - mid - 1)
+
+
+def _tail_bound(lo: Optional[str]) -> Optional[str]:
+    """
+    Sona yerleştirmede üst sınır: şimdiki zaman anahtarı. Böylece sona taşınan
+    satırlar sonradan eklenecek (zaman anahtarlı) satırların önünde kalır.
+    Saat geride kalmışsa (lo >= şimdi) sınırsız (None).
+    """
+    now = append_rank()
+    return now if lo is None or now > lo else None
+
+
+def _lis_positions(values: Sequence[str]) -> set[int]:
+    """Kesin artan en uzun alt dizinin indeksleri (O(n log n))."""
+    tails: list[str] = []
+    tails_idx: list[int] = []
+    prev = [-1] * len(values)
+    for i, v in enumerate(values):
+        j = bisect.bisect_left(tails, v)
+        if j == len(tails):
+            tails.append(v)
+            tails_idx.append(i)
+        else:
+            tails[j] = v
+            tails_idx[j] = i
+        prev[i] = tails_idx[j - 1] if j > 0 else -1
+    keep, i = set(), tails_idx[-1] if tails_idx else -1
+    while i != -1:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+def plan_reorder(current: dict[int, str], ordered_ids: Sequence[int]) -> dict[int, str]:
+    """
+    Yeni sıraya geçmek için yazılması gereken {id: yeni_anahtar}.
+    LIS'teki satırlar yerinde kalır; aradaki boşluklar komşu anahtarlar arasından doldurulur.
+    """
+    ranks = [current[i] for i in ordered_ids]
+    keep = _lis_positions(ranks)
+    changes: dict[int, str] = {}
+    pos = 0
+    while pos < len(ordered_ids):
+        if pos in keep:
+            pos += 1
+            continue
+        start = pos
+        while pos < len(ordered_ids) and pos not in keep:
+            pos += 1
+        lo = ranks[start - 1] if start > 0 else None
+        hi = ranks[pos] if pos < len(ordered_ids) else None
+        if hi is None:
+            hi = _tail_bound(lo)
+        new_keys = keys_between(lo, hi, pos - start)
+        for k, idx in enumerate(range(start, pos)):
+            changes[ordered_ids[idx]] = new_keys[k]
+            ranks[idx] = new_keys[k]
+    return changes
+
+
+def needs_rebalance(*keys: Optional[str]) -> bool:
+    return any(k is not None and len(k) > REBALANCE_KEY_LENGTH for k in keys)
+
+
+# ============================================================
+# VERİTABANI YARDIMCILARI
+# ============================================================
+def _scoped(db: Session, model, scope: dict):
+    q = db.query(model)
+    for name, value in scope.items():
+        col = getattr(model, name)
+        q = q.filter(col.is_(None) if value is None else col == value)
+    return q
+
+
+def rank_for_move(
+    db: Session,
+    model,
+    scope: dict,
+    item_id: int,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+) -> Optional[str]:
+    """
+    item_id'yi after_id'nin hemen arkasına / before_id'nin hemen önüne taşımak için
+    yeni anahtar. İkisi de yoksa sona taşır. Komşu kapsamda değilse LookupError;
+    komşular arasında yer yoksa (eşit anahtarlar) None döner → önce rebalance gerekir.
+    """
+    q = _scoped(db, model, scope).filter(model.id != item_id)
+
+    def _rank_of(ref_id: int) -> str:
+        row = q.filter(model.id == ref_id).with_entities(model.rank_key).first()
+        if row is None:
+            raise LookupError(ref_id)
+        return row[0]
+
+    if after_id is not None:
+        lo = _rank_of(after_id)
+        if before_id is not None:
+            hi = _rank_of(before_id)
+        else:
+            row = (
+                q.filter(model.rank_key > lo)
+                .with_entities(model.rank_key)
+                .order_by(model.rank_key.asc(), model.id.asc())
+                .first()
+            )
+            hi = row[0] if row else None
+    elif before_id is not None:
+        hi = _rank_of(before_id)
+        row = (
+            q.filter(model.rank_key < hi)
+            .with_entities(model.rank_key)
+            .order_by(model.rank_key.desc(), model.id.desc())
+            .first()
+        )
+        lo = row[0] if row else None
+    else:
+        row = q.with_entities(model.rank_key).order_by(model.rank_key.desc()).first()
+        lo, hi = (row[0] if row else None), None
+
+    if hi is None:
+        hi = _tail_bound(lo)
+        return key_between(lo, hi) if hi is not None else key_between(lo, None)
+    if lo is not None and lo >= hi:
+        return None
+    return key_between(lo, hi)
+
+
+def apply_reorder(db: Session, model, current: dict[int, str], ordered_ids: Sequence[int]) -> dict[int, str]:
+    """plan_reorder sonucunu tek executemany UPDATE ile yazar; yazılan anahtarları döner."""
+    changes = plan_reorder(current, ordered_ids)
+    if changes:
+        db.bulk_update_mappings(model, [{"id": i, "rank_key": k} for i, k in changes.items()])
+    return changes
+
+
+def rebalance_scope(db: Session, model, scope: dict) -> int:
+    """Kapsamdaki tüm anahtarları mevcut sırayı koruyarak kısa ve eşit aralıklı yeniden yazar."""
+    ids = [
+        i for (i,) in _scoped(db, model, scope)
+        .with_entities(model.id)
+        .order_by(model.rank_key.asc(), model.id.asc())
+    ]
+    keys = keys_between(None, append_rank(), len(ids))
+    if ids:
+        db.bulk_update_mappings(model, [{"id": i, "rank_key": k} for i, k in zip(ids, keys)])
+    return len(ids)
+
+
+def rebalance_scope_job(model, scope: dict) -> None:
+    """BackgroundTasks için: kendi oturumunu açar."""
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        rebalance_scope(db, model, scope)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def move_item(db: Session, model, scope: dict, item, after_id: Optional[int], before_id: Optional[int]) -> bool:
+    """
+    Taşıma endpoint'lerinin ortak gövdesi: item.rank_key'i yeni konuma yazar.
+    Yer yoksa kapsam önce senkron olarak yeniden dağıtılır. Komşu kapsamda
+    değilse LookupError. Dönüş: anahtar uzadı mı (arka planda rebalance planlanmalı).
+    """
+    key = rank_for_move(db, model, scope, item.id, after_id, before_id)
+    if key is None:
+        rebalance_scope(db, model, scope)
+        key = rank_for_move(db, model, scope, item.id, after_id, before_id)
+    item.rank_key = key
+    return needs_rebalance(key)
@@ -0,0 +1,24 @@
+# backend/app/core/overview_cache.py
+"""
+/projects/overview için kısa ömürlü, scope başına sonuç önbelleği.
+
+Anahtarlar: ("all",) admin, ("dept", department_id) departman başkanı,
+("user", user_id) diğer kullanıcılar. Proje ve üyelik yazma yolları
+invalidate_overview() çağırır; bir proje birden çok scope'ta
+göründüğünden önbellek tamamen temizlenir.
+"""
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, invalidate_on_commit
+from app.core.config import settings
+
+overview_cache = TTLCache(
+    maxsize=512,
+    ttl=getattr(settings, "OVERVIEW_CACHE_TTL_SECONDS", 30),
+)
+
+
+def invalidate_overview(db: Session) -> None:
+    invalidate_on_commit(db, overview_cache.clear)
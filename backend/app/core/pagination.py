@@ -0,0 +1,119 @@
+# backend/app/core/pagination.py
+"""
+Keyset (cursor) sayfalama yardımcıları.
+
+Sıralama her zaman (anahtar kolon, id) çifti üzerinden yapılır; cursor bu
+çiftin son görülen değerini taşır. OFFSET kullanılmadığından derin sayfalar
+da ilk sayfa kadar ucuzdur (ilgili composite indeks varsa).
+
+Nullable anahtarlarda NULL'lar her iki yönde de en sona konur: önce
+"anahtar dolu" segment, o bitince "anahtar NULL" segment id sırasıyla okunur.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(data: dict) -> str:
+    def _default(o: Any):
+        if isinstance(o, datetime):
+            return {"__dt": o.isoformat()}
+        if isinstance(o, Decimal):
+            return {"__dec": str(o)}
+        raise TypeError(type(o))
+
+    raw = json.dumps(data, default=_default, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[dict]:
+    if not token:
+        return None
+
+    def _hook(o: dict):
+        if "__dt" in o:
+            return datetime.fromisoformat(o["__dt"])
+        if "__dec" in o:
+            return Decimal(o["__dec"])
+        return o
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw, object_hook=_hook)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return data
+
+
+def _after(key_col, id_col, value, last_id, descending: bool):
+    """(key, id) sıralamasında (value, last_id)'den sonra gelen satırlar."""
+    if descending:
+        return or_(key_col < value, and_(key_col == value, id_col < last_id))
+    return or_(key_col > value, and_(key_col == value, id_col > last_id))
+
+
+def keyset_page(
+    q: Query,
+    key_col,
+    id_col,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+    nullable: bool = False,
+    value_of=None,
+) -> tuple[list, Optional[str]]:
+    """
+    q'yu (key_col, id_col) sırasıyla sayfalar; (satırlar, next_cursor) döner.
+    value_of(row) -> (key, id); verilmezse satırın key_col/id_col attribute'ları okunur.
+    """
+    if value_of is None:
+        def value_of(row):
+            return getattr(row, key_col.key), getattr(row, id_col.key)
+
+    c = decode_cursor(cursor)
+    order = (key_col.desc(), id_col.desc()) if descending else (key_col.asc(), id_col.asc())
+    id_order = id_col.desc() if descending else id_col.asc()
+
+    rows: list = []
+    in_null_segment = bool(c and c.get("null"))
+
+    if not in_null_segment:
+        page_q = q.filter(key_col.isnot(None)) if nullable else q
+        if c is not None:
+            page_q = page_q.filter(_after(key_col, id_col, c.get("k"), c.get("id"), descending))
+        rows = page_q.order_by(*order).limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            k, i = value_of(rows[-1])
+            return rows, encode_cursor({"k": k, "id": i})
+        if not nullable:
+            return rows, None
+        c = None  # dolu segment bitti → NULL segmente geç
+
+    remaining = limit - len(rows)
+    null_q = q.filter(key_col.is_(None))
+    if remaining == 0:
+        # sayfa dolu segmentle tam doldu; NULL satır varsa sonraki sayfa oradan başlar
+        more = null_q.order_by(id_order).limit(1).first() is not None
+        return rows, encode_cursor({"null": True, "id": None}) if more else None
+    last_id = c.get("id") if c is not None else None
+    if last_id is not None:
+        null_q = null_q.filter(id_col < last_id if descending else id_col > last_id)
+    tail = null_q.order_by(id_order).limit(remaining + 1).all()
+    if len(tail) > remaining:
+        tail = tail[:remaining]
+        rows.extend(tail)
+        _, i = value_of(tail[-1])
+        return rows, encode_cursor({"null": True, "id": i})
+    rows.extend(tail)
+    return rows, None
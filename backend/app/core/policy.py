@@ -1,5 +1,9 @@
 # app/core/policy.py
+from dataclasses import dataclass
+from typing import Optional
+
 from fastapi import HTTPException
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from ..models import (
     Project, ProjectMember, ProjectMemberRole,
@@ -10,7 +14,8 @@ def is_admin(u: User) -> bool:
     return u.role == UserRole.admin
 
 def is_dept_head(u: User) -> bool:
-    return u.role == UserRole.dept_head
+    # UserRole'de dept_head henüz yok; string karşılaştırma enum'a eklendiğinde de çalışır
+    return u.role == "dept_head"
 
 def is_member(db: Session, pid: int, uid: int) -> bool:
     return db.query(ProjectMember).filter_by(project_id=pid, user_id=uid).first() is not None
@@ -18,27 +23,106 @@ def is_member(db: Session, pid: int, uid: int) -> bool:
 def is_owner(db: Session, pid: int, uid: int) -> bool:
     return db.query(ProjectMember).filter_by(project_id=pid, user_id=uid, role=ProjectMemberRole.owner).first() is not None
 
-def require_project_read(db: Session, pid: int, user: User) -> Project:
-    proj = db.query(Project).filter(Project.id == pid).first()
-    if not proj:
+
+# ============================================================
+# PROJE ERİŞİM ÇÖZÜCÜ (request-scoped)
+# ============================================================
+# Tüm router'lar proje yetkisini buradan alır. Proje + çağıranın üyelik satırı
+# tek bir JOIN ile okunur ve sonuç session.info içinde saklanır; get_db her
+# istek için yeni bir Session açtığından bu, "istek boyunca memoize" demektir.
+
+# Projede değişiklik yapabilen üyelik rolleri
+_MANAGE_ROLES = (ProjectMemberRole.owner, ProjectMemberRole.manager, ProjectMemberRole.contributor)
+
+
+@dataclass
+class ProjectAccess:
+    project: Project
+    membership: Optional[ProjectMember]
+    is_admin: bool
+    is_dept_head: bool   # projenin departmanının başkanı mı?
+    is_owner: bool       # Project.owner_id ya da owner rolündeki üye
+
+    @property
+    def can_read(self) -> bool:
+        return self.is_admin or self.is_dept_head or self.is_owner or self.membership is not None
+
+    @property
+    def can_manage(self) -> bool:
+        """İçerik düzenleme: admin, dept head, owner, manager/contributor üyeler."""
+        if self.is_admin or self.is_dept_head or self.is_owner:
+            return True
+        return self.membership is not None and self.membership.role in _MANAGE_ROLES
+
+    @property
+    def can_own(self) -> bool:
+        """Yapısal değişiklik/silme: admin, dept head veya proje sahibi."""
+        return self.is_admin or self.is_dept_head or self.is_owner
+
+
+def resolve_project_access(db: Session, pid: int, user: User) -> ProjectAccess:
+    """Proje yoksa 404 fırlatır; yetki kararı vermez, sadece çözümler."""
+    memo = db.info.setdefault("project_access", {})
+    key = (pid, user.id)
+    if key in memo:
+        access = memo[key]
+    else:
+        row = (
+            db.query(Project, ProjectMember)
+            .outerjoin(
+                ProjectMember,
+                and_(ProjectMember.project_id == Project.id, ProjectMember.user_id == user.id),
+            )
+            .filter(Project.id == pid)
+            .first()
+        )
+        access = None
+        if row is not None:
+            proj, membership = row
+            access = ProjectAccess(
+                project=proj,
+                membership=membership,
+                is_admin=is_admin(user),
+                is_dept_head=bool(
+                    is_dept_head(user) and user.department_id
+                    and proj.department_id == user.department_id
+                ),
+                is_owner=proj.owner_id == user.id
+                or (membership is not None and membership.role == ProjectMemberRole.owner),
+            )
+        memo[key] = access
+
+    if access is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    if is_admin(user):
-        return proj
-    if is_dept_head(user) and user.department_id and proj.department_id == user.department_id:
-        return proj
-    if is_member(db, pid, user.id):
-        return proj
-    raise HTTPException(status_code=403, detail="No access to this project")
-
-def require_project_manage(db: Session, pid: int, user: User) -> Project:
+    return access
+
+
+def forget_project_access(db: Session, pid: int) -> None:
+    """Aynı istekte üyelik/sahiplik değişirse memoize edilen kararı düşürür."""
+    memo = db.info.get("project_access")
+    if memo:
+        for key in [k for k in memo if k[0] == pid]:
+            del memo[key]
+
+
+def require_project_read(db: Session, pid: int, user: User) -> Project:
+    access = resolve_project_access(db, pid, user)
+    if not access.can_read:
+        raise HTTPException(status_code=403, detail="No access to this project")
+    return access.project
+
+def require_project_manage(
+    db: Session, pid: int, user: User, detail: str = "Not allowed to manage this project"
+) -> Project:
+    proj = require_project_read(db, pid, user)
+    if not resolve_project_access(db, pid, user).can_manage:
+        raise HTTPException(status_code=403, detail=detail)
+    return proj
+
+def require_project_owner(
+    db: Session, pid: int, user: User, detail: str = "Only admin/dept head/owner can do this"
+) -> Project:
     proj = require_project_read(db, pid, user)
-    # Yönetim izni: admin, aynı departmanın dept_head’i, projede owner/pm
-    if is_admin(user):
-        return proj
-    if is_dept_head(user) and user.department_id and proj.department_id == user.department_id:
-        return proj
-    m = db.query(ProjectMember).filter_by(project_id=pid, user_id=user.id).first()
-    if m and m.role in (ProjectMemberRole.owner, ProjectMemberRole.pm, ProjectMemberRole.member):
-        # İstediğin sertliğe göre burada member'ı da ekledim (değişiklik yapabilsin demiştin)
-        return proj
-    raise HTTPException(status_code=403, detail="Not allowed to manage this project")
\ No newline at end of file
+    if not resolve_project_access(db, pid, user).can_own:
+        raise HTTPException(status_code=403, detail=detail)
+    return proj
@@ -0,0 +1,150 @@
+# backend/app/core/progress.py
+"""
+Faz ve proje ilerlemesinin sayaçlarla artımlı bakımı.
+
+Her fazda dört sayaç tutulur:
+  detail_total / detail_done : "task" tipindeki faz detayları (sub_phase başlıkları sayılmaz)
+  task_total   / task_done   : faz görevleri (iptal edilenler sayılmaz)
+
+Detay/görev yazma yolları değişimi bir fark (delta) olarak apply_phase_delta()
+ile uygular; ardından recompute_project_progress() yalnızca projenin faz
+satırlarındaki sayaçları okuyarak Project.progress'i günceller (detay/görev
+tablosu taranmaz). Formül istemcideki eski hesapla aynıdır:
+  faz ilerlemesi = status done ise 100, değilse done / total * 100 (total 0 → 0)
+  proje ilerlemesi = faz ilerlemelerinin ortalaması (yuvarlanmış)
+Fazı olmayan projelerde progress elle girilen değer olarak kalır.
+Toplu onarım: rebuild_progress() (bkz. rebuild_progress.py).
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core.overview_cache import invalidate_overview
+from app.models import PhaseDetail, PhaseStatus, PhaseTask, Project, ProjectPhase, TaskStatus
+
+
+def detail_counts(item_type: Optional[str], is_completed: Optional[bool]) -> tuple[int, int]:
+    """Bir detayın (total, done) katkısı."""
+    if item_type not in (None, "task"):
+        return 0, 0
+    return 1, 1 if is_completed else 0
+
+
+def task_counts(status) -> tuple[int, int]:
+    """Bir görevin (total, done) katkısı."""
+    value = status.value if hasattr(status, "value") else status
+    if value == TaskStatus.canceled.value:
+        return 0, 0
+    return 1, 1 if value == TaskStatus.done.value else 0
+
+
+def apply_phase_delta(
+    db: Session,
+    phase_id: int,
+    detail_total: int = 0,
+    detail_done: int = 0,
+    task_total: int = 0,
+    task_done: int = 0,
+) -> None:
+    values = {}
+    for col, delta in (
+        (ProjectPhase.detail_total, detail_total),
+        (ProjectPhase.detail_done, detail_done),
+        (ProjectPhase.task_total, task_total),
+        (ProjectPhase.task_done, task_done),
+    ):
+        if delta:
+            values[col] = col + delta
+    if values:
+        db.query(ProjectPhase).filter(ProjectPhase.id == phase_id).update(
+            values, synchronize_session=False
+        )
+
+
+def subtree_detail_counts(db: Session, detail_ids: Iterable[int]) -> tuple[int, int]:
+    """Silinecek detay kümesinin toplam (total, done) katkısı — tek sorgu."""
+    ids = list(detail_ids)
+    if not ids:
+        return 0, 0
+    is_task = PhaseDetail.item_type.is_(None) | (PhaseDetail.item_type == "task")
+    total, done = (
+        db.query(
+            func.count(PhaseDetail.id),
+            func.coalesce(func.sum(case((PhaseDetail.is_completed, 1), else_=0)), 0),
+        )
+        .filter(PhaseDetail.id.in_(ids), is_task)
+        .one()
+    )
+    return int(total or 0), int(done or 0)
+
+
+def phase_progress(status, total: int, done: int) -> float:
+    """Tek fazın ilerleme yüzdesi (0–100)."""
+    value = status.value if hasattr(status, "value") else status
+    if value == PhaseStatus.done.value:
+        return 100.0
+    return done / total * 100 if total > 0 else 0.0
+
+
+def phase_totals(phase: ProjectPhase) -> tuple[int, int]:
+    return (
+        (phase.detail_total or 0) + (phase.task_total or 0),
+        (phase.detail_done or 0) + (phase.task_done or 0),
+    )
+
+
+def recompute_project_progress(db: Session, project_id: int) -> Optional[int]:
+    """
+    Fazların sayaçlarından Project.progress'i hesaplar ve yazar; değer değiştiyse
+    /projects/overview önbelleği commit'te temizlenir (progress oradan da okunur).
+    """
+    rows = db.query(
+        ProjectPhase.status,
+        ProjectPhase.detail_total + ProjectPhase.task_total,
+        ProjectPhase.detail_done + ProjectPhase.task_done,
+    ).filter(ProjectPhase.project_id == project_id).all()
+    if not rows:
+        return None
+    progress = round(sum(phase_progress(s, t or 0, d or 0) for s, t, d in rows) / len(rows))
+    changed = db.query(Project).filter(
+        Project.id == project_id,
+        (Project.progress != progress) | Project.progress.is_(None),
+    ).update({Project.progress: progress}, synchronize_session=False)
+    if changed:
+        invalidate_overview(db)
+    return progress
+
+
+def rebuild_progress(db: Session) -> int:
+    """Tüm faz sayaçlarını kaynak tablolardan yeniden sayar, proje ilerlemelerini yeniden yazar."""
+    is_task = PhaseDetail.item_type.is_(None) | (PhaseDetail.item_type == "task")
+    details = dict(
+        (pid, (t, d)) for pid, t, d in db.query(
+            PhaseDetail.phase_id,
+            func.count(PhaseDetail.id),
+            func.coalesce(func.sum(case((PhaseDetail.is_completed, 1), else_=0)), 0),
+        ).filter(is_task).group_by(PhaseDetail.phase_id)
+    )
+    tasks = dict(
+        (pid, (t, d)) for pid, t, d in db.query(
+            PhaseTask.phase_id,
+            func.count(PhaseTask.id),
+            func.coalesce(func.sum(case((PhaseTask.status == TaskStatus.done, 1), else_=0)), 0),
+        ).filter(PhaseTask.status != TaskStatus.canceled).group_by(PhaseTask.phase_id)
+    )
+    rows = []
+    for phase_id, in db.query(ProjectPhase.id):
+        dt, dd = details.get(phase_id, (0, 0))
+        tt, td = tasks.get(phase_id, (0, 0))
+        rows.append({"id": phase_id, "detail_total": dt, "detail_done": dd,
+                     "task_total": tt, "task_done": td})
+    if rows:
+        db.bulk_update_mappings(ProjectPhase, rows)
+        db.flush()
+    project_ids = [pid for pid, in db.query(ProjectPhase.project_id).distinct()]
+    for pid in project_ids:
+        recompute_project_progress(db, pid)
+    return len(project_ids)
@@ -0,0 +1,117 @@
+# backend/app/core/project_summary.py
+"""
+Proje satırındaki denormalize özet alanları:
+  - projects.member_count    : project_members satır sayısı
+  - projects.owner_name      : users.name (owner_id)
+  - projects.department_name : departments.name (department_id)
+
+Liste/overview/detay okumaları bu kolonları doğrudan kullanır; COUNT/JOIN yapmaz.
+Güncel tutma aynı transaction içinde yapılır:
+  - üye ekleme/çıkarma → adjust_member_count() (router'lardan)
+  - proje owner_id/department_id değişimi, kullanıcı/departman adı değişimi
+    → aşağıdaki mapper event'leri (flush sırasında, aynı bağlantıda)
+Ad/e-posta değişiminde, adı gösteren projelerin sürümü de artırılır: ETag'ler
+yalnızca Project.version'a bağlı olduğundan aksi halde 304 ile eski ad dönerdi.
+Toplu onarım için repair_project_summaries() (bkz. repair_project_summary.py).
+"""
+from __future__ import annotations
+
+from sqlalchemy import event, func, inspect as sa_inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.overview_cache import invalidate_overview, overview_cache
+from app.models import Department, Project, ProjectMember, ProjectNote, User
+
+
+def adjust_member_count(db: Session, project_id: int, delta: int) -> None:
+    db.query(Project).filter(Project.id == project_id).update(
+        {Project.member_count: Project.member_count + delta}, synchronize_session=False
+    )
+
+
+def repair_project_summaries(db: Session) -> int:
+    """Tüm projelerin özet alanlarını kaynak tablolardan yeniden hesaplar."""
+    result = db.execute(
+        update(Project).values(
+            member_count=select(func.count(ProjectMember.id))
+            .where(ProjectMember.project_id == Project.id)
+            .scalar_subquery(),
+            owner_name=select(User.name).where(User.id == Project.owner_id).scalar_subquery(),
+            department_name=select(Department.name)
+            .where(Department.id == Project.department_id)
+            .scalar_subquery(),
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    return result.rowcount
+
+
+# ------------------------------------------------------------
+# Mapper event'leri
+# ------------------------------------------------------------
+def _invalidate(target) -> None:
+    session = sa_inspect(target).session
+    if session is not None:
+        invalidate_overview(session)
+    else:
+        overview_cache.clear()
+
+
+def _changed(target, *names: str) -> bool:
+    state = sa_inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+
+def _fill_labels(connection, target: Project) -> None:
+    target.owner_name = (
+        connection.scalar(select(User.name).where(User.id == target.owner_id))
+        if target.owner_id else None
+    )
+    target.department_name = (
+        connection.scalar(select(Department.name).where(Department.id == target.department_id))
+        if target.department_id else None
+    )
+
+
+@event.listens_for(Project, "before_insert")
+def _on_project_insert(mapper, connection, target: Project):
+    _fill_labels(connection, target)
+
+
+@event.listens_for(Project, "before_update")
+def _on_project_update(mapper, connection, target: Project):
+    if _changed(target, "owner_id", "department_id"):
+        _fill_labels(connection, target)
+
+
+def _bump_versions(connection, condition) -> None:
+    """Etkilenen projelerin sürümünü artırır; ad taşıyan yanıtların ETag'leri eskir (core/versioning.py)."""
+    connection.execute(update(Project).where(condition).values(version=Project.version + 1))
+
+
+@event.listens_for(User, "after_update")
+def _on_user_rename(mapper, connection, target: User):
+    if not _changed(target, "name", "email"):
+        return
+    if _changed(target, "name"):
+        connection.execute(
+            update(Project).where(Project.owner_id == target.id).values(owner_name=target.name)
+        )
+    # owner_name, üye listesi (user_name/user_email) ve not yazarları (author_name/author_email)
+    _bump_versions(connection, or_(
+        Project.owner_id == target.id,
+        Project.id.in_(select(ProjectMember.project_id).where(ProjectMember.user_id == target.id)),
+        Project.id.in_(select(ProjectNote.project_id).where(ProjectNote.author_id == target.id)),
+    ))
+    _invalidate(target)
+
+
+@event.listens_for(Department, "after_update")
+def _on_department_rename(mapper, connection, target: Department):
+    if _changed(target, "name"):
+        connection.execute(
+            update(Project)
+            .where(Project.department_id == target.id)
+            .values(department_name=target.name, version=Project.version + 1)
+        )
+        _invalidate(target)
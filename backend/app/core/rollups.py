@@ -0,0 +1,216 @@
+# backend/app/core/rollups.py
+"""
+Faz detaylarında alt ağaç toplamlarının (rollup) artımlı bakımı.
+
+Her detay, kendisi dahil tüm alt ağacının özetini taşır:
+  rollup_effort              : effort toplamı
+  rollup_total / rollup_done : "task" tipindeki detay sayısı / tamamlananlar
+                               (core/progress.detail_counts ile aynı kural)
+  rollup_start / rollup_end  : en erken start_date / en geç end_date
+
+Bir detay değişince yalnızca ata yolu (closure tablosundan tek sorgu) güncellenir:
+  - toplam ve sayaçlar fark (delta) olarak tek UPDATE ile,
+  - tarih sınırları genişliyorsa tek CASE UPDATE ile; daralma ihtimali varsa
+    (sınırı belirleyen değer kalktıysa) yol üzerindeki düğümler closure
+    üzerinden gruplu tek sorguyla yeniden hesaplanır.
+Okuma tarafında özyinelemeli toplama gerekmez. Toplu onarım: rebuild_rollups()
+(bkz. rebuild_detail_rollups.py).
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import DateTime, Integer, Numeric, and_, bindparam, case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.progress import detail_counts
+from app.models import PhaseDetail, PhaseDetailClosure
+
+PD = PhaseDetail
+C = PhaseDetailClosure
+
+
+class Rollup(NamedTuple):
+    effort: Decimal
+    total: int
+    done: int
+    start: Optional[datetime]
+    end: Optional[datetime]
+
+
+_ZERO = Rollup(Decimal(0), 0, 0, None, None)
+
+
+def _dec(value) -> Decimal:
+    return Decimal(str(value)) if value is not None else Decimal(0)
+
+
+def own_rollup(d: PhaseDetail) -> Rollup:
+    """Detayın yalnızca kendi katkısı."""
+    total, done = detail_counts(d.item_type, d.is_completed)
+    return Rollup(_dec(d.effort), total, done, d.start_date, d.end_date)
+
+
+def subtree_rollup(d: PhaseDetail) -> Rollup:
+    """Detayın saklanan alt ağaç toplamı."""
+    return Rollup(_dec(d.rollup_effort), d.rollup_total or 0, d.rollup_done or 0, d.rollup_start, d.rollup_end)
+
+
+def init_rollup(d: PhaseDetail) -> None:
+    """Yeni (çocuksuz) detayın toplamlarını kendi değerleriyle doldurur."""
+    d.rollup_effort, d.rollup_total, d.rollup_done, d.rollup_start, d.rollup_end = own_rollup(d)
+
+
+def path_ids(db: Session, detail_id: int, include_self: bool = True) -> list[int]:
+    """Detayın ata yolu (closure'dan tek sorgu)."""
+    q = select(C.ancestor_id).where(C.descendant_id == detail_id)
+    if not include_self:
+        q = q.where(C.depth > 0)
+    return list(db.scalars(q))
+
+
+def path_map(db: Session, detail_ids: Iterable[int]) -> dict[int, list[int]]:
+    """Birden çok detayın ata yolları (kendisi dahil) — tek closure sorgusu."""
+    paths: dict[int, list[int]] = defaultdict(list)
+    ids = list(detail_ids)
+    if ids:
+        for desc, anc in db.execute(
+            select(C.descendant_id, C.ancestor_id).where(C.descendant_id.in_(ids))
+        ):
+            paths[desc].append(anc)
+    return paths
+
+
+def _shrinks(b: Rollup, a: Rollup) -> bool:
+    """Sınırı belirleyebilecek bir tarih kalktı/geri çekildi mi?"""
+    return (
+        (b.start is not None and (a.start is None or a.start > b.start))
+        or (b.end is not None and (a.end is None or a.end < b.end))
+    )
+
+
+_tbl = PD.__table__
+_batch_update = (
+    update(_tbl)
+    .where(_tbl.c.id == bindparam("b_id"))
+    .values(
+        rollup_effort=_tbl.c.rollup_effort + bindparam("d_effort", type_=Numeric(12, 2)),
+        rollup_total=_tbl.c.rollup_total + bindparam("d_total", type_=Integer),
+        rollup_done=_tbl.c.rollup_done + bindparam("d_done", type_=Integer),
+        # NULL parametre → değer korunur (NULL ile karşılaştırma hiçbir dalı seçmez)
+        rollup_start=case(
+            (and_(bindparam("b_start", type_=DateTime).is_not(None),
+                  or_(_tbl.c.rollup_start.is_(None), _tbl.c.rollup_start > bindparam("b_start", type_=DateTime))),
+             bindparam("b_start", type_=DateTime)),
+            else_=_tbl.c.rollup_start,
+        ),
+        rollup_end=case(
+            (and_(bindparam("b_end", type_=DateTime).is_not(None),
+                  or_(_tbl.c.rollup_end.is_(None), _tbl.c.rollup_end < bindparam("b_end", type_=DateTime))),
+             bindparam("b_end", type_=DateTime)),
+            else_=_tbl.c.rollup_end,
+        ),
+        # rollup yazımı detayların updated_at'ini değiştirmesin (onupdate)
+        updated_at=_tbl.c.updated_at,
+    )
+)
+
+
+def apply_rollup_batch(
+    db: Session,
+    changes: Iterable[tuple[Iterable[int], Optional[Rollup], Optional[Rollup]]],
+) -> None:
+    """
+    (yol, before, after) değişimlerini birleştirir: her düğüm için toplam fark ve
+    genişleyen sınırlar tek executemany UPDATE ile yazılır; daralma ihtimali olan
+    düğümlerin sınırları ardından yeniden hesaplanır. Değişen detaylar flush edilmiş olmalı.
+    """
+    acc: dict[int, list] = {}
+    shrink: set[int] = set()
+    for path, before, after in changes:
+        b, a = before or _ZERO, after or _ZERO
+        shrinks = _shrinks(b, a)
+        for detail_id in path:
+            e = acc.setdefault(detail_id, [Decimal(0), 0, 0, None, None])
+            e[0] += a.effort - b.effort
+            e[1] += a.total - b.total
+            e[2] += a.done - b.done
+            if shrinks:
+                shrink.add(detail_id)
+                continue
+            if a.start is not None and (e[3] is None or a.start < e[3]):
+                e[3] = a.start
+            if a.end is not None and (e[4] is None or a.end > e[4]):
+                e[4] = a.end
+    rows = [
+        {"b_id": i, "d_effort": e[0], "d_total": e[1], "d_done": e[2],
+         "b_start": None if i in shrink else e[3], "b_end": None if i in shrink else e[4]}
+        for i, e in acc.items()
+        if e[0] or e[1] or e[2] or (i not in shrink and (e[3] or e[4]))
+    ]
+    if rows:
+        db.execute(_batch_update, rows)
+    if shrink:
+        recompute_bounds(db, shrink)
+
+
+def apply_rollup_change(
+    db: Session,
+    ids: Iterable[int],
+    before: Optional[Rollup],
+    after: Optional[Rollup],
+) -> None:
+    """
+    ids'deki düğümlerin toplamlarında before → after değişimini uygular
+    (before None: ekleme, after None: çıkarma). Değişen detay flush edilmiş olmalı.
+    """
+    apply_rollup_batch(db, [(ids, before, after)])
+
+
+def move_rollup(db: Session, old_path: Iterable[int], new_path: Iterable[int], rollup: Rollup) -> None:
+    """Alt ağaç başka bir üst başlığa taşındı: toplamı eski yoldan düşüp yenisine ekler."""
+    apply_rollup_change(db, old_path, rollup, None)
+    apply_rollup_change(db, new_path, None, rollup)
+
+
+def recompute_bounds(db: Session, ids: Iterable[int]) -> None:
+    """Verilen düğümlerin tarih sınırlarını alt ağaçlarından yeniden hesaplar (gruplu tek sorgu)."""
+    ids = list(ids)
+    bounds = {
+        anc: (start, end)
+        for anc, start, end in db.query(C.ancestor_id, func.min(PD.start_date), func.max(PD.end_date))
+        .join(PD, PD.id == C.descendant_id)
+        .filter(C.ancestor_id.in_(ids))
+        .group_by(C.ancestor_id)
+    }
+    for detail_id in ids:
+        start, end = bounds.get(detail_id, (None, None))
+        db.query(PD).filter(PD.id == detail_id).update(
+            {PD.rollup_start: start, PD.rollup_end: end, PD.updated_at: PD.updated_at},
+            synchronize_session=False,
+        )
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Tüm detayların toplamlarını closure tablosundan yeniden yazar."""
+    is_task = or_(PD.item_type.is_(None), PD.item_type == "task")
+    rows = db.query(
+        C.ancestor_id,
+        func.coalesce(func.sum(PD.effort), 0),
+        func.sum(case((is_task, 1), else_=0)),
+        func.sum(case((and_(is_task, PD.is_completed), 1), else_=0)),
+        func.min(PD.start_date),
+        func.max(PD.end_date),
+    ).join(PD, PD.id == C.descendant_id).group_by(C.ancestor_id).all()
+    for anc, effort, total, done, start, end in rows:
+        db.query(PD).filter(PD.id == anc).update(
+            {
+                PD.rollup_effort: effort, PD.rollup_total: total or 0, PD.rollup_done: done or 0,
+                PD.rollup_start: start, PD.rollup_end: end, PD.updated_at: PD.updated_at,
+            },
+            synchronize_session=False,
+        )
+    return len(rows)
@@ -0,0 +1,247 @@
+# backend/app/core/schedule.py
+"""
+Faz detayları üzerinde kritik yol (CPM) zamanlaması.
+
+Düğümler projenin tüm detaylarıdır; süre = end_date - start_date (eksikse 0).
+Kenarlar phase_detail_dependencies'teki bitiş→başlangıç bağlarıdır (lag_days ile).
+  - ileri geçiş : ES = max(kendi start_date'i, max(öncül EF + lag)), EF = ES + süre
+                  (ikisi de yoksa projenin en erken başlangıcı)
+  - geri geçiş  : LF = min(ardıl LS - lag) (ardıl yoksa proje bitişi), LS = LF - süre
+  - bolluk      : LS - ES; bolluğu 0 olanlar kritik yoldur.
+Topolojik sıra (Kahn) ve iki geçiş O(düğüm + kenar)'dır.
+
+Sonuç proje başına süreç içi önbellekte tutulur ve proje sürümüyle (Project.version)
+doğrulanır; her yazma sürümü artırdığından ayrıca geçersiz kılma gerekmez.
+Sürüm değiştiğinde düğüm/kenar kümesi aynıysa topolojik sıra yeniden kullanılır ve
+yalnızca değişen düğümlerden itibaren hesaplanır: ileri geçiş ilk değişen
+konumdan sona, geri geçiş (proje bitişi değişmediyse) son değişen konumdan başa.
+"""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, event, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import PhaseDetail, PhaseDetailDependency, Project, ProjectPhase
+
+PD = PhaseDetail
+D = PhaseDetailDependency
+
+DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+
+schedule_cache = TTLCache(
+    maxsize=getattr(settings, "SCHEDULE_CACHE_SIZE", 256),
+    ttl=getattr(settings, "SCHEDULE_CACHE_TTL_SECONDS", 600),
+)
+
+
+def _sec(dt: Optional[datetime]) -> Optional[int]:
+    return int((dt - _EPOCH).total_seconds()) if dt else None
+
+
+def to_datetime(sec: int) -> datetime:
+    return _EPOCH + timedelta(seconds=sec)
+
+
+def topo_order(ids: list[int], edges: Iterable[tuple[int, int]]) -> list[int]:
+    """Kahn algoritması; eşitlikte giriş sırası korunur. Döngü varsa ValueError."""
+    succs: dict[int, list[int]] = {i: [] for i in ids}
+    indeg = dict.fromkeys(ids, 0)
+    for p, s in edges:
+        succs[p].append(s)
+        indeg[s] += 1
+    queue = deque(i for i in ids if indeg[i] == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for s in succs[node]:
+            indeg[s] -= 1
+            if indeg[s] == 0:
+                queue.append(s)
+    if len(order) != len(ids):
+        raise ValueError("dependency cycle")
+    return order
+
+
+class Plan:
+    """Bir proje sürümünün zamanlaması; diziler topolojik sıradaki konuma göre."""
+
+    __slots__ = (
+        "version", "ids", "pos", "edge_key", "preds", "succs",
+        "dur", "cons", "es", "ef", "ls", "lf", "base", "finish",
+    )
+
+    def derive(self, version: int) -> "Plan":
+        """Yapıyı (sıra, kenarlar) paylaşan, hesaplanan dizileri kopyalanmış yeni plan."""
+        new = Plan()
+        for name in ("ids", "pos", "edge_key", "preds", "succs", "base", "finish"):
+            setattr(new, name, getattr(self, name))
+        for name in ("dur", "cons", "es", "ef", "ls", "lf"):
+            setattr(new, name, list(getattr(self, name)))
+        new.version = version
+        return new
+
+    def slack(self, i: int) -> int:
+        return self.ls[i] - self.es[i]
+
+    def critical_path(self) -> list[int]:
+        return [self.ids[i] for i in range(len(self.ids)) if self.slack(i) <= 0]
+
+
+def _node_times(start: Optional[datetime], end: Optional[datetime]) -> tuple[int, Optional[int]]:
+    """(süre, başlangıç kısıtı) saniye; yalnızca bitişi olan detay o anda bir kilometre taşıdır."""
+    s, e = _sec(start), _sec(end)
+    if s is not None and e is not None:
+        return max(0, e - s), s
+    return 0, s if s is not None else e
+
+
+def _base(cons: list[Optional[int]]) -> int:
+    known = [c for c in cons if c is not None]
+    if known:
+        return min(known)
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    return _sec(today)
+
+
+def _forward(plan: Plan, start_at: int) -> None:
+    for i in range(start_at, len(plan.ids)):
+        es = plan.cons[i]
+        for p, lag in plan.preds[i]:
+            t = plan.ef[p] + lag
+            if es is None or t > es:
+                es = t
+        if es is None:
+            es = plan.base
+        plan.es[i] = es
+        plan.ef[i] = es + plan.dur[i]
+
+
+def _backward(plan: Plan, end_at: int) -> None:
+    for i in range(end_at, -1, -1):
+        lf = plan.finish
+        for s, lag in plan.succs[i]:
+            t = plan.ls[s] - lag
+            if t < lf:
+                lf = t
+        plan.lf[i] = lf
+        plan.ls[i] = lf - plan.dur[i]
+
+
+def _finish(plan: Plan) -> int:
+    return max(plan.ef, default=plan.base)
+
+
+def _load(db: Session, project_id: int):
+    nodes = db.execute(
+        select(PD.id, PD.start_date, PD.end_date)
+        .join(ProjectPhase, ProjectPhase.id == PD.phase_id)
+        .where(ProjectPhase.project_id == project_id)
+        .order_by(ProjectPhase.rank_key, ProjectPhase.id, PD.rank_key, PD.id)
+    ).all()
+    edges = db.execute(
+        select(D.predecessor_id, D.successor_id, D.lag_days).where(D.project_id == project_id)
+    ).all()
+    return nodes, frozenset((p, s, lag or 0) for p, s, lag in edges)
+
+
+def _build(nodes, edge_key: frozenset, version: int) -> Plan:
+    known = {n.id for n in nodes}
+    edges = [(p, s, lag) for p, s, lag in edge_key if p in known and s in known]
+    order = topo_order([n.id for n in nodes], [(p, s) for p, s, _ in edges])
+    pos = {node_id: i for i, node_id in enumerate(order)}
+    plan = Plan()
+    plan.version, plan.ids, plan.pos, plan.edge_key = version, order, pos, edge_key
+    plan.preds = [[] for _ in order]
+    plan.succs = [[] for _ in order]
+    for p, s, lag in edges:
+        plan.preds[pos[s]].append((pos[p], lag * DAY))
+        plan.succs[pos[p]].append((pos[s], lag * DAY))
+    n = len(order)
+    plan.dur, plan.cons = [0] * n, [None] * n
+    for node in nodes:
+        plan.dur[pos[node.id]], plan.cons[pos[node.id]] = _node_times(node.start_date, node.end_date)
+    plan.es, plan.ef, plan.ls, plan.lf = [0] * n, [0] * n, [0] * n, [0] * n
+    plan.base = _base(plan.cons)
+    _forward(plan, 0)
+    plan.finish = _finish(plan)
+    _backward(plan, n - 1)
+    return plan
+
+
+def _update(cached: Plan, nodes, version: int) -> Plan:
+    """Aynı yapı, değişen tarihler: yalnızca etkilenen konumlardan itibaren yeniden hesapla."""
+    plan = cached.derive(version)
+    changed = []
+    for node in nodes:
+        i = plan.pos[node.id]
+        times = _node_times(node.start_date, node.end_date)
+        if times != (plan.dur[i], plan.cons[i]):
+            plan.dur[i], plan.cons[i] = times
+            changed.append(i)
+    if not changed:
+        return plan
+    base = _base(plan.cons)
+    first = 0 if base != plan.base else min(changed)
+    plan.base = base
+    _forward(plan, first)
+    finish = _finish(plan)
+    last = len(plan.ids) - 1 if finish != plan.finish else max(changed)
+    plan.finish = finish
+    _backward(plan, last)
+    return plan
+
+
+def project_schedule(db: Session, proj: Project) -> Plan:
+    """Projenin güncel sürümdeki zamanlaması (önbellekten ya da artımlı/tam hesapla)."""
+    version = proj.version or 1
+    cached: Optional[Plan] = schedule_cache.get(proj.id)
+    if cached is not None and cached.version == version:
+        return cached
+    nodes, edge_key = _load(db, proj.id)
+    if (
+        cached is not None
+        and cached.edge_key == edge_key
+        and len(cached.ids) == len(nodes)
+        and all(n.id in cached.pos for n in nodes)
+    ):
+        plan = _update(cached, nodes, version)
+    else:
+        plan = _build(nodes, edge_key, version)
+    schedule_cache.set(proj.id, plan)
+    return plan
+
+
+def would_create_cycle(db: Session, project_id: int, predecessor_id: int, successor_id: int) -> bool:
+    """predecessor → successor eklenirse döngü oluşur mu? (successor'dan predecessor'a yol var mı)"""
+    if predecessor_id == successor_id:
+        return True
+    succs: dict[int, list[int]] = {}
+    for p, s in db.execute(select(D.predecessor_id, D.successor_id).where(D.project_id == project_id)):
+        succs.setdefault(p, []).append(s)
+    seen, stack = {successor_id}, [successor_id]
+    while stack:
+        for nxt in succs.get(stack.pop(), ()):
+            if nxt == predecessor_id:
+                return True
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return False
+
+
+def delete_dependencies(db: Session, detail_ids) -> None:
+    """Detaylara bağlı (öncül ya da ardıl) bağımlılıkları toplu siler (SQLite'ta FK cascade yok)."""
+    db.execute(delete(D).where(or_(D.predecessor_id.in_(detail_ids), D.successor_id.in_(detail_ids))))
+
+
+@event.listens_for(PhaseDetail, "after_delete")
+def _on_detail_delete(mapper, connection, target: PhaseDetail):
+    connection.execute(delete(D).where(or_(D.predecessor_id == target.id, D.successor_id == target.id)))
@@ -0,0 +1,223 @@
+# backend/app/core/search.py
+"""
+Tam metin arama indeksi (search_documents) bakımı ve sorgusu.
+
+Yazma yolları ilgili index_* / remove_* fonksiyonlarını aynı transaction
+içinde çağırır; böylece indeks artımlı olarak güncel kalır. Toplu yeniden
+kurulum için rebuild_search_index() (bkz. rebuild_search_index.py).
+
+Sorgu tarafı dialect'e göre:
+  - SQLite: FTS5 (search_documents_fts) MATCH + bm25() sıralaması
+  - MySQL : FULLTEXT MATCH ... AGAINST (BOOLEAN MODE) skoru
+  - diğer : LIKE (yedek)
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional
+
+from sqlalchemy import column, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session
+
+from app.core.access_index import accessible_project_ids
+from app.core.policy import is_admin, is_dept_head
+from app.models import (
+    PhaseDetail, PhaseDetailNote, PhaseTask, Project, ProjectNote, ProjectPhase,
+    SearchDocument, User, UserProjectAccess,
+)
+
+KINDS = ("project", "note", "detail", "task", "detail_note")
+
+_fts = table("search_documents_fts", column("rowid"))
+
+
+# ============================================================
+# YAZMA TARAFI
+# ============================================================
+def index_document(
+    db: Session,
+    kind: str,
+    ref_id: int,
+    project_id: int,
+    title: Optional[str],
+    body: Optional[str],
+    phase_id: Optional[int] = None,
+    detail_id: Optional[int] = None,
+) -> None:
+    doc = db.query(SearchDocument).filter_by(kind=kind, ref_id=ref_id).first()
+    if doc is None:
+        doc = SearchDocument(kind=kind, ref_id=ref_id)
+        db.add(doc)
+    doc.project_id = project_id
+    doc.phase_id = phase_id
+    doc.detail_id = detail_id
+    doc.title = (title or "")[:255]
+    doc.body = body or ""
+
+
+def index_project(db: Session, proj: Project) -> None:
+    index_document(db, "project", proj.id, proj.id, proj.title, "")
+
+
+def index_note(db: Session, note: ProjectNote) -> None:
+    index_document(db, "note", note.id, note.project_id, "", note.content)
+
+
+def index_task(db: Session, t: PhaseTask) -> None:
+    index_document(db, "task", t.id, t.project_id, t.title, t.description, phase_id=t.phase_id)
+
+
+def index_phase_detail(db: Session, d: PhaseDetail, project_id: int) -> None:
+    index_document(
+        db, "detail", d.id, project_id, d.title, d.description,
+        phase_id=d.phase_id, detail_id=d.id,
+    )
+
+
+def index_detail_note(db: Session, n: PhaseDetailNote, project_id: int, phase_id: int) -> None:
+    index_document(
+        db, "detail_note", n.id, project_id, n.user, n.note,
+        phase_id=phase_id, detail_id=n.detail_id,
+    )
+
+
+def remove_document(db: Session, kind: str, ref_id: int) -> None:
+    db.query(SearchDocument).filter_by(kind=kind, ref_id=ref_id).delete(synchronize_session=False)
+
+
+def remove_detail_documents(db: Session, detail_ids: Iterable[int]) -> None:
+    """Silinen detaylar ve onların notlarının dokümanları."""
+    ids = list(detail_ids)
+    if ids:
+        db.query(SearchDocument).filter(SearchDocument.detail_id.in_(ids)).delete(
+            synchronize_session=False
+        )
+
+
+def remove_phase_documents(db: Session, phase_ids: Iterable[int]) -> None:
+    ids = list(phase_ids)
+    if ids:
+        db.query(SearchDocument).filter(SearchDocument.phase_id.in_(ids)).delete(
+            synchronize_session=False
+        )
+
+
+def remove_project_documents(db: Session, project_id: int) -> None:
+    db.query(SearchDocument).filter(SearchDocument.project_id == project_id).delete(
+        synchronize_session=False
+    )
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Tüm dokümanları kaynak tablolardan toplu olarak yeniden üretir."""
+    db.query(SearchDocument).delete(synchronize_session=False)
+    rows = []
+    for pid, title in db.query(Project.id, Project.title):
+        rows.append(dict(kind="project", ref_id=pid, project_id=pid, title=title or "", body=""))
+    for nid, pid, content in db.query(ProjectNote.id, ProjectNote.project_id, ProjectNote.content):
+        rows.append(dict(kind="note", ref_id=nid, project_id=pid, title="", body=content or ""))
+    for t in db.query(PhaseTask.id, PhaseTask.project_id, PhaseTask.phase_id, PhaseTask.title, PhaseTask.description):
+        rows.append(dict(kind="task", ref_id=t.id, project_id=t.project_id, phase_id=t.phase_id,
+                         title=(t.title or "")[:255], body=t.description or ""))
+    detail_rows = (
+        db.query(PhaseDetail.id, PhaseDetail.phase_id, PhaseDetail.title, PhaseDetail.description,
+                 ProjectPhase.project_id)
+        .join(ProjectPhase, ProjectPhase.id == PhaseDetail.phase_id)
+    )
+    for d in detail_rows:
+        rows.append(dict(kind="detail", ref_id=d.id, project_id=d.project_id, phase_id=d.phase_id,
+                         detail_id=d.id, title=(d.title or "")[:255], body=d.description or ""))
+    note_rows = (
+        db.query(PhaseDetailNote.id, PhaseDetailNote.detail_id, PhaseDetailNote.user,
+                 PhaseDetailNote.note, PhaseDetail.phase_id, ProjectPhase.project_id)
+        .join(PhaseDetail, PhaseDetail.id == PhaseDetailNote.detail_id)
+        .join(ProjectPhase, ProjectPhase.id == PhaseDetail.phase_id)
+    )
+    for n in note_rows:
+        rows.append(dict(kind="detail_note", ref_id=n.id, project_id=n.project_id, phase_id=n.phase_id,
+                         detail_id=n.detail_id, title=(n.user or "")[:255], body=n.note or ""))
+    if rows:
+        for r in rows:
+            r.setdefault("phase_id", None)
+            r.setdefault("detail_id", None)
+        db.execute(SearchDocument.__table__.insert(), rows)
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text("INSERT INTO search_documents_fts(search_documents_fts) VALUES ('rebuild')"))
+    return len(rows)
+
+
+# ============================================================
+# OKUMA TARAFI
+# ============================================================
+def _tokens(q: str) -> list[str]:
+    return re.findall(r"\w+", q or "", flags=re.UNICODE)[:16]
+
+
+def _access_filter(db: Session, user: User):
+    """Kullanıcının okuyabileceği projelerle sınırlayan koşul (admin → None)."""
+    if is_admin(user):
+        return None
+    ids = accessible_project_ids(db, user.id)
+    conds = [SearchDocument.project_id.in_(
+        ids if len(ids) <= 500
+        else select(UserProjectAccess.project_id).where(UserProjectAccess.user_id == user.id)
+    )]
+    if is_dept_head(user) and user.department_id:
+        conds.append(SearchDocument.project_id.in_(
+            select(Project.id).where(Project.department_id == user.department_id)
+        ))
+    return or_(*conds)
+
+
+def search_documents(
+    db: Session,
+    user: User,
+    q: str,
+    project_id: Optional[int] = None,
+    kinds: Optional[list[str]] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> list[tuple[SearchDocument, float]]:
+    """Skora göre sıralı (doküman, skor) listesi; en fazla limit+1 satır döner."""
+    tokens = _tokens(q)
+    if not tokens:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        # her kelime önek eşleşmesi, hepsi zorunlu (AND)
+        expr = " ".join('"%s"*' % t.replace('"', '""') for t in tokens)
+        bm25 = literal_column("bm25(search_documents_fts)")
+        query = (
+            db.query(SearchDocument, (-bm25).label("score"))
+            .join(_fts, _fts.c.rowid == SearchDocument.id)
+            .filter(text("search_documents_fts MATCH :match"))
+            .params(match=expr)
+            .order_by(bm25.asc(), SearchDocument.id.asc())
+        )
+    elif dialect == "mysql":
+        from sqlalchemy.dialects.mysql import match
+
+        expr = " ".join("+%s*" % t for t in tokens)
+        score = match(SearchDocument.title, SearchDocument.body, against=expr).in_boolean_mode()
+        query = (
+            db.query(SearchDocument, score.label("score"))
+            .filter(score > 0)
+            .order_by(score.desc(), SearchDocument.id.asc())
+        )
+    else:
+        query = db.query(SearchDocument, literal_column("0").label("score"))
+        for t in tokens:
+            like = f"%{t}%"
+            query = query.filter(or_(SearchDocument.title.ilike(like), SearchDocument.body.ilike(like)))
+        query = query.order_by(SearchDocument.id.desc())
+
+    cond = _access_filter(db, user)
+    if cond is not None:
+        query = query.filter(cond)
+    if project_id is not None:
+        query = query.filter(SearchDocument.project_id == project_id)
+    if kinds:
+        query = query.filter(SearchDocument.kind.in_(kinds))
+
+    return [(doc, float(score or 0)) for doc, score in query.offset(offset).limit(limit + 1).all()]
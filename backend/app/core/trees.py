@@ -0,0 +1,76 @@
+# backend/app/core/trees.py
+"""
+Faz detay ağaçlarını (PhaseDetail.parent_id hiyerarşisi) bellekte kurar.
+
+Detaylar tek sorguda düz liste olarak okunur ve parent_id'ye göre iç içe
+dict'lere dönüştürülür. ORM'deki `children` ilişkisine hiç dokunulmaz; bu
+sayede her düğüm için ayrı lazy-load sorgusu (N+1) oluşmaz. Çıktı
+schemas.PhaseDetail ile birebir uyumludur.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+
+from app.models import PhaseDetail, ProjectPhase
+
+_COLUMNS = [c.key for c in PhaseDetail.__table__.columns]
+
+
+def _node(d: PhaseDetail) -> dict:
+    node = {key: getattr(d, key) for key in _COLUMNS}
+    node["children"] = []
+    return node
+
+
+def flat_detail_nodes(details: Iterable[PhaseDetail]) -> list[dict]:
+    """Detayları children'ı boş düğümler olarak döner (ilişki yüklenmez)."""
+    return [_node(d) for d in details]
+
+
+def build_detail_trees(details: Iterable[PhaseDetail]) -> dict[int, list[dict]]:
+    """
+    Düz detay listesinden faz başına kök düğüm listesi üretir.
+    Kardeşler (rank_key, id) sırasındadır. Ebeveyni listede olmayan
+    (ya da başka bir fazda kalan) detaylar kök sayılır.
+    """
+    details = sorted(details, key=lambda d: (d.rank_key or "", d.id))
+    nodes = {d.id: _node(d) for d in details}
+    roots: dict[int, list[dict]] = defaultdict(list)
+    for d in details:
+        parent = nodes.get(d.parent_id) if d.parent_id else None
+        if parent is not None and parent["phase_id"] == d.phase_id:
+            parent["children"].append(nodes[d.id])
+        else:
+            roots[d.phase_id].append(nodes[d.id])
+    return roots
+
+
+def load_detail_trees(db: Session, phase_ids: Iterable[int]) -> dict[int, list[dict]]:
+    """Verilen fazların tüm detay ağaçları — tek sorgu."""
+    phase_ids = list(phase_ids)
+    if not phase_ids:
+        return {}
+    details = db.query(PhaseDetail).filter(PhaseDetail.phase_id.in_(phase_ids)).all()
+    return build_detail_trees(details)
+
+
+def load_project_detail_trees(db: Session, project_id: int) -> list[tuple[int, list[dict]]]:
+    """
+    Projenin tüm fazları için (phase_id, kök düğümler) listesi, fazlar sırasıyla.
+    Tek sorgu: fazlar detaylara LEFT JOIN edilir (detaysız fazlar da döner);
+    detay tarafı (phase_id, parent_id, rank_key) indeksini kullanır.
+    """
+    rows = (
+        db.query(ProjectPhase.id, PhaseDetail)
+        .select_from(ProjectPhase)
+        .outerjoin(PhaseDetail, PhaseDetail.phase_id == ProjectPhase.id)
+        .filter(ProjectPhase.project_id == project_id)
+        .order_by(ProjectPhase.rank_key, ProjectPhase.id)
+        .all()
+    )
+    phase_ids = list(dict.fromkeys(phase_id for phase_id, _ in rows))
+    trees = build_detail_trees(d for _, d in rows if d is not None)
+    return [(phase_id, trees.get(phase_id, [])) for phase_id in phase_ids]
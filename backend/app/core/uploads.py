@@ -0,0 +1,92 @@
+# backend/app/core/uploads.py
+"""
+Yüklenen dosyaların diske akışla (streaming) yazılması ve özetlenmesi.
+
+Dosya sabit boyutlu parçalar halinde okunur; her parça aynı geçişte
+SHA-256'ya eklenir ve diske yazılır. Boyut sınırı baytlar geldikçe
+kontrol edilir, aşılırsa yazım hemen kesilir. Disk yazımı ve hash
+hesabı threadpool'da yapılır (event loop bloklanmaz). Yarım kalan
+dosyalar ".part" uzantısıyla yazılır ve yalnızca başarıda yerine taşınır.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from typing import BinaryIO, NamedTuple
+
+from fastapi import HTTPException, Request, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+# multipart sınırları/başlıkları için Content-Length'e tanınan pay
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+class StoredUpload(NamedTuple):
+    size_bytes: int
+    sha256: str
+
+
+def too_large(max_size: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large (max {max_size // (1024 * 1024)}MB)")
+
+
+def check_content_length(request: Request, max_size: int) -> None:
+    """Gövde beyan edilen boyuttan belliyse, hiç okumadan reddeder."""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_size + _MULTIPART_OVERHEAD:
+        raise too_large(max_size)
+
+
+def _write_chunk(f: BinaryIO, h, chunk: bytes) -> None:
+    h.update(chunk)  # hashlib büyük tamponlarda GIL'i bırakır
+    f.write(chunk)
+
+
+async def stream_to_part(upload: UploadFile, part_dir: str, max_size: int) -> tuple[str, StoredUpload]:
+    """
+    upload'ı part_dir altında benzersiz bir ".part" dosyasına parça parça yazar;
+    boyut, SHA-256 ve yazım tek geçişte yapılır. (part yolu, (bayt sayısı, sha256)) döner.
+    Sınır aşılırsa ya da hata olursa yarım dosyayı siler (413 / orijinal hata).
+    Yerine taşımak (os.replace) ya da silmek çağırana aittir.
+    """
+    await run_in_threadpool(os.makedirs, part_dir, exist_ok=True)
+    part_path = os.path.join(part_dir, f"{uuid.uuid4().hex}.part")
+    h = hashlib.sha256()
+    size = 0
+    f = await run_in_threadpool(open, part_path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise too_large(max_size)
+            await run_in_threadpool(_write_chunk, f, h, chunk)
+        await run_in_threadpool(f.close)
+    except BaseException:
+        f.close()
+        discard_part(part_path)
+        raise
+    return part_path, StoredUpload(size, h.hexdigest())
+
+
+def discard_part(part_path: str) -> None:
+    try:
+        os.remove(part_path)
+    except OSError:
+        pass
+
+
+async def stream_to_disk(upload: UploadFile, dest_path: str, max_size: int) -> StoredUpload:
+    """upload'ı dest_path'e tek geçişte yazar (bkz. stream_to_part); (bayt sayısı, sha256) döner."""
+    part_path, stored = await stream_to_part(upload, os.path.dirname(dest_path) or ".", max_size)
+    try:
+        await run_in_threadpool(os.replace, part_path, dest_path)
+    except BaseException:
+        discard_part(part_path)
+        raise
+    return stored
@@ -0,0 +1,52 @@
+# backend/app/core/versioning.py
+"""
+Proje sürüm sayacı ve ETag / If-None-Match desteği.
+
+Her proje kapsamlı yazma, commit'ten önce bump_project_version() çağırır.
+Proje kapsamlı GET'ler erişim kontrolünden (zaten Project satırını yükler)
+hemen sonra conditional_get() ile ETag üretir; istemcinin If-None-Match
+değeri eşleşirse sorgu/serileştirme yapılmadan 304 döner.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app.models import Project
+
+
+def bump_project_version(db: Session, project_id: int) -> None:
+    db.query(Project).filter(Project.id == project_id).update(
+        {Project.version: Project.version + 1}, synchronize_session=False
+    )
+
+
+def project_etag(proj: Project, scope: str) -> str:
+    """Strong ETag: aynı proje sürümünde aynı gösterim için aynı değer."""
+    return f'"p{proj.id}.v{proj.version or 1}.{scope}"'
+
+
+def _matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_get(
+    request: Request, response: Response, proj: Project, scope: str
+) -> Optional[Response]:
+    """
+    ETag'i yanıta yazar. If-None-Match eşleşirse döndürülecek 304 yanıtını,
+    aksi halde None döner (endpoint normal akışa devam eder).
+    """
+    etag = project_etag(proj, scope)
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
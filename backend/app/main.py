@@ -25,11 +25,20 @@ from .routers import (
     project_tasks,
     project_files,
     project_budget,
+    project_schedule,
+    user_tasks,
+    due,
+    search,
     debug_db,   # <— debug DB uçları
 )
 
 # SQLAlchemy Base ve engine
-from .db import Base, engine
+from .db import Base, engine, SessionLocal
+from .models import Project, UserProjectAccess, SearchDocument
+from .core.access_index import rebuild_access_index
+from .core.search import rebuild_search_index
+from .core.hashing import hashing_pool
+from .core.due_scanner import due_scanner
 
 # FastAPI uygulaması
 app = FastAPI(title="TrexProject API", version="0.1")
@@ -44,6 +53,10 @@ app.include_router(phase_details.router)
 app.include_router(project_tasks.router)
 app.include_router(project_files.router)
 app.include_router(project_budget.router)
+app.include_router(project_schedule.router)
+app.include_router(user_tasks.router)
+app.include_router(due.router)
+app.include_router(search.router)
 app.include_router(debug_db.router)  # <— eklendi
 
 # CORS (frontend için gerekli)
@@ -55,12 +68,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _ensure_access_index():
+    """user_project_access yeni oluşturulduysa (boşsa) mevcut verilerden doldur."""
+    db = SessionLocal()
+    try:
+        if db.query(UserProjectAccess).first() is None and db.query(Project.id).first() is not None:
+            print("APP DEBUG: user_project_access rebuilt:", rebuild_access_index(db))
+            db.commit()
+    finally:
+        db.close()
+
+def _ensure_search_index():
+    """search_documents yeni oluşturulduysa (boşsa) mevcut verilerden doldur."""
+    db = SessionLocal()
+    try:
+        if db.query(SearchDocument.id).first() is None and db.query(Project.id).first() is not None:
+            print("APP DEBUG: search index rebuilt:", rebuild_search_index(db))
+            db.commit()
+    finally:
+        db.close()
+
 # Uygulama başlatıldığında tablo oluştur (opsiyonel; Alembic kullanıyorsan kaldır)
 @app.on_event("startup")
 def on_startup():
     # Hangi DB'ye bağlandığını logla (teşhis için)
     print("APP DEBUG: DATABASE_URL =", os.getenv("DATABASE_URL"))
     Base.metadata.create_all(bind=engine)
+    _ensure_access_index()
+    _ensure_search_index()
+    # gecikme özet tablosu: ilk tarama hemen, sonra periyodik (DUE_SCAN_INTERVAL_SECONDS)
+    due_scanner.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # login için ayrılmış bcrypt havuzunu kapat
+    hashing_pool.shutdown()
+    due_scanner.stop()
 
 # Basit sağlık kontrolü
 @app.get("/health")
@@ -9,13 +9,14 @@ from sqlalchemy import Numeric
 
 # SQLAlchemy bileşenleri import edilir
 from sqlalchemy import (
-    Integer, String, DateTime, ForeignKey, Text, UniqueConstraint, func, Enum,
+    Integer, String, DateTime, ForeignKey, Text, UniqueConstraint, func, Enum, Index, text,
 )
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 # Veritabanı taban sınıfı (Base) içe aktarılır
 from .db import Base
+from .core.ordering import RANK_KEY_LENGTH, append_rank
 
 
 # ============================================================
@@ -126,6 +127,24 @@ class Project(Base):
     Her proje bir departmana ve bir sahibine (owner) ait olabilir.
     """
     __tablename__ = "projects"
+    __table_args__ = (
+        # GET /projects keyset sayfalama: (sıralama kolonu, id)
+        Index("ix_projects_created_id", "created_at", "id"),
+        Index("ix_projects_title_id", "title", "id"),
+        Index("ix_projects_start_id", "start_date", "id"),
+        Index("ix_projects_end_id", "end_date", "id"),
+        # filtre + varsayılan sıralama (created_at desc)
+        Index("ix_projects_status_created", "status", "created_at", "id"),
+        Index("ix_projects_priority_created", "priority", "created_at", "id"),
+        Index("ix_projects_dept_created", "department_id", "created_at", "id"),
+        Index("ix_projects_owner_created", "owner_id", "created_at", "id"),
+        # gecikme taraması (core/due_scanner.py): yalnızca açık projeler
+        # (SQLite/PostgreSQL'de kısmi indeks; MySQL'de durum kolonunu da içeren bileşik indeks)
+        Index(
+            "ix_projects_open_end", "end_date", "status",
+            sqlite_where=text("status != 'closed'"), postgresql_where=text("status != 'closed'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(200), index=True)  # Proje başlığı
@@ -164,6 +183,16 @@ class Project(Base):
 
     expenses = relationship("ProjectExpense", back_populates="project", cascade="all, delete-orphan")
 
+    # Denormalize özet alanları (bkz. core/project_summary.py); liste ve
+    # overview okumaları COUNT/JOIN yerine bunları kullanır.
+    member_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    owner_name: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    department_name: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+
+    # Proje ve tüm alt kayıtlarının (faz, detay, görev, not, dosya, harcama, üye)
+    # her yazımında artırılır; proje kapsamlı GET'lerde ETag bu sayıdan üretilir.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+
 # ============================================================
 # PROJECT MEMBER MODELİ
 # ============================================================
@@ -189,6 +218,24 @@ class ProjectMember(Base):
     user: Mapped["User"] = relationship("User", back_populates="memberships")
 
 
+# ============================================================
+# USER → PROJECT ERİŞİM İNDEKSİ
+# ============================================================
+class UserProjectAccess(Base):
+    """
+    Kullanıcının sahibi ya da üyesi olduğu projelerin materyalize listesi.
+    scope=mine ve /projects/overview bu tablodan tek indeksli okuma yapar;
+    üye ekleme/çıkarma, proje oluşturma/silme ve owner değişiminde güncellenir
+    (bkz. app/core/access_index.py).
+    """
+    __tablename__ = "user_project_access"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+
 # ============================================================
 # PROJECT NOTE MODELİ
 # ============================================================
@@ -226,8 +273,14 @@ class ProjectPhase(Base):
     )  # Proje silinirse fazlar da silinir
     name: Mapped[str] = mapped_column(String(200), nullable=False)  # Faz adı
 
-    # Faz sırası (örneğin 1: planlama, 2: geliştirme)
+    __table_args__ = (
+        Index("ix_project_phases_project_rank", "project_id", "rank_key"),
+    )
+
+    # Faz sırası (örneğin 1: planlama, 2: geliştirme) — eski alan, sıralamayı rank_key belirler
     sort_order: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    # Kesirli sıralama anahtarı (bkz. core/ordering.py); eklemede zamandan üretilir
+    rank_key: Mapped[str] = mapped_column(String(RANK_KEY_LENGTH), nullable=False, default=append_rank)
 
     # Faz durumu (başlamadı, devam ediyor, tamamlandı vb.)
     status: Mapped[PhaseStatus] = mapped_column(
@@ -239,13 +292,19 @@ class ProjectPhase(Base):
     end_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
 
+    # İlerleme sayaçları (bkz. core/progress.py): "task" tipindeki detaylar ve iptal edilmemiş görevler
+    detail_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    detail_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    task_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    task_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     # İlişki
     project: Mapped["Project"] = relationship("Project", back_populates="phases")
     details: Mapped[list["PhaseDetail"]] = relationship(
         "PhaseDetail", 
         back_populates="phase",
         cascade="all, delete-orphan",
-        order_by="PhaseDetail.sort_order"
+        order_by="(PhaseDetail.rank_key, PhaseDetail.id)"
     )
     
     
@@ -260,6 +319,17 @@ class TaskStatus(str, _enum.Enum):
 
 class PhaseTask(Base):
     __tablename__ = "phase_tasks"
+    __table_args__ = (
+        Index("ix_phase_tasks_phase_rank", "phase_id", "rank_key"),
+        # /me/tasks, /users/{id}/tasks: assignee_id = ? [AND status IN (...)] ORDER BY due_date
+        Index("ix_phase_tasks_assignee_status_due", "assignee_id", "status", "due_date"),
+        # gecikme taraması: yalnızca açık (todo/doing) görevler
+        Index(
+            "ix_phase_tasks_open_due", "status", "due_date",
+            sqlite_where=text("status IN ('todo', 'doing')"),
+            postgresql_where=text("status IN ('todo', 'doing')"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), index=True, nullable=False)
@@ -270,6 +340,7 @@ class PhaseTask(Base):
 
     # DB'de kolon adı sort_order olsun (fazla aynı mantık)
     sort_order: Mapped[int]  = mapped_column(Integer, nullable=False, default=1)
+    rank_key: Mapped[str]    = mapped_column(String(RANK_KEY_LENGTH), nullable=False, default=append_rank)
 
     status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), nullable=False, default=TaskStatus.todo)
 
@@ -302,17 +373,41 @@ class ProjectFile(Base):
     stored_path: Mapped[str] = mapped_column(String(500))    # diskteki yol
     content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
     size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)  # içerik özeti (hex)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     project = relationship("Project", back_populates="files")
     uploader = relationship("User", lazy="joined", foreign_keys=[uploader_id])
 
+class FileBlob(Base):
+    """
+    İçerik adresli dosya deposundaki bir blob (anahtar: SHA-256).
+    Dosya UPLOAD_DIR/blobs/<ilk 2>/<sonraki 2>/<sha256> yolundadır; ref_count,
+    bu içeriğe işaret eden ProjectFile satırı sayısıdır (bkz. core/blobs.py).
+    """
+    __tablename__ = "file_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
 # Project içine ilişki ekle (tek bir Project sınıfın var, o class’ın içine):
 # files = relationship("ProjectFile", back_populates="project", cascade="all, delete-orphan")
 
 class PhaseDetail(Base):
     """Stores sub-items/details for each project phase."""
     __tablename__ = "phase_details"
+    __table_args__ = (
+        Index("ix_phase_details_phase_parent_rank", "phase_id", "parent_id", "rank_key"),
+        # Gantt penceresi (start_date <= to AND end_date >= from) faz bazında aralık taraması
+        Index("ix_phase_details_phase_dates", "phase_id", "start_date", "end_date"),
+        # gecikme taraması: yalnızca tamamlanmamış detaylar
+        Index(
+            "ix_phase_details_open_end", "is_completed", "end_date",
+            sqlite_where=text("is_completed = 0"), postgresql_where=text("is_completed = false"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     phase_id: Mapped[int] = mapped_column(
@@ -324,6 +419,7 @@ class PhaseDetail(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     is_completed: Mapped[bool] = mapped_column(default=False)
     sort_order: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rank_key: Mapped[str] = mapped_column(String(RANK_KEY_LENGTH), nullable=False, default=append_rank)
     
     # New detailed fields
     scope: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
@@ -342,6 +438,16 @@ class PhaseDetail(Base):
     # Completion Time
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
+    # Alt ağaç toplamları (düğümün kendisi dahil; bkz. core/rollups.py)
+    rollup_effort: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    rollup_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rollup_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rollup_start: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    rollup_end: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # Not sayısı (not ekleme/silmede artımlı güncellenir; rozetler için)
+    note_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -372,6 +478,10 @@ class PhaseDetail(Base):
 
 class PhaseDetailNote(Base):
     __tablename__ = "phase_detail_notes"
+    __table_args__ = (
+        # not listesi keyset sayfalama: detail_id = ? ORDER BY created_at, id
+        Index("ix_phase_detail_notes_detail_created", "detail_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     detail_id: Mapped[int] = mapped_column(
@@ -379,12 +489,89 @@ class PhaseDetailNote(Base):
         nullable=False,
         index=True
     )
+    # yazar sunucuda current_user'dan atanır; user yalnızca görüntülenen ad (benzersiz değil)
+    author_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
+    )
     user: Mapped[str] = mapped_column(String(100), nullable=False)
     note: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    # Python tarafında atanır: keyset cursor değeriyle aynı biçim/hassasiyette saklanır
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now())
 
     detail: Mapped["PhaseDetail"] = relationship("PhaseDetail", back_populates="notes")
 
+class PhaseDetailClosure(Base):
+    """
+    PhaseDetail hiyerarşisinin closure tablosu: her (ata, torun) çifti için bir satır,
+    depth = aradaki seviye farkı (düğümün kendisiyle satırı depth=0).
+    Alt ağaç / ata sorguları derinlikten bağımsız tek indeksli sorgudur.
+    Bakım: app/core/detail_closure.py (ekleme/taşıma/silme mapper event'leri).
+    """
+    __tablename__ = "phase_detail_closure"
+    __table_args__ = (
+        Index("ix_phase_detail_closure_desc_depth", "descendant_id", "depth"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("phase_details.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("phase_details.id", ondelete="CASCADE"), primary_key=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+class PhaseDetailDependency(Base):
+    """
+    PhaseDetail'ler arası bitiş→başlangıç (finish-to-start) bağımlılığı:
+    successor, predecessor bittikten lag_days gün sonra başlayabilir (negatif: örtüşme).
+    project_id, projenin tüm bağlarını tek indeksli sorguyla yüklemek için tutulur.
+    Zamanlama: app/core/schedule.py.
+    """
+    __tablename__ = "phase_detail_dependencies"
+    __table_args__ = (
+        UniqueConstraint("predecessor_id", "successor_id", name="uq_phase_detail_dependency"),
+        Index("ix_phase_detail_dependencies_successor", "successor_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    predecessor_id: Mapped[int] = mapped_column(
+        ForeignKey("phase_details.id", ondelete="CASCADE"), nullable=False
+    )
+    successor_id: Mapped[int] = mapped_column(
+        ForeignKey("phase_details.id", ondelete="CASCADE"), nullable=False
+    )
+    lag_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+class DueDigest(Base):
+    """
+    Gecikmiş / yakında teslim edilecek kayıtların ön hesaplanmış özeti.
+    core/due_scanner.py periyodik olarak baştan yazar; dashboard ve rozetler
+    canlı tabloları taramadan buradan tek indeksli sorguyla okur.
+      kind : "project" | "task" | "detail"
+      state: "overdue" (due_at < tarama anı) | "due_soon" (DUE_SOON_DAYS içinde)
+    """
+    __tablename__ = "due_digest"
+    __table_args__ = (
+        UniqueConstraint("kind", "ref_id", name="uq_due_digest_kind_ref"),
+        Index("ix_due_digest_project_state", "project_id", "state"),
+        Index("ix_due_digest_assignee_state", "assignee_id", "state"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    kind: Mapped[str] = mapped_column(String(10), nullable=False)
+    ref_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    phase_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    assignee_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    due_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    state: Mapped[str] = mapped_column(String(10), nullable=False)
+    scanned_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
 class ProjectExpense(Base):
     __tablename__ = "project_expenses"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -395,3 +582,51 @@ class ProjectExpense(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     project = relationship("Project", back_populates="expenses")
+
+
+# ============================================================
+# ARAMA İNDEKSİ
+# ============================================================
+class SearchDocument(Base):
+    """
+    /search için tam metin dokümanları: proje başlığı, proje notları,
+    faz detayları, görevler ve detay notları. Yazma yolları app/core/search.py
+    üzerinden artımlı günceller. SQLite'ta FTS5 (search_documents_fts),
+    MySQL'de (title, body) üzerinde FULLTEXT indeks kullanılır.
+    """
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        UniqueConstraint("kind", "ref_id", name="uq_search_kind_ref"),
+        Index("ix_search_documents_fulltext", "title", "body", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)  # project | note | detail | task | detail_note
+    ref_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), index=True)
+    # Toplu silme için: faz / detay silinince bağlı dokümanlar bu kolonlarla bulunur
+    phase_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    detail_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    title: Mapped[str] = mapped_column(String(255), default="")
+    body: Mapped[str] = mapped_column(Text, default="")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# SQLite: FTS5 external-content tablosu + senkron trigger'lar (tablo oluşturulurken)
+from sqlalchemy import DDL, event as _sa_event
+
+for _stmt in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "title, body, content='search_documents', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+):
+    _sa_event.listen(SearchDocument.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
@@ -1,13 +1,18 @@
 # backend/app/routers/auth.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.models import User, UserRole
 from app.schemas import UserCreate, UserOut, Token
-from app.core.auth import hash_password, verify_password, create_access_token
+from app.core.auth import (
+    hash_password,
+    authenticate_user_async,
+    upgrade_password_hash,
+    create_access_token,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -29,22 +34,25 @@ def register(data: UserCreate, db: Session = Depends(get_db)):
     return user
 
 @router.post("/login", response_model=Token)
-def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(
+    background_tasks: BackgroundTasks,
+    form: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db),
+):
     # DEBUG: hangi kullanıcı ile denendiğini görmek için
     print("ROUTER DEBUG: /auth/login username =", form.username)
 
-    user = db.query(User).filter(User.email == form.username).first()
-    print("ROUTER DEBUG: user exists?", bool(user))
+    # bcrypt doğrulaması ayrı hash havuzunda; havuz doluysa 503 döner
+    user, needs_rehash = await authenticate_user_async(db, form.username, form.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    ok = verify_password(form.password, user.password_hash)
-    print("ROUTER DEBUG: verify_password =", ok, "| hash_prefix =", (user.password_hash or "")[:4])
-    if not ok:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    # Eski hash'leri bcrypt'e yükseltme işi yanıt gönderildikten sonra yapılır
+    if needs_rehash:
+        background_tasks.add_task(upgrade_password_hash, user.id, user.password_hash, form.password)
 
     # sub olarak email koyuyoruz
     access_token = create_access_token({"sub": user.email})
 
     # ÖNEMLİ: response_model=Token olduğu için birebir Token dön
-    return Token(access_token=access_token, token_type="bearer")
\ No newline at end of file
+    return Token(access_token=access_token, token_type="bearer")
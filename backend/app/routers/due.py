@@ -0,0 +1,63 @@
+# backend/app/routers/due.py
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..core.access_index import accessible_project_ids
+from ..core.auth import get_current_user
+from ..core.due_scanner import DUE_SOON, OVERDUE
+from ..core.policy import is_admin, is_dept_head, require_project_read
+from ..models import DueDigest, Project, User
+from ..schemas import DueItemOut, DueSummaryOut
+
+# Tüm uçlar due_digest özet tablosunu okur (canlı tablolar taranmaz; bkz. core/due_scanner.py)
+router = APIRouter(tags=["Due"])
+
+@router.get("/due/summary", response_model=List[DueSummaryOut])
+def due_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Görülebilen projeler için gecikmiş / yakında teslim sayıları (rozetler)."""
+    q = db.query(
+        DueDigest.project_id,
+        func.sum(case((DueDigest.state == OVERDUE, 1), else_=0)),
+        func.sum(case((DueDigest.state == DUE_SOON, 1), else_=0)),
+    )
+    if is_admin(current_user):
+        pass
+    elif is_dept_head(current_user) and current_user.department_id:
+        q = q.join(Project, Project.id == DueDigest.project_id)\
+             .filter(Project.department_id == current_user.department_id)
+    else:
+        q = q.filter(DueDigest.project_id.in_(accessible_project_ids(db, current_user.id)))
+    rows = q.group_by(DueDigest.project_id).all()
+    return [DueSummaryOut(project_id=pid, overdue=o or 0, due_soon=s or 0) for pid, o, s in rows]
+
+@router.get("/me/due", response_model=List[DueItemOut])
+def my_due(
+    state: str = Query(None, pattern="^(overdue|due_soon)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Kullanıcıya atanmış, gecikmiş / yakında teslim görevler."""
+    q = db.query(DueDigest).filter(DueDigest.assignee_id == current_user.id)
+    if state:
+        q = q.filter(DueDigest.state == state)
+    return q.order_by(DueDigest.due_at, DueDigest.id).all()
+
+@router.get("/projects/{pid}/due", response_model=List[DueItemOut])
+def project_due(
+    pid: int,
+    state: str = Query(None, pattern="^(overdue|due_soon)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Projenin gecikmiş / yakında teslim kayıtları (proje, görev ve detaylar)."""
+    require_project_read(db, pid, current_user)
+    q = db.query(DueDigest).filter(DueDigest.project_id == pid)
+    if state:
+        q = q.filter(DueDigest.state == state)
+    return q.order_by(DueDigest.due_at, DueDigest.id).all()
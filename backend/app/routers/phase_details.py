@@ -1,35 +1,108 @@
-from fastapi import APIRouter, Depends, HTTPException
+from collections import defaultdict
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from typing import List
+from types import SimpleNamespace
+from typing import List, Optional
 from datetime import datetime
 
 from .. import models, schemas
 from ..db import get_db
 from ..core.auth import get_current_user
+from ..core.detail_closure import (
+    ancestor_details, delete_details, is_in_subtree, subtree_details, subtree_ids,
+)
+from ..core.ordering import append_rank, move_item, rebalance_scope_job
+from ..core.pagination import keyset_page
+from ..core.policy import require_project_read, require_project_manage
+from ..core.progress import (
+    apply_phase_delta, detail_counts, recompute_project_progress, subtree_detail_counts,
+)
+from ..core.rollups import (
+    apply_rollup_batch, apply_rollup_change, init_rollup, move_rollup, own_rollup, path_ids,
+    path_map, subtree_rollup,
+)
+from ..core.search import index_phase_detail, index_detail_note, remove_detail_documents, remove_document
+from ..core.trees import build_detail_trees, flat_detail_nodes, load_detail_trees
+from ..core.versioning import bump_project_version, conditional_get
 
 router = APIRouter(prefix="/phase-details", tags=["phase_details"])
 
+
+def _require_phase(
+    db: Session, phase_id: int, user: models.User, manage: bool = False
+) -> models.ProjectPhase:
+    """Fazı bulur ve fazın projesi için okuma/yönetim yetkisini kontrol eder."""
+    phase = db.query(models.ProjectPhase).filter(
+        models.ProjectPhase.id == phase_id
+    ).first()
+    if not phase:
+        raise HTTPException(status_code=404, detail="Phase not found")
+    check = require_project_manage if manage else require_project_read
+    check(db, phase.project_id, user)
+    return phase
+
+
+def _require_detail(
+    db: Session, detail_id: int, user: models.User, manage: bool = False
+) -> tuple[models.PhaseDetail, int]:
+    """
+    Detayı (fazın project_id'si ile tek sorguda) bulur ve yetkiyi kontrol eder.
+    (detay, project_id) döner.
+    """
+    row = db.query(models.PhaseDetail, models.ProjectPhase.project_id)\
+        .join(models.ProjectPhase, models.ProjectPhase.id == models.PhaseDetail.phase_id)\
+        .filter(models.PhaseDetail.id == detail_id)\
+        .first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Detail not found")
+    db_detail, project_id = row
+    check = require_project_manage if manage else require_project_read
+    check(db, project_id, user)
+    return db_detail, project_id
+
+
+def _check_new_parent(db: Session, db_detail: models.PhaseDetail, parent_id: int | None) -> None:
+    """Yeni üst başlık aynı fazda olmalı ve detayın kendi alt ağacında olmamalı (döngü)."""
+    if parent_id is None:
+        return
+    parent = db.get(models.PhaseDetail, parent_id)
+    if not parent or parent.phase_id != db_detail.phase_id:
+        raise HTTPException(status_code=400, detail="Parent must be a detail of the same phase")
+    if is_in_subtree(db, db_detail.id, parent_id):
+        raise HTTPException(status_code=400, detail="Cannot move a detail under its own subtree")
+
+
+# toplu güncellemede açıkça null gönderilemeyecek alanlar (executemany'de IntegrityError yerine "invalid")
+_NOT_NULL_DETAIL_FIELDS = frozenset(
+    c.key for c in models.PhaseDetail.__table__.columns if not c.nullable
+)
+
+
+def _subtree_out(db: Session, detail_id: int) -> dict:
+    """Detayı alt ağacıyla birlikte (children dolu) döner — closure üzerinden tek sorgu."""
+    details = subtree_details(db, detail_id)
+    roots = build_detail_trees(details)
+    return next(node for nodes in roots.values() for node in nodes if node["id"] == detail_id)
+
 @router.get("/phase/{phase_id}", response_model=List[schemas.PhaseDetail])
 def get_phase_details(
     phase_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
     # Verify the phase exists and user has access
-    phase = db.query(models.ProjectPhase).filter(
-        models.ProjectPhase.id == phase_id
-    ).first()
-    
-    if not phase:
-        raise HTTPException(status_code=404, detail="Phase not found")
-    
-    # Get all details for this phase, ordered by sort_order
-    details = db.query(models.PhaseDetail)\
-        .filter(models.PhaseDetail.phase_id == phase_id)\
-        .order_by(models.PhaseDetail.sort_order)\
-        .all()
-    
-    return details
+    phase = _require_phase(db, phase_id, current_user)
+    proj = require_project_read(db, phase.project_id, current_user)  # memoize edilmiş, sorgu yok
+    not_modified = conditional_get(request, response, proj, f"phase-details-{phase_id}")
+    if not_modified:
+        return not_modified
+
+    # Fazın tüm detayları tek sorguda okunur, ağaç bellekte kurulur:
+    # yalnızca kök düğümler döner, her detay bir kez (ebeveyninin children'ında) yer alır
+    return load_detail_trees(db, [phase_id]).get(phase_id, [])
 
 @router.post("/", response_model=schemas.PhaseDetail)
 def create_phase_detail(
@@ -37,17 +110,23 @@ def create_phase_detail(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    # Verify the phase exists
-    phase = db.query(models.ProjectPhase).filter(
-        models.ProjectPhase.id == detail.phase_id
-    ).first()
-    
-    if not phase:
-        raise HTTPException(status_code=404, detail="Phase not found")
-    
+    # Verify the phase exists and user can edit the project
+    phase = _require_phase(db, detail.phase_id, current_user, manage=True)
+
     # Create new detail
     db_detail = models.PhaseDetail(**detail.dict())
+    _check_new_parent(db, db_detail, detail.parent_id)  # başka faz/proje altına eklenemez
+    init_rollup(db_detail)
     db.add(db_detail)
+    db.flush()
+    # yeni detayın katkısı yalnızca ata yoluna eklenir
+    apply_rollup_change(db, path_ids(db, db_detail.id, include_self=False), None, own_rollup(db_detail))
+    index_phase_detail(db, db_detail, phase.project_id)
+    total, done = detail_counts(db_detail.item_type, db_detail.is_completed)
+    if total:
+        apply_phase_delta(db, phase.id, detail_total=total, detail_done=done)
+        recompute_project_progress(db, phase.project_id)
+    bump_project_version(db, phase.project_id)
     db.commit()
     db.refresh(db_detail)
     
@@ -61,15 +140,13 @@ def update_phase_detail(
     current_user: models.User = Depends(get_current_user)
 ):
     # Get existing detail
-    db_detail = db.query(models.PhaseDetail)\
-        .filter(models.PhaseDetail.id == detail_id)\
-        .first()
-    
-    if not db_detail:
-        raise HTTPException(status_code=404, detail="Detail not found")
-    
+    db_detail, project_id = _require_detail(db, detail_id, current_user, manage=True)
+
     # Update fields
     update_data = detail_update.dict(exclude_unset=True)
+    before = detail_counts(db_detail.item_type, db_detail.is_completed)
+    own_before, subtree_before = own_rollup(db_detail), subtree_rollup(db_detail)
+    old_path = None
     
     # Handle completion logic
     if "is_completed" in update_data:
@@ -81,29 +158,264 @@ def update_phase_detail(
             # If marking as incomplete, clear completed_at
             db_detail.completed_at = None
 
+    # başka bir üst başlığa taşınırsa yeni kardeşlerin sonuna eklenir
+    # (closure bağları flush sırasında event ile güncellenir)
+    if "parent_id" in update_data and update_data["parent_id"] != db_detail.parent_id:
+        _check_new_parent(db, db_detail, update_data["parent_id"])
+        db_detail.rank_key = append_rank()
+        old_path = path_ids(db, db_detail.id, include_self=False)
+
     for field, value in update_data.items():
         setattr(db_detail, field, value)
     
     db_detail.updated_at = datetime.utcnow()
+    db.flush()
+
+    # alt ağaç toplamları: yalnızca ata yolu güncellenir
+    if old_path is None:
+        apply_rollup_change(db, path_ids(db, db_detail.id), own_before, own_rollup(db_detail))
+    else:
+        apply_rollup_change(db, [db_detail.id], own_before, own_rollup(db_detail))
+        db.refresh(db_detail)
+        apply_rollup_change(db, old_path, subtree_before, None)
+        apply_rollup_change(db, path_ids(db, db_detail.id, include_self=False), None, subtree_rollup(db_detail))
+    index_phase_detail(db, db_detail, project_id)
+
+    # ilerleme sayaçları: sadece fark uygulanır, faz/proje yeniden taranmaz
+    after = detail_counts(db_detail.item_type, db_detail.is_completed)
+    if after != before:
+        apply_phase_delta(
+            db, db_detail.phase_id,
+            detail_total=after[0] - before[0], detail_done=after[1] - before[1],
+        )
+        recompute_project_progress(db, project_id)
+    bump_project_version(db, project_id)
     db.commit()
     db.refresh(db_detail)
     
     return db_detail
 
+@router.patch("/", response_model=schemas.PhaseDetailBulkOut)
+def bulk_update_phase_details(
+    body: schemas.PhaseDetailBulkIn,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Birden çok detayı kısmi olarak günceller (Gantt sürükleme, çoklu işaretleme).
+    Detaylar ve projeleri tek sorguda okunur, yetki proje başına bir kez kontrol edilir,
+    satırlar executemany UPDATE ile yazılır ve tek commit yapılır. Sonuç öğe bazındadır:
+    bulunamayan / yetkisiz / geçersiz öğeler atlanır, diğerleri uygulanır.
+    Üst başlık değişimi desteklenmez (→ /move-subtree).
+    """
+    ids = {item.id for item in body.items}
+    found = {
+        d.id: (d, project_id)
+        for d, project_id in db.query(models.PhaseDetail, models.ProjectPhase.project_id)
+        .join(models.ProjectPhase, models.ProjectPhase.id == models.PhaseDetail.phase_id)
+        .filter(models.PhaseDetail.id.in_(ids))
+    }
+    allowed: dict[int, bool] = {}
+    for project_id in {pid for _, pid in found.values()}:
+        try:
+            require_project_manage(db, project_id, current_user)
+            allowed[project_id] = True
+        except HTTPException:
+            allowed[project_id] = False
+
+    now = datetime.utcnow()
+    results: list[schemas.PhaseDetailBulkResult] = []
+    rows, rollup_changes, reindex = [], [], []
+    phase_deltas: dict[int, list[int]] = defaultdict(lambda: [0, 0])
+    projects: set[int] = set()
+    seen: set[int] = set()
+    for item in body.items:
+        if item.id in seen:
+            results.append(schemas.PhaseDetailBulkResult(id=item.id, status="invalid", detail="Duplicate id"))
+            continue
+        seen.add(item.id)
+        if item.id not in found:
+            results.append(schemas.PhaseDetailBulkResult(id=item.id, status="not_found"))
+            continue
+        db_detail, project_id = found[item.id]
+        if not allowed[project_id]:
+            results.append(schemas.PhaseDetailBulkResult(id=item.id, status="forbidden"))
+            continue
+
+        values = item.model_dump(exclude_unset=True, exclude={"id"})
+        if values.pop("parent_id", db_detail.parent_id) != db_detail.parent_id:
+            results.append(schemas.PhaseDetailBulkResult(
+                id=item.id, status="invalid", detail="Use /phase-details/{id}/move-subtree to change parent"))
+            continue
+        null_fields = sorted(f for f, v in values.items() if v is None and f in _NOT_NULL_DETAIL_FIELDS)
+        if null_fields:
+            results.append(schemas.PhaseDetailBulkResult(
+                id=item.id, status="invalid", detail=f"{', '.join(null_fields)} cannot be null"))
+            continue
+
+        # Tamamlanma mantığı tekil PUT ile aynı
+        if "is_completed" in values:
+            values["completed_at"] = (db_detail.completed_at or now) if values["is_completed"] else None
+        values["updated_at"] = now
+
+        # değişiklik sonrası görünüm: sayaç / toplam farkları ve arama için
+        after = SimpleNamespace(**{c: getattr(db_detail, c) for c in (
+            "id", "phase_id", "title", "description", "item_type", "is_completed",
+            "effort", "start_date", "end_date", "completed_at",
+        )})
+        for field, value in values.items():
+            setattr(after, field, value)
+
+        rows.append({"id": db_detail.id, **values})
+        rollup_changes.append((db_detail.id, own_rollup(db_detail), own_rollup(after)))
+        before_counts = detail_counts(db_detail.item_type, db_detail.is_completed)
+        after_counts = detail_counts(after.item_type, after.is_completed)
+        delta = phase_deltas[db_detail.phase_id]
+        delta[0] += after_counts[0] - before_counts[0]
+        delta[1] += after_counts[1] - before_counts[1]
+        if "title" in values or "description" in values:
+            reindex.append((after, project_id))
+        projects.add(project_id)
+        results.append(schemas.PhaseDetailBulkResult(
+            id=item.id, status="updated", completed_at=after.completed_at, updated_at=now))
+
+    if rows:
+        # birincil anahtara göre toplu UPDATE (aynı alan kümesine sahip satırlar tek executemany)
+        db.execute(update(models.PhaseDetail), rows, execution_options={"synchronize_session": False})
+        paths = path_map(db, [detail_id for detail_id, _, _ in rollup_changes])
+        apply_rollup_batch(db, [
+            (paths.get(detail_id) or [detail_id], before, after)
+            for detail_id, before, after in rollup_changes
+        ])
+        for after, project_id in reindex:
+            index_phase_detail(db, after, project_id)
+
+        phase_projects = {d.phase_id: pid for d, pid in found.values()}
+        touched_progress = set()
+        for phase_id, (total, done) in phase_deltas.items():
+            if total or done:
+                apply_phase_delta(db, phase_id, detail_total=total, detail_done=done)
+                touched_progress.add(phase_projects[phase_id])
+        for project_id in touched_progress:
+            recompute_project_progress(db, project_id)
+        for project_id in projects:
+            bump_project_version(db, project_id)
+        db.commit()
+
+    return schemas.PhaseDetailBulkOut(results=results, updated=len(rows))
+
+@router.post("/{detail_id}/move", response_model=schemas.PhaseDetail)
+def move_phase_detail(
+    detail_id: int,
+    body: schemas.MoveIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Detayı kardeşleri (aynı faz ve üst başlık) arasında taşır; yalnızca bu satır yazılır."""
+    db_detail, project_id = _require_detail(db, detail_id, current_user, manage=True)
+
+    scope = {"phase_id": db_detail.phase_id, "parent_id": db_detail.parent_id}
+    try:
+        long_key = move_item(db, models.PhaseDetail, scope, db_detail, body.after_id, body.before_id)
+    except LookupError:
+        raise HTTPException(status_code=400, detail="after_id/before_id must be siblings of this detail")
+    bump_project_version(db, project_id)
+    db.commit()
+    if long_key:
+        background_tasks.add_task(rebalance_scope_job, models.PhaseDetail, scope)
+    db.refresh(db_detail)
+
+    return db_detail
+
+@router.get("/{detail_id}/subtree", response_model=schemas.PhaseDetail)
+def get_detail_subtree(
+    detail_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Detay ve tüm alt detayları ağaç olarak (derinlikten bağımsız tek sorgu)."""
+    _, project_id = _require_detail(db, detail_id, current_user)
+    proj = require_project_read(db, project_id, current_user)  # memoize edilmiş, sorgu yok
+    not_modified = conditional_get(request, response, proj, f"detail-subtree-{detail_id}")
+    if not_modified:
+        return not_modified
+    return _subtree_out(db, detail_id)
+
+@router.get("/{detail_id}/ancestors", response_model=List[schemas.PhaseDetail])
+def get_detail_ancestors(
+    detail_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Detayın üst başlıkları, kökten başlayarak (children boş)."""
+    _, project_id = _require_detail(db, detail_id, current_user)
+    proj = require_project_read(db, project_id, current_user)
+    not_modified = conditional_get(request, response, proj, f"detail-ancestors-{detail_id}")
+    if not_modified:
+        return not_modified
+    return flat_detail_nodes(ancestor_details(db, detail_id))
+
+@router.post("/{detail_id}/move-subtree", response_model=schemas.PhaseDetail)
+def move_detail_subtree(
+    detail_id: int,
+    body: schemas.SubtreeMoveIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Detayı alt ağacıyla birlikte body.parent_id altına (null → faz köküne) taşır;
+    yeni kardeşler arasındaki konum after_id/before_id ile verilir (ikisi de boş → sona).
+    Alt ağaçtaki satırlara dokunulmaz, yalnızca closure bağları yeniden kurulur.
+    """
+    db_detail, project_id = _require_detail(db, detail_id, current_user, manage=True)
+    _check_new_parent(db, db_detail, body.parent_id)
+    old_path = path_ids(db, detail_id, include_self=False)
+
+    db_detail.parent_id = body.parent_id
+    scope = {"phase_id": db_detail.phase_id, "parent_id": body.parent_id}
+    try:
+        long_key = move_item(db, models.PhaseDetail, scope, db_detail, body.after_id, body.before_id)
+    except LookupError:
+        raise HTTPException(status_code=400, detail="after_id/before_id must be children of the new parent")
+    db_detail.updated_at = datetime.utcnow()
+    db.flush()
+    move_rollup(db, old_path, path_ids(db, detail_id, include_self=False), subtree_rollup(db_detail))
+    bump_project_version(db, project_id)
+    db.commit()
+    if long_key:
+        background_tasks.add_task(rebalance_scope_job, models.PhaseDetail, scope)
+
+    return _subtree_out(db, detail_id)
+
 @router.delete("/{detail_id}")
 def delete_phase_detail(
     detail_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_detail = db.query(models.PhaseDetail)\
-        .filter(models.PhaseDetail.id == detail_id)\
-        .first()
-    
-    if not db_detail:
-        raise HTTPException(status_code=404, detail="Detail not found")
-    
-    db.delete(db_detail)
+    db_detail, project_id = _require_detail(db, detail_id, current_user, manage=True)
+
+    # alt ağaç closure'dan tek sorguda; detaylar, notlar, arama dokümanları ve
+    # sayaç katkıları topluca kaldırılır (ORM cascade ile düğüm düğüm yükleme yok)
+    subtree = subtree_ids(db, detail_id) or [detail_id]
+    ancestors = path_ids(db, detail_id, include_self=False)
+    removed = subtree_rollup(db_detail)
+    remove_detail_documents(db, subtree)
+    total, done = subtree_detail_counts(db, subtree)
+    phase_id = db_detail.phase_id
+    delete_details(db, subtree)
+    db.expunge(db_detail)
+    apply_rollup_change(db, ancestors, removed, None)
+    if total:
+        apply_phase_delta(db, phase_id, detail_total=-total, detail_done=-done)
+        recompute_project_progress(db, project_id)
+    bump_project_version(db, project_id)
     db.commit()
     
     return {"message": "Detail deleted successfully"}
@@ -112,17 +424,42 @@ def delete_phase_detail(
 # NOTES
 # ======================
 
-@router.get("/{detail_id}/notes", response_model=List[schemas.PhaseDetailNoteOut])
+def _bump_note_count(db: Session, detail_id: int, delta: int) -> None:
+    """note_count'u tek UPDATE ile değiştirir (detayın updated_at'i korunur)."""
+    db.query(models.PhaseDetail).filter(models.PhaseDetail.id == detail_id).update(
+        {
+            models.PhaseDetail.note_count: models.PhaseDetail.note_count + delta,
+            models.PhaseDetail.updated_at: models.PhaseDetail.updated_at,
+        },
+        synchronize_session=False,
+    )
+
+@router.get("/{detail_id}/notes", response_model=schemas.PhaseDetailNotePageOut)
 def get_phase_detail_notes(
     detail_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    notes = db.query(models.PhaseDetailNote)\
-        .filter(models.PhaseDetailNote.detail_id == detail_id)\
-        .order_by(models.PhaseDetailNote.created_at.desc())\
-        .all()
-    return notes
+    """
+    Notlar en yeniden eskiye, (created_at, id) üzerinde keyset sayfalı
+    (ix_phase_detail_notes_detail_created). total, detayın note_count'udur.
+    """
+    db_detail, project_id = _require_detail(db, detail_id, current_user)
+    proj = require_project_read(db, project_id, current_user)  # memoize edilmiş, sorgu yok
+    not_modified = conditional_get(request, response, proj, f"detail-notes-{detail_id}-{cursor or ''}-{limit}")
+    if not_modified:
+        return not_modified
+    q = db.query(models.PhaseDetailNote).filter(models.PhaseDetailNote.detail_id == detail_id)
+    notes, next_cursor = keyset_page(
+        q, models.PhaseDetailNote.created_at, models.PhaseDetailNote.id, cursor, limit, descending=True,
+    )
+    return schemas.PhaseDetailNotePageOut(
+        items=notes, total=db_detail.note_count or 0, next_cursor=next_cursor,
+    )
 
 @router.post("/notes", response_model=schemas.PhaseDetailNoteOut)
 def create_phase_detail_note(
@@ -130,17 +467,38 @@ def create_phase_detail_note(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    # Verify detail exists
-    detail = db.query(models.PhaseDetail).filter(
-        models.PhaseDetail.id == note.detail_id
-    ).first()
-    
-    if not detail:
-        raise HTTPException(status_code=404, detail="Phase Detail not found")
-    
-    db_note = models.PhaseDetailNote(**note.dict())
+    # Verify detail exists and user can read the project
+    detail, project_id = _require_detail(db, note.detail_id, current_user)
+
+    db_note = models.PhaseDetailNote(
+        detail_id=note.detail_id, note=note.note, author_id=current_user.id, user=current_user.name,
+    )
     db.add(db_note)
+    db.flush()
+    _bump_note_count(db, detail.id, 1)
+    index_detail_note(db, db_note, project_id, detail.phase_id)
+    bump_project_version(db, project_id)
     db.commit()
     db.refresh(db_note)
     
     return db_note
+
+@router.delete("/notes/{note_id}", status_code=204)
+def delete_phase_detail_note(
+    note_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Notu yazan kullanıcı ya da projeyi yönetebilen kullanıcı silebilir."""
+    db_note = db.get(models.PhaseDetailNote, note_id)
+    if not db_note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    is_author = db_note.author_id is not None and db_note.author_id == current_user.id
+    _, project_id = _require_detail(db, db_note.detail_id, current_user, manage=not is_author)
+
+    remove_document(db, "detail_note", db_note.id)
+    _bump_note_count(db, db_note.detail_id, -1)
+    db.delete(db_note)
+    bump_project_version(db, project_id)
+    db.commit()
+    return
@@ -1,25 +1,20 @@
 # backend/app/routers/project_budget.py
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from ..db import get_db
 from ..core.auth import get_current_user
 from ..core.policy import require_project_manage, require_project_read
+from ..core.versioning import bump_project_version, conditional_get
 from ..models import Project, ProjectExpense, User
 from ..schemas import BudgetSetIn, ExpenseCreate, ExpenseOut, BudgetSummaryOut
 
 router = APIRouter(prefix="/projects", tags=["Budget"])
 
-@router.get("/{pid}/budget", response_model=BudgetSummaryOut)
-def get_budget(
-    pid: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    proj = require_project_read(db, pid, current_user)
-    remaining = (proj.total_budget or Decimal("0")) - (proj.spent_amount or Decimal("0"))
+def budget_summary(proj: Project) -> BudgetSummaryOut:
+    """Projedeki total_budget/spent_amount alanlarından özet (ek sorgu yok)."""
     total = Decimal(proj.total_budget or 0)
     spent = Decimal(proj.spent_amount or 0)
     percent = float((spent / total * 100) if total > 0 else 0)
@@ -27,10 +22,24 @@ def get_budget(
         project_id=proj.id,
         total_budget=total,
         spent_amount=spent,
-        remaining=remaining,
+        remaining=total - spent,
         percent_used=round(percent, 2),
     )
 
+@router.get("/{pid}/budget", response_model=BudgetSummaryOut)
+def get_budget(
+    pid: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    proj = require_project_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "budget")
+    if not_modified:
+        return not_modified
+    return budget_summary(proj)
+
 @router.put("/{pid}/budget", response_model=BudgetSummaryOut, status_code=status.HTTP_200_OK)
 def set_budget(
     pid: int,
@@ -44,17 +53,10 @@ def set_budget(
     proj.total_budget = body.total_budget
 
     # spent_amount korunur; backend harcamalarla güncelliyor
+    bump_project_version(db, pid)
     db.commit()
     db.refresh(proj)
-    remaining = (proj.total_budget or Decimal("0")) - (proj.spent_amount or Decimal("0"))
-    percent = float((proj.spent_amount / proj.total_budget * 100) if proj.total_budget > 0 else 0)
-    return BudgetSummaryOut(
-        project_id=proj.id,
-        total_budget=proj.total_budget,
-        spent_amount=proj.spent_amount,
-        remaining=remaining,
-        percent_used=round(percent, 2),
-    )
+    return budget_summary(proj)
 
 @router.post("/{pid}/expenses", response_model=ExpenseOut, status_code=status.HTTP_201_CREATED)
 def add_expense(
@@ -76,6 +78,7 @@ def add_expense(
     db.flush()
     spent = db.query(func.coalesce(func.sum(ProjectExpense.amount), 0)).filter(ProjectExpense.project_id == pid).scalar()
     proj.spent_amount = spent
+    bump_project_version(db, pid)
     db.commit()
     db.refresh(exp)
     return exp
@@ -83,10 +86,15 @@ def add_expense(
 @router.get("/{pid}/expenses", response_model=list[ExpenseOut])
 def list_expenses(
     pid: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    require_project_read(db, pid, current_user)
+    proj = require_project_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "expenses")
+    if not_modified:
+        return not_modified
     return db.query(ProjectExpense).filter(ProjectExpense.project_id == pid).order_by(ProjectExpense.created_at.desc()).all()
 
 @router.delete("/{pid}/expenses/{eid}", status_code=status.HTTP_204_NO_CONTENT)
@@ -107,5 +115,6 @@ def delete_expense(
     db.flush()
     spent = db.query(func.coalesce(func.sum(ProjectExpense.amount), 0)).filter(ProjectExpense.project_id == pid).scalar()
     proj.spent_amount = spent
+    bump_project_version(db, pid)
     db.commit()
     return
\ No newline at end of file
@@ -1,13 +1,19 @@
 import os
-import uuid
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Response, status
 from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from ..db import get_db
 from ..core.auth import get_current_user
-from ..models import Project, ProjectMember, ProjectFile, User
+from ..core.policy import require_project_read, require_project_owner
+from ..core.blobs import (
+    BLOB_TMP, acquire_blob, blob_path, place_blob, register_blob, release_blob, remove_unreferenced,
+)
+from ..core.uploads import StoredUpload, check_content_length, discard_part, stream_to_part
+from ..core.versioning import bump_project_version, conditional_get
+from ..models import Project, ProjectFile, User
 from ..schemas import ProjectFileOut
 from ..core.config import UPLOAD_DIR  # 4. adımda tanımladık
 
@@ -16,29 +22,23 @@ router = APIRouter(prefix="/projects", tags=["Project Files"])
 MAX_SIZE = 20 * 1024 * 1024  # 20 MB
 
 def _require_read(db: Session, pid: int, user: User) -> Project:
-    proj = db.query(Project).filter(Project.id == pid).first()
-    if not proj:
-        raise HTTPException(status_code=404, detail="Project not found")
-    if user.role != "admin":
-        is_owner = (proj.owner_id == user.id)
-        is_member = db.query(ProjectMember).filter_by(project_id=pid, user_id=user.id).first() is not None
-        if not (is_owner or is_member):
-            raise HTTPException(status_code=403, detail="No access to this project")
-    return proj
+    return require_project_read(db, pid, user)
 
 def _require_manage(db: Session, pid: int, user: User) -> Project:
-    proj = _require_read(db, pid, user)
-    if user.role != "admin" and proj.owner_id != user.id:
-        raise HTTPException(status_code=403, detail="Only admin/owner can delete files")
-    return proj
+    return require_project_owner(db, pid, user, detail="Only admin/owner can delete files")
 
 @router.get("/{pid}/files", response_model=List[ProjectFileOut])
 def list_files(
     pid: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    _require_read(db, pid, current_user)
+    proj = _require_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "files")
+    if not_modified:
+        return not_modified
     files = (
         db.query(ProjectFile)
         .filter(ProjectFile.project_id == pid)
@@ -47,47 +47,63 @@ def list_files(
     )
     return files
 
-@router.post("/{pid}/files", response_model=ProjectFileOut, status_code=status.HTTP_201_CREATED)
-async def upload_file(
-    pid: int,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    _require_read(db, pid, current_user)
-
-    # boyut kontrolü (UploadFile'ta stream var; hızlı kontrol için size_bytes'ı len(await file.read()) yapıp sonra seek(0))
-    content = await file.read()
-    if len(content) > MAX_SIZE:
-        raise HTTPException(status_code=413, detail="File too large (max 20MB)")
-    await file.seek(0)
-
-    # proje klasörü
-    proj_dir = os.path.join(UPLOAD_DIR, "projects", str(pid))
-    os.makedirs(proj_dir, exist_ok=True)
-
-    # benzersiz dosya adı
-    rnd = uuid.uuid4().hex
-    stored_name = f"{rnd}"
-    stored_path = os.path.join(proj_dir, stored_name)
-
-    # diske yaz
-    with open(stored_path, "wb") as f:
-        f.write(await file.read())
-
+def _check_upload_access(db: Session, pid: int, user: User) -> None:
+    """Yetki kontrolü; ardından okuma transaction'ı kapatılır (dosya akışı sırasında bağlantı/kilit tutulmaz)."""
+    try:
+        _require_read(db, pid, user)
+    finally:
+        db.rollback()
+
+def _record_upload(
+    db: Session, pid: int, user: User, file: UploadFile, part_path: str, digest: StoredUpload
+) -> ProjectFile:
+    """
+    Blob referansı + dosyanın yerine konması + dosya kaydı + sürüm artışı tek kısa
+    transaction'da. place_blob, file_blobs satırı kilitliyken çalışır (bkz. core/blobs.py).
+    """
     pf = ProjectFile(
         project_id=pid,
-        uploader_id=current_user.id,
+        uploader_id=user.id,
         filename=file.filename,
-        stored_path=stored_path,
+        stored_path=blob_path(digest.sha256),
         content_type=file.content_type,
-        size_bytes=os.path.getsize(stored_path),
+        size_bytes=digest.size_bytes,
+        sha256=digest.sha256,
     )
-    db.add(pf)
-    db.commit()
+    try:
+        if not acquire_blob(db, digest.sha256):
+            register_blob(db, digest.sha256, digest.size_bytes)
+        place_blob(part_path, digest.sha256)
+        db.add(pf)
+        bump_project_version(db, pid)
+        db.commit()
+    except Exception:
+        db.rollback()
+        discard_part(part_path)
+        raise
     db.refresh(pf)
     return pf
 
+@router.post("/{pid}/files", response_model=ProjectFileOut, status_code=status.HTTP_201_CREATED)
+async def upload_file(
+    pid: int,
+    request: Request,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    İçerik adresli depo: dosya tek geçişte (boyut + SHA-256 + yazım) geçici bir part'a
+    akıtılır; ardından referans + yerine koyma + kayıt kısa bir transaction'da yapılır
+    (aynı içerik zaten varsa part silinir). Dosya akışı sürerken DB transaction'ı açık
+    değildir; DB çağrıları threadpool'da çalışır.
+    """
+    await run_in_threadpool(_check_upload_access, db, pid, current_user)
+    check_content_length(request, MAX_SIZE)
+
+    part_path, digest = await stream_to_part(file, BLOB_TMP, MAX_SIZE)
+    return await run_in_threadpool(_record_upload, db, pid, current_user, file, part_path, digest)
+
 @router.get("/{pid}/files/{file_id}")
 def download_file(
     pid: int,
@@ -123,16 +139,13 @@ def delete_file(
     if not pf:
         raise HTTPException(status_code=404, detail="File not found")
 
-    # DB'den sil
+    # DB'den sil; blob'un son referansıysa dosya commit'ten sonra silinir
+    orphan = release_blob(db, pf)
     db.delete(pf)
+    bump_project_version(db, pid)
     db.commit()
 
-    # dosyayı diskte sil (varsa)
-    try:
-        if os.path.exists(pf.stored_path):
-            os.remove(pf.stored_path)
-    except Exception:
-        # dosya yoksa ya da izin hatası varsa DB silinmiş olduğu için 204 dönüyoruz
-        pass
+    if orphan:
+        remove_unreferenced(db, orphan)
 
-    return
\ No newline at end of file
+    return
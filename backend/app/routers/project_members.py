@@ -1,6 +1,6 @@
 # app/routers/project_members.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 # Veritabanı bağlantısı
@@ -9,6 +9,13 @@ from ..db import get_db
 # Kimlik doğrulama (token kontrolü)
 from ..core.auth import get_current_user
 
+# Ortak proje erişim çözücüsü ve kullanıcı → proje indeksi
+from ..core.policy import require_project_read, require_project_manage, forget_project_access
+from ..core.access_index import grant_access, sync_access
+from ..core.overview_cache import invalidate_overview
+from ..core.project_summary import adjust_member_count
+from ..core.versioning import bump_project_version, conditional_get
+
 # Veritabanı modelleri
 from ..models import Project, ProjectMember, ProjectMemberRole, User
 
@@ -30,34 +37,18 @@ router = APIRouter(prefix="/projects", tags=["Project Members"])
 
 def _require_project_access(db: Session, pid: int, user: User) -> Project:
     """
-    Belirli bir projeye erişim yetkisini kontrol eder.
-    - Admin tüm projelere erişebilir.
-    - Diğer kullanıcılar sadece owner (sahip) veya üye oldukları projelere erişebilir.
+    Belirli bir projeye erişim yetkisini kontrol eder (core.policy ortak çözücüsü).
+    - Admin, departman başkanı, proje sahibi ve üyeler erişebilir.
     """
-    # 1️⃣ Proje var mı kontrol et
-    proj = db.query(Project).filter(Project.id == pid).first()
-    if not proj:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    # 2️⃣ Admin dışındakiler için erişim kontrolü
-    if user.role != "admin":
-        # Kullanıcı proje sahibi mi?
-        is_owner = proj.owner_id == user.id
-
-        # Kullanıcı proje üyesi mi?
-        is_member = (
-            db.query(ProjectMember)
-            .filter(ProjectMember.project_id == pid, ProjectMember.user_id == user.id)
-            .first()
-            is not None
-        )
+    return require_project_read(db, pid, user)
 
-        # Ne sahibi ne de üye ise → erişim reddedilir
-        if not (is_owner or is_member):
-            raise HTTPException(status_code=403, detail="No access to this project")
 
-    # 3️⃣ Yetkiliyse proje nesnesini döndür
-    return proj
+def _require_member_manage(db: Session, pid: int, user: User) -> Project:
+    """
+    Üye ekleme/çıkarma yetkisi: admin, departman başkanı, owner veya
+    manager/contributor rolündeki üyeler (viewer ekleyip çıkaramaz).
+    """
+    return require_project_manage(db, pid, user, detail="Not allowed to manage project members")
 
 
 def _to_member_out(db: Session, m: ProjectMember) -> ProjectMemberOut:
@@ -91,10 +82,10 @@ def add_member(
 ):
     """
     Yeni bir kullanıcıyı belirli bir projeye üye olarak ekler.
-    - Sadece admin, owner veya projeye erişimi olan kullanıcı çağırabilir.
+    - Sadece admin, owner veya projeyi yönetebilen üyeler çağırabilir.
     """
     # 1️⃣ Yetki kontrolü
-    _require_project_access(db, pid, current_user)
+    _require_member_manage(db, pid, current_user)
 
     # 2️⃣ Kullanıcı zaten üye mi?
     exists = (
@@ -123,9 +114,14 @@ def add_member(
         role=role_value,  # Varsayılan: contributor
     )
 
-    # 4️⃣ Veritabanına ekle
+    # 4️⃣ Veritabanına ekle (erişim indeksi aynı transaction'da)
     db.add(member)
+    grant_access(db, pid, data.user_id)
+    adjust_member_count(db, pid, +1)
+    invalidate_overview(db)
+    bump_project_version(db, pid)
     db.commit()
+    forget_project_access(db, pid)
     db.refresh(member)
 
     # 5️⃣ Üye bilgilerini (user_name, email dahil) döndür
@@ -135,6 +131,8 @@ def add_member(
 @router.get("/{pid}/members", response_model=list[ProjectMemberOut])
 def list_members(
     pid: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -142,8 +140,11 @@ def list_members(
     Belirli bir projenin tüm üyelerini listeler.
     - Sadece admin, owner veya o projenin üyesi erişebilir.
     """
-    # 1️⃣ Yetki kontrolü
-    _require_project_access(db, pid, current_user)
+    # 1️⃣ Yetki kontrolü (+ ETag: değişmediyse 304)
+    proj = _require_project_access(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "members")
+    if not_modified:
+        return not_modified
 
     # 2️⃣ Üyeleri veritabanından çek
     members = db.query(ProjectMember).filter(ProjectMember.project_id == pid).all()
@@ -161,10 +162,10 @@ def remove_member(
 ):
     """
     Belirli bir projeden bir üyeyi kaldırır (silme işlemi).
-    - Sadece admin veya proje sahibi çağırabilir.
+    - Sadece admin, owner veya projeyi yönetebilen üyeler çağırabilir.
     """
     # 1️⃣ Yetki kontrolü
-    _require_project_access(db, pid, current_user)
+    _require_member_manage(db, pid, current_user)
 
     # 2️⃣ Üye kaydı var mı kontrol et
     m = (
@@ -175,9 +176,14 @@ def remove_member(
     if not m:
         raise HTTPException(status_code=404, detail="Member not found")
 
-    # 3️⃣ Üyeyi sil
+    # 3️⃣ Üyeyi sil; owner_id ile hâlâ erişimi varsa indeks satırı kalır
     db.delete(m)
+    sync_access(db, pid, m.user_id)
+    adjust_member_count(db, pid, -1)
+    invalidate_overview(db)
+    bump_project_version(db, pid)
     db.commit()
+    forget_project_access(db, pid)
 
     # 4️⃣ HTTP 204 → içeriksiz başarı yanıtı
     return
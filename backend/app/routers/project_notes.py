@@ -1,7 +1,7 @@
 # backend/app/routers/project_notes.py
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 # Veritabanı bağlantısı
@@ -10,8 +10,13 @@ from ..db import get_db
 # JWT doğrulama için geçerli kullanıcıyı alma fonksiyonu
 from ..core.auth import get_current_user
 
+# Ortak proje erişim çözücüsü ve arama indeksi
+from ..core.policy import require_project_read, resolve_project_access
+from ..core.search import index_note, remove_document
+from ..core.versioning import bump_project_version, conditional_get
+
 # Modeller
-from ..models import Project, ProjectNote, ProjectMember, User
+from ..models import Project, ProjectNote, User
 
 # Girdi/çıktı (request/response) şemaları
 from ..schemas import ProjectNoteCreate, ProjectNoteOut
@@ -31,36 +36,11 @@ router = APIRouter(prefix="/projects", tags=["Project Notes"])
 
 def _require_project_access(db: Session, pid: int, user: User) -> Project:
     """
-    Belirli bir projeye erişim izni olup olmadığını kontrol eder.
-    Admin, proje sahibi veya projeye üye olan kişiler erişebilir.
+    Belirli bir projeye erişim izni olup olmadığını kontrol eder
+    (core.policy'deki ortak erişim çözücüsü).
     Erişimi olmayan kullanıcılar için 403 Forbidden hatası döner.
     """
-    # 1️⃣ Proje var mı kontrol et
-    proj = db.query(Project).filter(Project.id == pid).first()
-    if not proj:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    # 2️⃣ Admin kullanıcı tüm projelere erişebilir
-    if user.role == "admin":
-        return proj
-
-    # 3️⃣ Proje sahibi erişebilir
-    if proj.owner_id == user.id:
-        return proj
-
-    # 4️⃣ Projeye üye mi?
-    is_member = (
-        db.query(ProjectMember)
-        .filter(ProjectMember.project_id == pid, ProjectMember.user_id == user.id)
-        .first()
-        is not None
-    )
-
-    # Üye değilse → erişim reddedilir
-    if not is_member:
-        raise HTTPException(status_code=403, detail="No access to this project")
-
-    return proj
+    return require_project_read(db, pid, user)
 
 
 def _note_to_out(db: Session, note: ProjectNote) -> ProjectNoteOut:
@@ -110,8 +90,11 @@ def add_note(
         content=data.content.strip()
     )
 
-    # 4️⃣ Veritabanına kaydet
+    # 4️⃣ Veritabanına kaydet (arama indeksi aynı transaction'da)
     db.add(note)
+    db.flush()
+    index_note(db, note)
+    bump_project_version(db, pid)
     db.commit()
     db.refresh(note)
 
@@ -122,6 +105,8 @@ def add_note(
 @router.get("/{pid}/notes", response_model=List[ProjectNoteOut])
 def list_notes(
     pid: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -130,8 +115,11 @@ def list_notes(
     - Erişim: admin, proje sahibi veya projeye üye olan kullanıcılar.
     - Notlar oluşturulma tarihine göre (yeniden eskiye) sıralanır.
     """
-    # 1️⃣ Erişim kontrolü
-    _require_project_access(db, pid, current_user)
+    # 1️⃣ Erişim kontrolü (+ ETag: değişmediyse 304)
+    proj = _require_project_access(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "notes")
+    if not_modified:
+        return not_modified
 
     # 2️⃣ İlgili projedeki notları sırala (en yeni başta)
     notes = (
@@ -159,7 +147,7 @@ def delete_note(
     - Başarılıysa 204 (no content) döner.
     """
     # 1️⃣ Yetkili mi kontrol et (proje erişimi)
-    proj = _require_project_access(db, pid, current_user)
+    _require_project_access(db, pid, current_user)
 
     # 2️⃣ Silinmek istenen notu bul
     note = (
@@ -172,7 +160,7 @@ def delete_note(
 
     # 3️⃣ Silme yetkisini kontrol et
     is_author = note.author_id == current_user.id         # Notu yazan kişi mi?
-    is_owner = proj.owner_id == current_user.id           # Proje sahibi mi?
+    is_owner = resolve_project_access(db, pid, current_user).can_own  # Proje sahibi mi?
     is_admin_or_pm = current_user.role in ("admin", "pm") # Admin veya proje yöneticisi mi?
 
     # Hiçbiri değilse → erişim reddedilir
@@ -180,7 +168,9 @@ def delete_note(
         raise HTTPException(status_code=403, detail="Permission denied")
 
     # 4️⃣ Notu sil
+    remove_document(db, "note", note.id)
     db.delete(note)
+    bump_project_version(db, pid)
     db.commit()
 
     # 5️⃣ Başarılı yanıt (204 No Content)
@@ -1,16 +1,28 @@
 # backend/app/routers/project_phases.py
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import calendar
+import json
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import delete, select, update
 
 # DB oturumu ve kimlik doğrulama
 from ..db import get_db
 from ..core.auth import get_current_user
+from ..core.ordering import append_ranks, apply_reorder, move_item, needs_rebalance, rebalance_scope_job
+from ..core.policy import require_project_read, require_project_owner
+from ..core.progress import phase_progress, phase_totals, recompute_project_progress
+from ..core.schedule import delete_dependencies
+from ..core.search import remove_phase_documents
+from ..core.trees import load_project_detail_trees
+from ..core.versioning import bump_project_version, conditional_get
 
 # Modeller ve enum
-from ..models import Project, ProjectPhase, User, PhaseStatus
+from ..models import (
+    Project, ProjectPhase, User, PhaseStatus, PhaseDetail, PhaseDetailClosure, PhaseDetailNote, PhaseTask,
+)
 
 # İstek/yanıt şemaları
 from ..schemas import (
@@ -18,6 +30,10 @@ from ..schemas import (
     ProjectPhaseUpdate,
     ProjectPhaseOut,
     ReorderPhasesIn,
+    MoveIn,
+    PhaseDetailGroupOut,
+    PhaseBatchIn,
+    PhaseBatchOut,
 )
 
 # Tüm endpoint’leri /projects/... altında toplar
@@ -30,47 +46,28 @@ router = APIRouter(prefix="/projects", tags=["Project Phases"])
 
 def _require_read(db: Session, pid: int, user: User) -> Project:
     """
-    Okuma yetkisi kontrolü:
-      - Admin ise her projeyi görebilir.
-      - Admin değilse, proje sahibi veya projeye üye olmalı.
+    Okuma yetkisi kontrolü (core.policy'deki ortak erişim çözücüsü).
     Proje yoksa 404, yetki yoksa 403 döner.
     """
-    # Projeyi bul
-    proj = db.query(Project).filter(Project.id == pid).first()
-    if not proj:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    # Admin → direkt izin
-    if user.role != "admin":
-        # Sahip mi / Üye mi?
-        is_owner = proj.owner_id == user.id
-        is_member = any(m.user_id == user.id for m in proj.members)
-        if not (is_owner or is_member):
-            raise HTTPException(status_code=403, detail="No access to this project")
-
-    return proj
+    return require_project_read(db, pid, user)
 
 
 def _require_manage(db: Session, pid: int, user: User) -> Project:
     """
     Yönetim (değiştirme/silme/oluşturma) yetkisi kontrolü:
-      - Admin veya proje sahibi olmalı.
+      - Admin, departman başkanı veya proje sahibi olmalı.
     """
-    proj = _require_read(db, pid, user)
-    if user.role != "admin" and proj.owner_id != user.id:
-        raise HTTPException(status_code=403, detail="Only admin/owner can modify phases")
-    return proj
+    return require_project_owner(db, pid, user, detail="Only admin/owner can modify phases")
 
 
-def _next_sort(db: Session, pid: int) -> int:
-    """
-    Yeni eklenecek faz için bir sonraki sıralama numarasını (sort_order) hesaplar.
-    Projede mevcut en yüksek sort_order + 1 döner.
-    """
-    mx = db.query(func.max(ProjectPhase.sort_order)).filter(
-        ProjectPhase.project_id == pid
-    ).scalar()
-    return (mx or 0) + 1
+def _ordered_phases(db: Session, pid: int) -> list[ProjectPhase]:
+    """Projenin fazları; rank_key artan, eşitlikte id artan → stabil sıralama."""
+    return (
+        db.query(ProjectPhase)
+        .filter(ProjectPhase.project_id == pid)
+        .order_by(ProjectPhase.rank_key.asc(), ProjectPhase.id.asc())
+        .all()
+    )
 
 
 # ============================================================
@@ -80,23 +77,156 @@ def _next_sort(db: Session, pid: int) -> int:
 @router.get("/{pid}/phases", response_model=List[ProjectPhaseOut])
 def list_phases(
     pid: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Projeye ait fazları sırasına göre listeler.
-    Okuma yetkisi gerektirir.
+    Okuma yetkisi gerektirir. If-None-Match eşleşirse 304 döner.
     """
-    _require_read(db, pid, current_user)
+    proj = _require_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "phases")
+    if not_modified:
+        return not_modified
 
-    # sort_order artan, eşitlikte id artan → stabil sıralama
-    phases = (
-        db.query(ProjectPhase)
-        .filter(ProjectPhase.project_id == pid)
-        .order_by(ProjectPhase.sort_order.asc(), ProjectPhase.id.asc())
+    return [_to_out(p) for p in _ordered_phases(db, pid)]
+
+
+@router.get("/{pid}/phase-details", response_model=List[PhaseDetailGroupOut])
+def list_project_phase_details(
+    pid: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Projedeki tüm fazların detay ağaçları, faz sırasıyla gruplanmış halde.
+    Faz başına /phase-details/phase/{id} çağrısı yerine tek istek ve tek sorgu.
+    """
+    proj = _require_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "phase-details")
+    if not_modified:
+        return not_modified
+
+    return [
+        PhaseDetailGroupOut(phase_id=phase_id, details=details)
+        for phase_id, details in load_project_detail_trees(db, pid)
+    ]
+
+
+def _epoch(dt: Optional[datetime]) -> Optional[int]:
+    """Naive (UTC) datetime → epoch saniye."""
+    return calendar.timegm(dt.utctimetuple()) if dt else None
+
+
+@router.get("/{pid}/gantt")
+def project_gantt(
+    pid: int,
+    request: Request,
+    response: Response,
+    window_from: Optional[datetime] = Query(None, alias="from"),
+    window_to: Optional[datetime] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Gantt çizimi için sıkıştırılmış, sütunlu (paralel diziler) faz + detay akışı.
+    Açıklama/not gibi alanlar gönderilmez; tarihler epoch saniyedir.
+    from/to verilirse yalnızca pencereyle kesişen kayıtlar ve ataları döner
+    (start_date <= to ve end_date >= from; ix_phase_details_phase_dates).
+    Pydantic doğrulaması atlanır, gövde doğrudan JSON'a yazılır.
+    """
+    proj = _require_read(db, pid, current_user)
+    if window_from and window_to and window_from > window_to:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+    scope = f"gantt-{_epoch(window_from) or ''}-{_epoch(window_to) or ''}"
+    not_modified = conditional_get(request, response, proj, scope)
+    if not_modified:
+        return not_modified
+
+    def _window(start_col, end_col):
+        conds = []
+        if window_to is not None:
+            conds.append(start_col <= window_to)
+        if window_from is not None:
+            conds.append(end_col >= window_from)
+        return conds
+
+    phase_rows = (
+        db.query(
+            ProjectPhase.id, ProjectPhase.name, ProjectPhase.start_date, ProjectPhase.end_date,
+            ProjectPhase.status, ProjectPhase.detail_total, ProjectPhase.detail_done,
+            ProjectPhase.task_total, ProjectPhase.task_done,
+        )
+        .filter(ProjectPhase.project_id == pid, *_window(ProjectPhase.start_date, ProjectPhase.end_date))
+        .order_by(ProjectPhase.rank_key, ProjectPhase.id)
+        .all()
+    )
+    detail_cols = (
+        PhaseDetail.id, PhaseDetail.phase_id, PhaseDetail.parent_id, PhaseDetail.title,
+        PhaseDetail.start_date, PhaseDetail.end_date, PhaseDetail.rollup_start, PhaseDetail.rollup_end,
+        PhaseDetail.is_completed, PhaseDetail.priority, PhaseDetail.item_type,
+    )
+    window = _window(PhaseDetail.start_date, PhaseDetail.end_date)
+    if window:
+        # pencereyle kesişen detaylar + ağacın kopmaması için ataları (closure üzerinden tek sorgu)
+        hits = (
+            select(PhaseDetail.id)
+            .join(ProjectPhase, ProjectPhase.id == PhaseDetail.phase_id)
+            .where(ProjectPhase.project_id == pid, *window)
+        )
+        detail_filter = PhaseDetail.id.in_(
+            select(PhaseDetailClosure.ancestor_id).where(PhaseDetailClosure.descendant_id.in_(hits))
+        )
+    else:
+        detail_filter = PhaseDetail.phase_id.in_(select(ProjectPhase.id).where(ProjectPhase.project_id == pid))
+    detail_rows = (
+        db.query(*detail_cols)
+        .filter(detail_filter)
+        .order_by(PhaseDetail.phase_id, PhaseDetail.rank_key, PhaseDetail.id)
         .all()
     )
-    return [_to_out(p) for p in phases]
+
+    phases = {"ids": [], "names": [], "starts": [], "ends": [], "statuses": [], "progress": []}
+    for pid_, name, start, end, st, dt, dd, tt, td in phase_rows:
+        phases["ids"].append(pid_)
+        phases["names"].append(name)
+        phases["starts"].append(_epoch(start))
+        phases["ends"].append(_epoch(end))
+        phases["statuses"].append(st.value if hasattr(st, "value") else st)
+        phases["progress"].append(round(phase_progress(st, (dt or 0) + (tt or 0), (dd or 0) + (td or 0))))
+
+    items = {
+        "ids": [], "phase_ids": [], "parent_ids": [], "titles": [], "starts": [], "ends": [],
+        "completed": [], "priorities": [], "types": [],
+    }
+    for did, phase_id, parent_id, title, start, end, r_start, r_end, done, priority, item_type in detail_rows:
+        items["ids"].append(did)
+        items["phase_ids"].append(phase_id)
+        items["parent_ids"].append(parent_id)
+        items["titles"].append(title)
+        # kendi tarihi olmayan başlıklar alt ağaç sınırlarıyla çizilir
+        items["starts"].append(_epoch(start or r_start))
+        items["ends"].append(_epoch(end or r_end))
+        items["completed"].append(1 if done else 0)
+        items["priorities"].append(priority)
+        items["types"].append(item_type)
+
+    payload = {
+        "project_id": pid,
+        "from": _epoch(window_from),
+        "to": _epoch(window_to),
+        "phases": phases,
+        "items": items,
+    }
+    return Response(
+        content=json.dumps(payload, separators=(",", ":"), ensure_ascii=False),
+        media_type="application/json",
+        headers={"ETag": response.headers["etag"]},
+    )
 
 
 @router.post("/{pid}/phases", response_model=ProjectPhaseOut, status_code=status.HTTP_201_CREATED)
@@ -109,23 +239,11 @@ def create_phase(
     """
     Yeni bir faz oluşturur.
     Yönetim yetkisi (admin/owner) gerektirir.
-    sort_order verilmezse en sona eklenir; verilirse çakışma varsa yine en sona atar.
+    Her zaman en sona eklenir (rank_key zamandan üretilir, MAX sorgusu yok);
+    sort_order yalnızca eski istemciler için saklanır. Konum değiştirmek için /move.
     """
     _require_manage(db, pid, current_user)
 
-    # İstenen sort_order varsa ve o sırayı biri kullanıyorsa, en sona ekle
-    desired = data.sort_order
-    if desired is None:
-        sort_order = _next_sort(db, pid)
-    else:
-        exists = (
-            db.query(ProjectPhase)
-              .filter(ProjectPhase.project_id == pid,
-                      ProjectPhase.sort_order == desired)
-              .first()
-        )
-        sort_order = _next_sort(db, pid) if exists else desired
-
     # status alanı Literal veya PhaseStatus enum gelebilir → PhaseStatus'e normalize et
     status_value = (
         PhaseStatus(data.status)
@@ -137,12 +255,15 @@ def create_phase(
     phase = ProjectPhase(
         project_id=pid,
         name=data.name,
-        sort_order=sort_order,
+        sort_order=data.sort_order if data.sort_order is not None else 1,
         status=status_value,
         start_date=data.start_date,
         end_date=data.end_date,
     )
     db.add(phase)
+    db.flush()
+    recompute_project_progress(db, pid)  # yeni faz ortalamaya girer
+    bump_project_version(db, pid)
     db.commit()
     db.refresh(phase)
     return _to_out(phase)
@@ -180,20 +301,60 @@ def update_phase(
         phase.status = (
             PhaseStatus(data.status) if isinstance(data.status, str) else data.status
         )
+        db.flush()
+        recompute_project_progress(db, pid)  # done fazı %100 sayılır
     if data.start_date is not None:
         phase.start_date = data.start_date
     if data.end_date is not None:
         phase.end_date = data.end_date
 
+    bump_project_version(db, pid)
     db.commit()
     db.refresh(phase)
     return _to_out(phase)
 
 
+@router.post("/{pid}/phases/{phase_id}/move", response_model=ProjectPhaseOut)
+def move_phase(
+    pid: int,
+    phase_id: int,
+    body: MoveIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Fazı after_id'nin arkasına / before_id'nin önüne taşır (ikisi de boş → sona).
+    Yalnızca taşınan fazın rank_key'i yazılır.
+    """
+    _require_manage(db, pid, current_user)
+
+    phase = (
+        db.query(ProjectPhase)
+        .filter(ProjectPhase.id == phase_id, ProjectPhase.project_id == pid)
+        .first()
+    )
+    if not phase:
+        raise HTTPException(status_code=404, detail="Phase not found")
+
+    scope = {"project_id": pid}
+    try:
+        long_key = move_item(db, ProjectPhase, scope, phase, body.after_id, body.before_id)
+    except LookupError:
+        raise HTTPException(status_code=400, detail="after_id/before_id must be other phases of this project")
+    bump_project_version(db, pid)
+    db.commit()
+    if long_key:
+        background_tasks.add_task(rebalance_scope_job, ProjectPhase, scope)
+    db.refresh(phase)
+    return _to_out(phase)
+
+
 @router.post("/{pid}/phases/reorder", status_code=status.HTTP_204_NO_CONTENT)
 def reorder_phases(
     pid: int,
     body: ReorderPhasesIn,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -215,15 +376,109 @@ def reorder_phases(
             detail="ordered_ids must contain exactly this project's phase IDs",
         )
 
-    # Yeni sıraya göre sort_order’ları 1’den başlayarak güncelle
-    for idx, phase_id in enumerate(new_ids, start=1):
-        db.query(ProjectPhase).filter(ProjectPhase.id == phase_id).update(
-            {"sort_order": idx}
-        )
+    # Yeni sırada zaten artan kalan en uzun alt dizi yerinde kalır;
+    # yalnızca geri kalan fazların rank_key'i tek executemany ile yazılır
+    changes = apply_reorder(db, ProjectPhase, {p.id: p.rank_key for p in phases}, new_ids)
+    bump_project_version(db, pid)
     db.commit()
+    if needs_rebalance(*changes.values()):
+        background_tasks.add_task(rebalance_scope_job, ProjectPhase, {"project_id": pid})
     return  # 204 No Content
 
 
+@router.post("/{pid}/phases:batch", response_model=PhaseBatchOut)
+def batch_phases(
+    pid: int,
+    body: PhaseBatchIn,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Faz oluşturma/güncelleme/silme işlemlerini tek istekte ve tek commit'te uygular.
+    Yetki bir kez kontrol edilir; mevcut fazlar tek sorguda okunur, yazmalar
+    toplu (executemany / IN) ifadelerle yapılır. Herhangi bir id projeye ait
+    değilse hiçbir değişiklik yapılmaz.
+    """
+    _require_manage(db, pid, current_user)
+
+    existing = {
+        p.id: p for p in db.query(ProjectPhase).filter(ProjectPhase.project_id == pid)
+    }
+    delete_ids = set(body.delete)
+    update_ids = [u.id for u in body.update]
+    unknown = (delete_ids | set(update_ids)) - existing.keys()
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Phase(s) not found: {sorted(unknown)}")
+    if len(update_ids) != len(set(update_ids)) or delete_ids & set(update_ids):
+        raise HTTPException(status_code=400, detail="Each phase id may appear once across update/delete")
+
+    # 1️⃣ Silme: alt kayıtlar açıkça silinir (SQLite'ta FK cascade kapalı olabilir)
+    if delete_ids:
+        ids = list(delete_ids)
+        detail_ids = select(PhaseDetail.id).where(PhaseDetail.phase_id.in_(ids))
+        db.execute(delete(PhaseDetailNote).where(PhaseDetailNote.detail_id.in_(detail_ids)))
+        db.execute(delete(PhaseDetailClosure).where(PhaseDetailClosure.descendant_id.in_(detail_ids)))
+        delete_dependencies(db, detail_ids)
+        db.execute(delete(PhaseDetail).where(PhaseDetail.phase_id.in_(ids)))
+        db.execute(delete(PhaseTask).where(PhaseTask.phase_id.in_(ids)))
+        remove_phase_documents(db, ids)
+        db.execute(
+            delete(ProjectPhase).where(ProjectPhase.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        for i in ids:
+            db.expunge(existing[i])  # yeniden kullanılan id'lerle identity map çakışmasın
+
+    # 2️⃣ Güncelleme: birincil anahtara göre toplu UPDATE (executemany)
+    #    (tekil PATCH gibi: None gelen alanlar değiştirilmez)
+    sort_orders = {i: p.sort_order for i, p in existing.items() if i not in delete_ids}
+    rows = []
+    for u in body.update:
+        values = {k: v for k, v in u.model_dump(exclude_unset=True).items() if v is not None}
+        if "status" in values:
+            values["status"] = PhaseStatus(values["status"])
+        if "sort_order" in values:
+            sort_orders[u.id] = values["sort_order"]
+        if len(values) > 1:
+            rows.append(values)
+    if rows:
+        db.execute(update(ProjectPhase), rows, execution_options={"synchronize_session": False})
+
+    # 3️⃣ Oluşturma: yeni fazlar listedeki sırayla sona eklenir (append_ranks);
+    #    eski sort_order alanı bellekte dağıtılır, istenen sıra doluysa en sona
+    ranks = append_ranks(len(body.create))
+    taken = set(sort_orders.values())
+    next_sort = max(taken, default=0) + 1
+    created = []
+    for c, rank_key in zip(body.create, ranks):
+        if c.sort_order is not None and c.sort_order not in taken:
+            sort_order = c.sort_order
+        else:
+            sort_order = next_sort
+        taken.add(sort_order)
+        next_sort = max(next_sort, sort_order + 1)
+        created.append(ProjectPhase(
+            project_id=pid,
+            name=c.name,
+            sort_order=sort_order,
+            rank_key=rank_key,
+            status=PhaseStatus(c.status or PhaseStatus.not_started),
+            start_date=c.start_date,
+            end_date=c.end_date,
+        ))
+    db.add_all(created)
+    db.flush()
+
+    recompute_project_progress(db, pid)
+    bump_project_version(db, pid)
+    db.commit()
+
+    return PhaseBatchOut(
+        phases=[_to_out(p) for p in _ordered_phases(db, pid)],
+        created_ids=[p.id for p in created],
+    )
+
+
 @router.delete("/{pid}/phases/{phase_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_phase(
     pid: int,
@@ -246,8 +501,12 @@ def delete_phase(
     if not phase:
         raise HTTPException(status_code=404, detail="Phase not found")
 
-    # Sil ve kaydet
+    # Sil ve kaydet (faza bağlı detay/görev arama dokümanları da gider)
+    remove_phase_documents(db, [phase.id])
     db.delete(phase)
+    db.flush()
+    recompute_project_progress(db, pid)
+    bump_project_version(db, pid)
     db.commit()
     return  # 204 No Content
 
@@ -261,6 +520,7 @@ def _to_out(p: ProjectPhase) -> ProjectPhaseOut:
     SQLAlchemy ProjectPhase modelini, API yanıt şeması olan
     ProjectPhaseOut'a dönüştürür. Enum status → string değer.
     """
+    total, done = phase_totals(p)
     return ProjectPhaseOut(
         id=p.id,
         project_id=p.project_id,
@@ -270,4 +530,7 @@ def _to_out(p: ProjectPhase) -> ProjectPhaseOut:
         start_date=p.start_date,
         end_date=p.end_date,
         created_at=p.created_at,
+        total_items=total,
+        completed_items=done,
+        progress=round(phase_progress(p.status, total, done)),
     )
@@ -0,0 +1,145 @@
+# backend/app/routers/project_schedule.py
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..core.auth import get_current_user
+from ..core.policy import require_project_manage, require_project_read
+from ..core.schedule import DAY, project_schedule, to_datetime, would_create_cycle
+from ..core.versioning import bump_project_version, conditional_get
+from ..models import PhaseDetail, PhaseDetailDependency, ProjectPhase, User
+from ..schemas import (
+    DependencyCreate, DependencyOut, DependencyUpdate, ScheduleItemOut, ScheduleOut,
+)
+
+router = APIRouter(prefix="/projects", tags=["Schedule"])
+
+def _get_dependency(db: Session, pid: int, dep_id: int) -> PhaseDetailDependency:
+    dep = db.query(PhaseDetailDependency).filter_by(id=dep_id, project_id=pid).first()
+    if not dep:
+        raise HTTPException(status_code=404, detail="Dependency not found")
+    return dep
+
+@router.get("/{pid}/dependencies", response_model=List[DependencyOut])
+def list_dependencies(
+    pid: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    proj = require_project_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "dependencies")
+    if not_modified:
+        return not_modified
+    return (
+        db.query(PhaseDetailDependency)
+        .filter(PhaseDetailDependency.project_id == pid)
+        .order_by(PhaseDetailDependency.id)
+        .all()
+    )
+
+@router.post("/{pid}/dependencies", response_model=DependencyOut, status_code=status.HTTP_201_CREATED)
+def create_dependency(
+    pid: int,
+    body: DependencyCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    require_project_manage(db, pid, current_user)
+    ids = {body.predecessor_id, body.successor_id}
+    found = (
+        db.query(PhaseDetail.id)
+        .join(ProjectPhase, ProjectPhase.id == PhaseDetail.phase_id)
+        .filter(PhaseDetail.id.in_(ids), ProjectPhase.project_id == pid)
+        .count()
+    )
+    if found != len(ids):
+        raise HTTPException(status_code=404, detail="Phase detail not found in this project")
+    exists = db.query(PhaseDetailDependency.id).filter_by(
+        predecessor_id=body.predecessor_id, successor_id=body.successor_id
+    ).first()
+    if exists:
+        raise HTTPException(status_code=409, detail="Dependency already exists")
+    if would_create_cycle(db, pid, body.predecessor_id, body.successor_id):
+        raise HTTPException(status_code=400, detail="Dependency would create a cycle")
+
+    dep = PhaseDetailDependency(
+        project_id=pid,
+        predecessor_id=body.predecessor_id,
+        successor_id=body.successor_id,
+        lag_days=body.lag_days,
+    )
+    db.add(dep)
+    bump_project_version(db, pid)
+    db.commit()
+    db.refresh(dep)
+    return dep
+
+@router.patch("/{pid}/dependencies/{dep_id}", response_model=DependencyOut)
+def update_dependency(
+    pid: int,
+    dep_id: int,
+    body: DependencyUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    require_project_manage(db, pid, current_user)
+    dep = _get_dependency(db, pid, dep_id)
+    dep.lag_days = body.lag_days
+    bump_project_version(db, pid)
+    db.commit()
+    db.refresh(dep)
+    return dep
+
+@router.delete("/{pid}/dependencies/{dep_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_dependency(
+    pid: int,
+    dep_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    require_project_manage(db, pid, current_user)
+    db.delete(_get_dependency(db, pid, dep_id))
+    bump_project_version(db, pid)
+    db.commit()
+    return
+
+@router.get("/{pid}/schedule", response_model=ScheduleOut)
+def get_schedule(
+    pid: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Erken/geç tarihler, bolluk ve kritik yol (bkz. core/schedule.py).
+    Aynı proje sürümünde sonuç önbellekten gelir.
+    """
+    proj = require_project_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "schedule")
+    if not_modified:
+        return not_modified
+    plan = project_schedule(db, proj)
+    items = [
+        ScheduleItemOut(
+            id=detail_id,
+            early_start=to_datetime(plan.es[i]),
+            early_finish=to_datetime(plan.ef[i]),
+            late_start=to_datetime(plan.ls[i]),
+            late_finish=to_datetime(plan.lf[i]),
+            slack_days=round(plan.slack(i) / DAY, 2),
+            critical=plan.slack(i) <= 0,
+        )
+        for i, detail_id in enumerate(plan.ids)
+    ]
+    return ScheduleOut(
+        project_id=pid,
+        version=plan.version,
+        project_start=to_datetime(plan.base) if items else None,
+        project_finish=to_datetime(plan.finish) if items else None,
+        critical_path=plan.critical_path(),
+        items=items,
+    )
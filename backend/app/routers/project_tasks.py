@@ -1,36 +1,25 @@
 # backend/app/routers/project_tasks.py
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from ..db import get_db
 from ..core.auth import get_current_user
+from ..core.ordering import append_rank, apply_reorder, move_item, needs_rebalance, rebalance_scope_job
+from ..core.policy import require_project_read, require_project_owner
+from ..core.progress import apply_phase_delta, recompute_project_progress, task_counts
+from ..core.search import index_task, remove_document
+from ..core.versioning import bump_project_version, conditional_get
 from ..models import Project, ProjectPhase, PhaseTask, TaskStatus, User
-from ..schemas import TaskCreate, TaskUpdate, TaskOut, ReorderTasksIn
+from ..schemas import MoveIn, TaskCreate, TaskUpdate, TaskOut, ReorderTasksIn
 
 router = APIRouter(prefix="/projects", tags=["Phase Tasks"])
 
 def _require_read(db: Session, pid: int, user: User) -> Project:
-    proj = db.query(Project).filter(Project.id == pid).first()
-    if not proj:
-        raise HTTPException(status_code=404, detail="Project not found")
-    if user.role != "admin":
-        is_owner = proj.owner_id == user.id
-        is_member = any(m.user_id == user.id for m in proj.members)
-        if not (is_owner or is_member):
-            raise HTTPException(status_code=403, detail="No access to this project")
-    return proj
+    return require_project_read(db, pid, user)
 
 def _require_manage(db: Session, pid: int, user: User) -> Project:
-    proj = _require_read(db, pid, user)
-    if user.role != "admin" and proj.owner_id != user.id:
-        raise HTTPException(status_code=403, detail="Only admin/owner can modify tasks")
-    return proj
-
-def _next_order(db: Session, phase_id: int) -> int:
-    mx = db.query(func.max(PhaseTask.sort_order)).filter(PhaseTask.phase_id == phase_id).scalar()
-    return (mx or 0) + 1
+    return require_project_owner(db, pid, user, detail="Only admin/owner can modify tasks")
 
 def _to_out(t: PhaseTask) -> TaskOut:
     return TaskOut(
@@ -53,10 +42,15 @@ def _to_out(t: PhaseTask) -> TaskOut:
 def list_tasks(
     pid: int,
     phase_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    _require_read(db, pid, current_user)
+    proj = _require_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, f"tasks-{phase_id}")
+    if not_modified:
+        return not_modified
     phase = db.query(ProjectPhase).filter_by(id=phase_id, project_id=pid).first()
     if not phase:
         raise HTTPException(status_code=404, detail="Phase not found")
@@ -64,7 +58,7 @@ def list_tasks(
     tasks = (
         db.query(PhaseTask)
           .filter(PhaseTask.phase_id == phase_id)
-          .order_by(PhaseTask.sort_order.asc(), PhaseTask.id.asc())
+          .order_by(PhaseTask.rank_key.asc(), PhaseTask.id.asc())
           .all()
     )
     return [_to_out(t) for t in tasks]
@@ -83,7 +77,6 @@ def create_task(
     if not phase:
         raise HTTPException(status_code=404, detail="Phase not found")
 
-    sort_order = data.order if data.order is not None else _next_order(db, phase_id)
     status_val = TaskStatus(data.status) if isinstance(data.status, str) else (data.status or TaskStatus.todo)
 
     t = PhaseTask(
@@ -91,13 +84,21 @@ def create_task(
         phase_id=phase_id,
         title=data.title,
         description=data.description,
-        sort_order=sort_order,
+        # sıra rank_key ile (sona eklenir); order yalnızca eski alan olarak saklanır
+        sort_order=data.order if data.order is not None else 1,
         status=status_val,
         assignee_id=data.assignee_id,
         start_date=data.start_date,
         due_date=data.due_date,
     )
     db.add(t)
+    db.flush()
+    index_task(db, t)
+    total, done = task_counts(t.status)
+    if total:
+        apply_phase_delta(db, phase_id, task_total=total, task_done=done)
+        recompute_project_progress(db, pid)
+    bump_project_version(db, pid)
     db.commit()
     db.refresh(t)
     return _to_out(t)
@@ -114,6 +115,7 @@ def update_task(
     t = db.query(PhaseTask).filter(PhaseTask.id == task_id, PhaseTask.project_id == pid).first()
     if not t:
         raise HTTPException(status_code=404, detail="Task not found")
+    old_phase_id, old_counts = t.phase_id, task_counts(t.status)
 
     # faz değiştirme istenirse
     if data.phase_id is not None and data.phase_id != t.phase_id:
@@ -121,7 +123,7 @@ def update_task(
         if not target_phase:
             raise HTTPException(status_code=404, detail="Target phase not found")
         t.phase_id = data.phase_id
-        t.sort_order = _next_order(db, data.phase_id)
+        t.rank_key = append_rank()  # yeni fazın sonuna
 
     if data.title is not None:
         t.title = data.title
@@ -131,9 +133,9 @@ def update_task(
         t.sort_order = data.order
     if data.status is not None:
         t.status = TaskStatus(data.status) if isinstance(data.status, str) else data.status
-        if str(t.status) in ("done", TaskStatus.done.value):
+        if t.status == TaskStatus.done:
             from datetime import datetime as _dt
-            t.completed_at = _dt.utcnow()
+            t.completed_at = t.completed_at or _dt.utcnow()
         else:
             t.completed_at = None
     if data.assignee_id is not None:
@@ -143,6 +145,16 @@ def update_task(
     if data.due_date is not None:
         t.due_date = data.due_date
 
+    index_task(db, t)
+
+    # ilerleme sayaçları: eski fazdan katkıyı düş, yeni faza ekle (fark yoksa dokunma)
+    new_counts = task_counts(t.status)
+    if (old_phase_id, old_counts) != (t.phase_id, new_counts):
+        apply_phase_delta(db, old_phase_id, task_total=-old_counts[0], task_done=-old_counts[1])
+        apply_phase_delta(db, t.phase_id, task_total=new_counts[0], task_done=new_counts[1])
+        recompute_project_progress(db, pid)
+
+    bump_project_version(db, pid)
     db.commit()
     db.refresh(t)
     return _to_out(t)
@@ -158,15 +170,49 @@ def delete_task(
     t = db.query(PhaseTask).filter(PhaseTask.id == task_id, PhaseTask.project_id == pid).first()
     if not t:
         raise HTTPException(status_code=404, detail="Task not found")
+    remove_document(db, "task", t.id)
+    total, done = task_counts(t.status)
     db.delete(t)
+    if total:
+        apply_phase_delta(db, t.phase_id, task_total=-total, task_done=-done)
+        recompute_project_progress(db, pid)
+    bump_project_version(db, pid)
     db.commit()
     return
 
+@router.post("/{pid}/tasks/{task_id}/move", response_model=TaskOut)
+def move_task(
+    pid: int,
+    task_id: int,
+    body: MoveIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Görevi kendi fazı içinde after_id'nin arkasına / before_id'nin önüne taşır (tek satır yazılır)."""
+    _require_manage(db, pid, current_user)
+    t = db.query(PhaseTask).filter(PhaseTask.id == task_id, PhaseTask.project_id == pid).first()
+    if not t:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    scope = {"phase_id": t.phase_id}
+    try:
+        long_key = move_item(db, PhaseTask, scope, t, body.after_id, body.before_id)
+    except LookupError:
+        raise HTTPException(status_code=400, detail="after_id/before_id must be other tasks of the same phase")
+    bump_project_version(db, pid)
+    db.commit()
+    if long_key:
+        background_tasks.add_task(rebalance_scope_job, PhaseTask, scope)
+    db.refresh(t)
+    return _to_out(t)
+
 @router.post("/{pid}/phases/{phase_id}/tasks/reorder", status_code=status.HTTP_204_NO_CONTENT)
 def reorder_tasks(
     pid: int,
     phase_id: int,
     body: ReorderTasksIn,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -177,7 +223,10 @@ def reorder_tasks(
     if exists != incoming:
         raise HTTPException(status_code=400, detail="ordered_ids must match exactly the tasks of this phase")
 
-    for idx, tid in enumerate(body.ordered_ids, start=1):
-        db.query(PhaseTask).filter(PhaseTask.id == tid).update({"sort_order": idx})
+    # LIS dışında kalan görevlerin rank_key'i tek executemany ile yazılır
+    changes = apply_reorder(db, PhaseTask, {t.id: t.rank_key for t in tasks}, body.ordered_ids)
+    bump_project_version(db, pid)
     db.commit()
+    if needs_rebalance(*changes.values()):
+        background_tasks.add_task(rebalance_scope_job, PhaseTask, {"phase_id": phase_id})
     return
\ No newline at end of file
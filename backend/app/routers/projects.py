@@ -1,16 +1,25 @@
 # backend/app/routers/projects.py
-from typing import Optional, List, Dict
+from typing import Optional, List
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_  # <- or_ eklendi
+from sqlalchemy import and_, not_
 
 from ..db import get_db
 from ..core.auth import get_current_user
+from ..core.access_index import grant_access, drop_project_access, filter_accessible
+from ..core.blobs import release_blob, remove_unreferenced
+from ..core.due_scanner import due_scanner, overdue_project_ids
+from ..core.overview_cache import overview_cache, invalidate_overview
+from ..core.pagination import keyset_page
+from ..core.search import index_project, remove_project_documents
+from ..core.versioning import bump_project_version, conditional_get
+from ..core.trees import load_detail_trees
 from ..core.policy import (
     require_project_read,
     require_project_manage,
+    require_project_owner,
     is_admin,
     is_dept_head,
 )
@@ -21,20 +30,27 @@ from ..models import (
     User,
     ProjectMember,
     ProjectNote,
-    Department,
     ProjectMemberRole,
     ProjectPriority,
+    ProjectPhase,
+    ProjectFile,
+    ProjectExpense,
 )
 
 from ..schemas import (
     ProjectCreate,
     ProjectUpdate,
     ProjectOut,
+    ProjectPageOut,
     ProjectDetailOut,
     ProjectMemberOut,
     ProjectNoteOut,
     ProjectSummaryOut,
+    ProjectFullOut,
+    ProjectPhaseFullOut,
 )
+from .project_budget import budget_summary
+from .project_phases import _to_out as _phase_to_out
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -60,25 +76,13 @@ def _parse_status(value: Optional[str]) -> ProjectStatus:
     raise HTTPException(status_code=400, detail=f"Invalid status: {value}")
 
 
-def _user_is_member(db: Session, pid: int, user_id: int) -> bool:
-    return (
-        db.query(ProjectMember)
-        .filter(ProjectMember.project_id == pid, ProjectMember.user_id == user_id)
-        .first()
-        is not None
-    )
-
-
 def _enum_to_str(e) -> str:
     return e.value if hasattr(e, "value") else str(e)
 
 
-def _to_out(p: Project, member_count: Optional[int] = None) -> ProjectOut:
-    """ORM Project -> ProjectOut (Enum -> string)"""
-    default_team = 1 if p.owner_id else 0
-    size = member_count if member_count is not None else len(p.members or [])
-    if size == 0:
-        size = default_team
+def _to_out(p: Project) -> ProjectOut:
+    """ORM Project -> ProjectOut (Enum -> string); takım boyutu denormalize member_count'tan"""
+    size = p.member_count or (1 if p.owner_id else 0)
     return ProjectOut(
         id=p.id,
         title=p.title,
@@ -90,7 +94,55 @@ def _to_out(p: Project, member_count: Optional[int] = None) -> ProjectOut:
         end_date=p.end_date,
         created_at=p.created_at,
         team_size=size,
+        owner_name=p.owner_name,
+        department_name=p.department_name,
+    )
+
+
+def _member_outs(db: Session, pid: int) -> List[ProjectMemberOut]:
+    """Üyeler + kullanıcı bilgileri (tek JOIN sorgusu)."""
+    member_rows = (
+        db.query(ProjectMember, User)
+        .join(User, User.id == ProjectMember.user_id)
+        .filter(ProjectMember.project_id == pid)
+        .all()
     )
+    # Şemanın alan adlarına mapliyoruz
+    return [
+        ProjectMemberOut(
+            id=m.id,
+            project_id=m.project_id,
+            user_id=m.user_id,
+            role_in_project=getattr(m, "role", None),
+            joined_at=getattr(m, "created_at", None),
+            user_name=u.name,
+            user_email=u.email,
+        )
+        for (m, u) in member_rows
+    ]
+
+
+def _note_outs(db: Session, pid: int) -> List[ProjectNoteOut]:
+    """Notlar + yazar bilgileri, yeniden eskiye (tek JOIN sorgusu)."""
+    note_rows = (
+        db.query(ProjectNote, User)
+        .join(User, User.id == ProjectNote.author_id)
+        .filter(ProjectNote.project_id == pid)
+        .order_by(ProjectNote.created_at.desc())
+        .all()
+    )
+    return [
+        ProjectNoteOut(
+            id=n.id,
+            project_id=n.project_id,
+            author_id=n.author_id,
+            content=n.content,
+            created_at=n.created_at,
+            author_name=au.name,
+            author_email=au.email,
+        )
+        for (n, au) in note_rows
+    ]
 
 
 # ---------------- CRUD ----------------
@@ -112,6 +164,7 @@ def create_project(
         end_date=data.end_date,
         department_id=dept_id,
         owner_id=current_user.id,
+        member_count=1,  # aşağıda eklenen owner üyeliği
     )
     db.add(proj)
     db.commit()
@@ -125,9 +178,12 @@ def create_project(
             role=ProjectMemberRole.owner,
         )
     )
+    grant_access(db, proj.id, current_user.id)
+    index_project(db, proj)
+    invalidate_overview(db)
     db.commit()
 
-    return _to_out(proj, member_count=1)
+    return _to_out(proj)
 
 
 @router.get("/overview", response_model=List[ProjectSummaryOut])
@@ -137,125 +193,160 @@ def projects_overview(
 ):
     """
     Dashboard özet listesi.
+    Owner/departman adları ve üye sayıları projects satırındaki denormalize
+    kolonlardan okunur (JOIN/COUNT yok); is_overdue gecikme özet tablosundan
+    (due_digest) gelir. Tarayıcı kapalıysa ya da henüz taramadıysa satırın
+    end_date/status'undan canlı hesaplanır (?overdue= filtresiyle aynı kural).
+    Sonuç scope başına kısa süreli önbelleğe alınır.
     """
-    q = db.query(Project)
-
     if is_admin(current_user):
-        pass
+        cache_key = ("all",)
     elif is_dept_head(current_user) and current_user.department_id:
-        q = q.filter(Project.department_id == current_user.department_id)
+        cache_key = ("dept", current_user.department_id)
     else:
-        q = (
-            q.join(ProjectMember, ProjectMember.project_id == Project.id)
-             .filter(ProjectMember.user_id == current_user.id)
-        )
-
-    projects = q.all()
-    now = datetime.utcnow()
-
-    summaries: List[ProjectSummaryOut] = []
-    for p in projects:
-        # owner adı
-        owner_name = None
-        if p.owner_id:
-            owner = db.query(User).get(p.owner_id)
-            owner_name = owner.name if owner else None
-
-        # member sayısı
-        member_count = (
-            db.query(func.count(ProjectMember.id))
-            .filter(ProjectMember.project_id == p.id)
-            .scalar()
-            or 0
-        )
+        cache_key = ("user", current_user.id)
+
+    cached = overview_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    q = db.query(
+        Project.id,
+        Project.title,
+        Project.status,
+        Project.progress,
+        Project.start_date,
+        Project.end_date,
+        Project.department_name,
+        Project.owner_name,
+        Project.member_count,
+    )
 
-        # departman adı
-        dept_name = None
-        if p.department_id:
-            d = db.query(Department).get(p.department_id)
-            dept_name = d.name if d else None
-
-        # gecikmiş mi?
-        is_overdue = bool(p.end_date and p.status != ProjectStatus.closed and p.end_date < now)
-
-        summaries.append(
-            ProjectSummaryOut(
-                id=p.id,
-                title=p.title,
-                status=_enum_to_str(p.status),   # string
-                progress=p.progress,
-                start_date=p.start_date,
-                end_date=p.end_date,
-                department_name=dept_name,
-                owner_name=owner_name,
-                member_count=member_count,
-                is_overdue=is_overdue,
-            )
+    if cache_key[0] == "dept":
+        q = q.filter(Project.department_id == current_user.department_id)
+    elif cache_key[0] == "user":
+        # sahibi/üyesi olduğu projeler → user_project_access indeksi
+        q = filter_accessible(q, db, current_user.id)
+
+    rows = q.all()
+    if due_scanner.digest_ready:
+        overdue = overdue_project_ids(db, (r.id for r in rows))
+        is_late = lambda r: r.id in overdue
+    else:
+        now = datetime.utcnow()
+        is_late = lambda r: r.end_date is not None and r.end_date < now and r.status != ProjectStatus.closed
+    summaries = [
+        ProjectSummaryOut(
+            id=r.id,
+            title=r.title,
+            status=_enum_to_str(r.status),   # string
+            progress=r.progress,
+            start_date=r.start_date,
+            end_date=r.end_date,
+            department_name=r.department_name,
+            owner_name=r.owner_name,
+            member_count=r.member_count or 0,
+            # gecikmiş mi?
+            is_overdue=is_late(r),
         )
+        for r in rows
+    ]
+    overview_cache.set(cache_key, summaries)
     return summaries
 
 
 # --------- LISTE: everyone sees all (auth required), optional scope=mine ---------
-@router.get("", response_model=List[ProjectOut])
+# sort parametresi → (kolon, nullable)
+_SORT_KEYS = {
+    "created_at": (Project.created_at, False),
+    "title": (Project.title, False),
+    "start_date": (Project.start_date, True),
+    "end_date": (Project.end_date, True),
+}
+
+
+@router.get("", response_model=ProjectPageOut)
 def list_projects(
     status: Optional[str] = Query(None, description="Filter by status: planning/executing/..."),
     scope: str = Query("all", pattern="^(all|mine)$"),   # <-- varsayılan: all
+    priority: Optional[str] = Query(None, pattern="^(High|Medium|Normal)$"),
+    department_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    overdue: Optional[bool] = Query(None, description="true → bitiş tarihi geçmiş ve kapanmamış"),
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    end_from: Optional[datetime] = None,
+    end_to: Optional[datetime] = None,
+    sort: str = Query("-created_at", pattern="^-?(created_at|title|start_date|end_date)$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     scope=all  -> tüm projeler (her auth kullanıcı görebilir)
     scope=mine -> sadece kullanıcının sahibi/üyesi olduğu projeler
+
+    (sort kolonu, id) üzerinde keyset sayfalama yapar; sonraki sayfa için
+    yanıttaki next_cursor aynı filtrelerle geri gönderilir.
+    Tarihi boş projeler start_date/end_date sıralamasında en sona düşer.
     """
     q = db.query(Project)
 
     if scope == "mine":
-        q = (
-            q.outerjoin(ProjectMember, ProjectMember.project_id == Project.id)
-             .filter(or_(Project.owner_id == current_user.id,
-                         ProjectMember.user_id == current_user.id))
-        )
+        q = filter_accessible(q, db, current_user.id)
     # scope == "all" → filtre yok
 
     if status:
         st = _parse_status(status)
         q = q.filter(Project.status == st)
-
-    projects = q.order_by(Project.created_at.desc()).all()
-    
-    # Debug print for first project
-    if projects:
-        print(f"DEBUG: First project priority in DB: {projects[0].priority}")
-
-    member_counts = {}
-    if projects:
-        pids = [p.id for p in projects]
-        rows = (
-            db.query(ProjectMember.project_id, func.count(ProjectMember.id))
-            .filter(ProjectMember.project_id.in_(pids))
-            .group_by(ProjectMember.project_id)
-            .all()
+    if priority:
+        q = q.filter(Project.priority == ProjectPriority[priority])
+    if department_id is not None:
+        q = q.filter(Project.department_id == department_id)
+    if owner_id is not None:
+        q = q.filter(Project.owner_id == owner_id)
+    if overdue is not None:
+        late = and_(
+            Project.end_date.isnot(None),
+            Project.end_date < datetime.utcnow(),
+            Project.status != ProjectStatus.closed,
         )
-        for pid, count in rows:
-            member_counts[pid] = count
+        q = q.filter(late if overdue else not_(late))
+    if start_from is not None:
+        q = q.filter(Project.start_date >= start_from)
+    if start_to is not None:
+        q = q.filter(Project.start_date <= start_to)
+    if end_from is not None:
+        q = q.filter(Project.end_date >= end_from)
+    if end_to is not None:
+        q = q.filter(Project.end_date <= end_to)
+
+    key_col, nullable = _SORT_KEYS[sort.lstrip("-")]
+    projects, next_cursor = keyset_page(
+        q, key_col, Project.id, cursor, limit,
+        descending=sort.startswith("-"), nullable=nullable,
+    )
 
-    return [_to_out(p, member_counts.get(p.id, 0)) for p in projects]
+    return ProjectPageOut(
+        items=[_to_out(p) for p in projects],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{pid}", response_model=ProjectOut)
 def get_project(
     pid: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     proj = require_project_read(db, pid, current_user)
-    member_counts: Dict[int, int] = dict(
-        db.query(ProjectMember.project_id, func.count(ProjectMember.id))
-        .filter(ProjectMember.project_id == pid)
-        .group_by(ProjectMember.project_id)
-        .all()
-    )
-    return _to_out(proj, member_counts.get(pid, None))
+    not_modified = conditional_get(request, response, proj, "project")
+    if not_modified:
+        return not_modified
+    return _to_out(proj)
 
 
 @router.patch("/{pid}", response_model=ProjectOut)
@@ -267,8 +358,19 @@ def update_project(
 ):
     proj = require_project_manage(db, pid, current_user)
 
+    # fazı olan projede progress sayaçlardan hesaplanır (core/progress.py); elle yazılamaz
+    if (
+        data.progress is not None
+        and data.progress != proj.progress
+        and db.query(ProjectPhase.id).filter(ProjectPhase.project_id == pid).first() is not None
+    ):
+        raise HTTPException(
+            status_code=409, detail="Progress is computed from phases and cannot be set manually"
+        )
+
     if data.title is not None:
         proj.title = data.title
+        index_project(db, proj)
     if data.status is not None:
         proj.status = _parse_status(data.status)
     if data.progress is not None:
@@ -282,6 +384,8 @@ def update_project(
         proj.priority = ProjectPriority[data.priority]
         print(f"DEBUG: proj.priority set to {proj.priority}")
 
+    invalidate_overview(db)
+    bump_project_version(db, pid)
     db.commit()
     db.refresh(proj)
     print(f"DEBUG: Post-commit priority: {proj.priority}")
@@ -294,26 +398,19 @@ def delete_project(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    proj = require_project_read(db, pid, current_user)
-
-    allowed = False
-    if is_admin(current_user):
-        allowed = True
-    elif is_dept_head(current_user) and current_user.department_id and proj.department_id == current_user.department_id:
-        allowed = True
-    else:
-        m = (
-            db.query(ProjectMember)
-            .filter_by(project_id=pid, user_id=current_user.id)
-            .first()
-        )
-        allowed = bool(m and m.role == ProjectMemberRole.owner)
-
-    if not allowed:
-        raise HTTPException(status_code=403, detail="Only admin/dept head/owner can delete")
+    proj = require_project_owner(
+        db, pid, current_user, detail="Only admin/dept head/owner can delete"
+    )
 
+    drop_project_access(db, pid)
+    remove_project_documents(db, pid)
+    invalidate_overview(db)
+    # dosya kayıtları cascade ile silinir; blob referansları önce bırakılır
+    orphans = {path for path in (release_blob(db, pf) for pf in proj.files) if path}
     db.delete(proj)
     db.commit()
+    for path in orphans:
+        remove_unreferenced(db, path)
     return
 
 
@@ -321,63 +418,18 @@ def delete_project(
 @router.get("/{pid}/detail", response_model=ProjectDetailOut)
 def project_detail(
     pid: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    proj = db.query(Project).filter(Project.id == pid).first()
-    if not proj:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    if current_user.role != "admin":
-        is_owner = (
-            db.query(ProjectMember)
-            .filter_by(project_id=pid, user_id=current_user.id, role=ProjectMemberRole.owner)
-            .first()
-            is not None
-        )
-        is_member = _user_is_member(db, pid, current_user.id)
-        if not (is_owner or is_member):
-            raise HTTPException(status_code=403, detail="No access to this project")
-
-    member_rows = (
-        db.query(ProjectMember, User)
-        .join(User, User.id == ProjectMember.user_id)
-        .filter(ProjectMember.project_id == pid)
-        .all()
-    )
-    # Şemanın alan adlarına mapliyoruz
-    members = [
-        ProjectMemberOut(
-            id=m.id,
-            project_id=m.project_id,
-            user_id=m.user_id,
-            role_in_project=getattr(m, "role", None),
-            joined_at=getattr(m, "created_at", None),
-            user_name=u.name,
-            user_email=u.email,
-        )
-        for (m, u) in member_rows
-    ]
+    proj = require_project_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "detail")
+    if not_modified:
+        return not_modified
 
-    note_rows = (
-        db.query(ProjectNote, User)
-        .join(User, User.id == ProjectNote.author_id)
-        .filter(ProjectNote.project_id == pid)
-        .order_by(ProjectNote.created_at.desc())
-        .all()
-    )
-    notes = [
-        ProjectNoteOut(
-            id=n.id,
-            project_id=n.project_id,
-            author_id=n.author_id,
-            content=n.content,
-            created_at=n.created_at,
-            author_name=au.name,
-            author_email=au.email,
-        )
-        for (n, au) in note_rows
-    ]
+    members = _member_outs(db, pid)
+    notes = _note_outs(db, pid)
 
     return ProjectDetailOut(
         id=proj.id,
@@ -391,3 +443,85 @@ def project_detail(
         members=members,
         notes=notes,
     )
+
+
+# ---------------- FULL (tek istekte proje sayfası) ----------------
+FULL_SECTIONS = ("members", "notes", "phases", "budget", "files", "expenses")
+
+
+def _parse_include(include: Optional[str]) -> tuple[str, ...]:
+    if not include:
+        return FULL_SECTIONS
+    wanted = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = wanted - set(FULL_SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include section(s): {', '.join(sorted(unknown))}",
+        )
+    return tuple(sec for sec in FULL_SECTIONS if sec in wanted)
+
+
+@router.get("/{pid}/full", response_model=ProjectFullOut)
+def project_full(
+    pid: int,
+    request: Request,
+    response: Response,
+    include: Optional[str] = Query(
+        None, description="Virgülle ayrılmış bölümler: members,notes,phases,budget,files,expenses (boş = hepsi)"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Proje sayfasının ihtiyaç duyduğu her şeyi tek istekte döner.
+    Yetki bir kez kontrol edilir; her bölüm sabit sayıda sorguyla okunur
+    (faz detay ağaçları dahil: tüm fazlar için tek sorgu).
+    """
+    sections = _parse_include(include)
+    proj = require_project_read(db, pid, current_user)
+    not_modified = conditional_get(request, response, proj, "full-" + "+".join(sections))
+    if not_modified:
+        return not_modified
+
+    out: dict = {}
+
+    if "members" in sections:
+        out["members"] = _member_outs(db, pid)
+
+    if "notes" in sections:
+        out["notes"] = _note_outs(db, pid)
+
+    if "phases" in sections:
+        phases = (
+            db.query(ProjectPhase)
+            .filter(ProjectPhase.project_id == pid)
+            .order_by(ProjectPhase.rank_key.asc(), ProjectPhase.id.asc())
+            .all()
+        )
+        trees = load_detail_trees(db, [ph.id for ph in phases])
+        out["phases"] = [
+            ProjectPhaseFullOut(**_phase_to_out(ph).model_dump(), details=trees.get(ph.id, []))
+            for ph in phases
+        ]
+
+    if "budget" in sections:
+        out["budget"] = budget_summary(proj)
+
+    if "files" in sections:
+        out["files"] = (
+            db.query(ProjectFile)
+            .filter(ProjectFile.project_id == pid)
+            .order_by(ProjectFile.created_at.desc())
+            .all()
+        )
+
+    if "expenses" in sections:
+        out["expenses"] = (
+            db.query(ProjectExpense)
+            .filter(ProjectExpense.project_id == pid)
+            .order_by(ProjectExpense.created_at.desc())
+            .all()
+        )
+
+    return ProjectFullOut(project=_to_out(proj), **out)
@@ -0,0 +1,61 @@
+# backend/app/routers/search.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..core.auth import get_current_user
+from ..core.policy import require_project_read
+from ..core.search import KINDS, search_documents
+from ..models import User
+from ..schemas import SearchHitOut, SearchPageOut
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SNIPPET_LEN = 160
+
+
+def _snippet(body: str, title: str) -> str:
+    text = (body or title or "").strip()
+    return text if len(text) <= SNIPPET_LEN else text[:SNIPPET_LEN].rstrip() + "…"
+
+
+@router.get("", response_model=SearchPageOut)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: Optional[int] = Query(None, description="Sadece bu projede ara"),
+    kind: Optional[List[str]] = Query(None, description="project | note | detail | task | detail_note"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Projeler, proje notları, faz detayları, görevler ve detay notları üzerinde
+    tam metin arama. Sonuçlar skora göre sıralı ve sayfalıdır; kullanıcı yalnızca
+    okuma yetkisi olan projelerin sonuçlarını görür.
+    """
+    if project_id is not None:
+        require_project_read(db, project_id, current_user)
+    kinds = [k for k in (kind or []) if k in KINDS] or None
+
+    rows = search_documents(db, current_user, q, project_id=project_id, kinds=kinds,
+                            limit=limit, offset=offset)
+    has_more = len(rows) > limit
+    return SearchPageOut(
+        items=[
+            SearchHitOut(
+                kind=doc.kind,
+                ref_id=doc.ref_id,
+                project_id=doc.project_id,
+                phase_id=doc.phase_id,
+                detail_id=doc.detail_id,
+                title=doc.title,
+                snippet=_snippet(doc.body, doc.title),
+                score=round(score, 6),
+            )
+            for doc, score in rows[:limit]
+        ],
+        next_offset=offset + limit if has_more else None,
+    )
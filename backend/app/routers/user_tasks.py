@@ -0,0 +1,120 @@
+# backend/app/routers/user_tasks.py
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..core.auth import get_current_user
+from ..core.pagination import keyset_page
+from ..core.policy import is_admin, is_dept_head
+from ..models import Project, ProjectMember, ProjectMemberRole, ProjectPhase, PhaseTask, TaskStatus, User
+from ..schemas import AssignedTaskOut, AssignedTaskPageOut
+from .project_tasks import _to_out as _task_to_out
+
+router = APIRouter(tags=["My Tasks"])
+
+def _managed_projects(user_id: int):
+    """Kullanıcının sahibi ya da owner/manager üyesi olduğu projeler (alt sorgu)."""
+    return union(
+        select(Project.id).where(Project.owner_id == user_id),
+        select(ProjectMember.project_id).where(
+            ProjectMember.user_id == user_id,
+            ProjectMember.role.in_((ProjectMemberRole.owner, ProjectMemberRole.manager)),
+        ),
+    )
+
+def _assigned_tasks(
+    db: Session,
+    assignee_id: int,
+    status: Optional[List[TaskStatus]],
+    due_from: Optional[datetime],
+    due_to: Optional[datetime],
+    sort: str,
+    limit: int,
+    cursor: Optional[str],
+    project_scope=None,
+) -> AssignedTaskPageOut:
+    """
+    assignee_id'nin görevleri (due_date, id) üzerinde keyset sayfalı;
+    ix_phase_tasks_assignee_status_due ile okunur. Tarihi boş görevler en sona düşer.
+    Proje/faz adları aynı sorguda JOIN ile gelir (görev başına ek sorgu yok).
+    """
+    q = (
+        db.query(PhaseTask, Project.title, ProjectPhase.name)
+        .join(Project, Project.id == PhaseTask.project_id)
+        .join(ProjectPhase, ProjectPhase.id == PhaseTask.phase_id)
+        .filter(PhaseTask.assignee_id == assignee_id)
+    )
+    if status:
+        q = q.filter(PhaseTask.status.in_(status))
+    if due_from is not None:
+        q = q.filter(PhaseTask.due_date >= due_from)
+    if due_to is not None:
+        q = q.filter(PhaseTask.due_date <= due_to)
+    if project_scope is not None:
+        q = q.filter(PhaseTask.project_id.in_(project_scope))
+
+    rows, next_cursor = keyset_page(
+        q, PhaseTask.due_date, PhaseTask.id, cursor, limit,
+        descending=sort.startswith("-"),
+        nullable=due_from is None and due_to is None,
+        value_of=lambda r: (r[0].due_date, r[0].id),
+    )
+    return AssignedTaskPageOut(
+        items=[
+            AssignedTaskOut(**_task_to_out(t).model_dump(), project_title=title, phase_name=phase_name)
+            for t, title, phase_name in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+@router.get("/me/tasks", response_model=AssignedTaskPageOut)
+def my_tasks(
+    status: Optional[List[TaskStatus]] = Query(None, description="Tekrarlanabilir: ?status=todo&status=doing"),
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    sort: str = Query("due_date", pattern="^-?due_date$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Kullanıcıya atanmış görevler, tüm projelerde."""
+    return _assigned_tasks(db, current_user.id, status, due_from, due_to, sort, limit, cursor)
+
+@router.get("/users/{uid}/tasks", response_model=AssignedTaskPageOut)
+def user_tasks(
+    uid: int,
+    status: Optional[List[TaskStatus]] = Query(None, description="Tekrarlanabilir: ?status=todo&status=doing"),
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    sort: str = Query("due_date", pattern="^-?due_date$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Başka bir kullanıcının görevleri:
+      - admin ve kullanıcının departman başkanı → tüm görevler
+      - proje sahibi/yöneticisi → yalnızca yönettiği projelerdeki görevler
+    """
+    target = db.get(User, uid)
+    if not target:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    scope = None
+    full_access = (
+        uid == current_user.id
+        or is_admin(current_user)
+        or (is_dept_head(current_user) and current_user.department_id is not None
+            and current_user.department_id == target.department_id)
+    )
+    if not full_access:
+        scope = _managed_projects(current_user.id)
+        if db.execute(select(scope.subquery()).limit(1)).first() is None:
+            raise HTTPException(status_code=403, detail="Only managers can view other users' tasks")
+        scope = select(scope.subquery())
+    return _assigned_tasks(db, uid, status, due_from, due_to, sort, limit, cursor, project_scope=scope)
@@ -57,9 +57,15 @@ class ProjectOut(BaseModel):
     end_date: Optional[datetime]
     created_at: datetime
     team_size: int = 0
+    owner_name: Optional[str] = None
+    department_name: Optional[str] = None
     class Config:
         from_attributes = True
 
+class ProjectPageOut(BaseModel):
+    items: List[ProjectOut]
+    next_cursor: Optional[str] = None   # None → son sayfa
+
 
 # ======================
 # PROJECT MEMBERS
@@ -137,6 +143,26 @@ class ProjectSummaryOut(BaseModel):
         from_attributes = True
 
 
+class DueItemOut(BaseModel):
+    """due_digest satırı (bkz. core/due_scanner.py)."""
+    kind: Literal["project", "task", "detail"]
+    ref_id: int
+    project_id: int
+    phase_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+    title: str
+    due_at: datetime
+    state: Literal["overdue", "due_soon"]
+    scanned_at: datetime
+    class Config:
+        from_attributes = True
+
+class DueSummaryOut(BaseModel):
+    """Proje başına gecikmiş / yakında teslim sayıları (rozetler için)."""
+    project_id: int
+    overdue: int = 0
+    due_soon: int = 0
+
 # ======================
 # PROJECT PHASES
 #   Not: DB kolonu sort_order ama API'de 'order' ismiyle gider-gelir.
@@ -164,12 +190,38 @@ class ProjectPhaseOut(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     created_at: datetime
+    # sunucuda sayaçlarla tutulan tamamlanma bilgisi
+    total_items: int = 0
+    completed_items: int = 0
+    progress: int = 0
     class Config:
         from_attributes = True
 
 class ReorderPhasesIn(BaseModel):
     ordered_ids: List[int]
 
+class MoveIn(BaseModel):
+    """Faz/görev/detay taşıma: after_id'nin arkasına, before_id'nin önüne (ikisi de boş → sona)."""
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+class SubtreeMoveIn(MoveIn):
+    """Detayı alt ağacıyla birlikte yeni üst başlığa taşır (parent_id null → faz köküne)."""
+    parent_id: Optional[int] = None
+
+class PhaseBatchUpdate(ProjectPhaseUpdate):
+    id: int
+
+class PhaseBatchIn(BaseModel):
+    """Tek transaction'da uygulanır; sıra: delete → update → create."""
+    create: List[ProjectPhaseCreate] = []
+    update: List[PhaseBatchUpdate] = []
+    delete: List[int] = []
+
+class PhaseBatchOut(BaseModel):
+    phases: List[ProjectPhaseOut]   # işlem sonrası projenin tüm fazları (sıralı)
+    created_ids: List[int]          # create listesiyle aynı sırada yeni id'ler
+
 
 # ======================
 # PHASE DETAILS (phase altındaki detaylar)
@@ -224,11 +276,36 @@ class PhaseDetailUpdate(BaseModel):
     
     priority: Optional[str] = None
 
+class PhaseDetailBulkItem(PhaseDetailUpdate):
+    id: int
+
+class PhaseDetailBulkIn(BaseModel):
+    """Gantt sürükleme / çoklu işaretleme: kısmi güncellemeler tek istekte."""
+    items: List[PhaseDetailBulkItem] = Field(min_length=1, max_length=1000)
+
+class PhaseDetailBulkResult(BaseModel):
+    id: int
+    status: Literal["updated", "not_found", "forbidden", "invalid"]
+    detail: Optional[str] = None
+    completed_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class PhaseDetailBulkOut(BaseModel):
+    results: List[PhaseDetailBulkResult]   # items ile aynı sırada
+    updated: int
+
 class PhaseDetail(PhaseDetailBase):
     id: int
     phase_id: int
     created_at: datetime
     updated_at: datetime
+    # alt ağaç toplamları (kendisi dahil) — istemcide ağaç gezmeye gerek yok
+    rollup_effort: float = 0
+    rollup_total: int = 0
+    rollup_done: int = 0
+    rollup_start: Optional[datetime] = None
+    rollup_end: Optional[datetime] = None
+    note_count: int = 0
     children: List['PhaseDetail'] = []
 
     class Config:
@@ -237,6 +314,49 @@ class PhaseDetail(PhaseDetailBase):
 # Resolve forward reference
 PhaseDetail.model_rebuild()
 
+class PhaseDetailGroupOut(BaseModel):
+    """Projedeki bir fazın detay ağacı (yalnızca kökler, alt detaylar children içinde)."""
+    phase_id: int
+    details: List[PhaseDetail] = []
+
+# ======================
+# DEPENDENCIES / SCHEDULE (kritik yol)
+# ======================
+class DependencyCreate(BaseModel):
+    """Bitiş→başlangıç bağı: successor, predecessor bittikten lag_days gün sonra başlar."""
+    predecessor_id: int
+    successor_id: int
+    lag_days: int = Field(0, ge=-3650, le=3650)
+
+class DependencyUpdate(BaseModel):
+    lag_days: int = Field(..., ge=-3650, le=3650)
+
+class DependencyOut(BaseModel):
+    id: int
+    project_id: int
+    predecessor_id: int
+    successor_id: int
+    lag_days: int
+    class Config:
+        from_attributes = True
+
+class ScheduleItemOut(BaseModel):
+    id: int
+    early_start: datetime
+    early_finish: datetime
+    late_start: datetime
+    late_finish: datetime
+    slack_days: float
+    critical: bool
+
+class ScheduleOut(BaseModel):
+    project_id: int
+    version: int
+    project_start: Optional[datetime] = None
+    project_finish: Optional[datetime] = None
+    critical_path: List[int] = []      # kritik detaylar, topolojik sırada
+    items: List[ScheduleItemOut] = []
+
 
 
 # ======================
@@ -248,6 +368,7 @@ class ProjectFileOut(BaseModel):
     filename: str
     content_type: Optional[str] = None
     size_bytes: Optional[int] = None
+    sha256: Optional[str] = None
     created_at: datetime
     class Config:
         from_attributes = True
@@ -261,8 +382,9 @@ class TaskCreate(BaseModel):
     title: str = Field(min_length=1, max_length=200)
     description: Optional[str] = None
     assignee_id: Optional[int] = None
-    status: Optional[Literal["todo", "in_progress", "blocked", "done"]] = "todo"
+    status: Optional[Literal["todo", "doing", "done", "canceled"]] = "todo"
     priority: Optional[Literal["low", "medium", "high"]] = "medium"
+    start_date: Optional[datetime] = None
     due_date: Optional[datetime] = None
     order: Optional[int] = None
 
@@ -270,8 +392,10 @@ class TaskUpdate(BaseModel):
     title: Optional[str] = Field(default=None, min_length=1, max_length=200)
     description: Optional[str] = None
     assignee_id: Optional[int] = None
-    status: Optional[Literal["todo", "in_progress", "blocked", "done"]] = None
+    status: Optional[Literal["todo", "doing", "done", "canceled"]] = None
     priority: Optional[Literal["low", "medium", "high"]] = None
+    phase_id: Optional[int] = None   # başka faza taşıma
+    start_date: Optional[datetime] = None
     due_date: Optional[datetime] = None
     order: Optional[int] = None
 
@@ -282,14 +406,26 @@ class TaskOut(BaseModel):
     title: str
     description: Optional[str] = None
     assignee_id: Optional[int] = None
-    status: Literal["todo", "in_progress", "blocked", "done"]
-    priority: Literal["low", "medium", "high"]
+    status: Literal["todo", "doing", "done", "canceled"]
+    priority: Optional[Literal["low", "medium", "high"]] = None   # modelde henüz saklanmıyor
     order: int
+    start_date: Optional[datetime] = None
     due_date: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
     class Config:
         from_attributes = True
 
+class AssignedTaskOut(TaskOut):
+    """Kişinin görev listesi: proje/faz adları aynı sorguda gelir."""
+    project_title: str
+    phase_name: str
+
+class AssignedTaskPageOut(BaseModel):
+    items: List[AssignedTaskOut]
+    next_cursor: Optional[str] = None   # None → son sayfa
+
 class ReorderTasksIn(BaseModel):
     ordered_ids: List[int]
     
@@ -328,13 +464,55 @@ class PhaseDetailNoteBase(BaseModel):
 
 class PhaseDetailNoteCreate(PhaseDetailNoteBase):
     detail_id: int
-    user: str
+    user: Optional[str] = None  # yok sayılır; yazar current_user'dır
 
 class PhaseDetailNoteOut(PhaseDetailNoteBase):
     id: int
     detail_id: int
+    author_id: Optional[int] = None
     user: str
     created_at: datetime
     
     class Config:
         from_attributes = True
+
+class PhaseDetailNotePageOut(BaseModel):
+    items: List[PhaseDetailNoteOut]
+    total: int = 0                      # detayın toplam not sayısı (note_count)
+    next_cursor: Optional[str] = None   # None → son sayfa
+
+
+
+# ======================
+# SEARCH
+# ======================
+class SearchHitOut(BaseModel):
+    kind: Literal["project", "note", "detail", "task", "detail_note"]
+    ref_id: int
+    project_id: int
+    phase_id: Optional[int] = None
+    detail_id: Optional[int] = None
+    title: str
+    snippet: str
+    score: float
+
+class SearchPageOut(BaseModel):
+    items: List[SearchHitOut]
+    next_offset: Optional[int] = None   # None → son sayfa
+
+
+# ======================
+# PROJECT FULL (sayfa açılışı için tek istekte paket)
+# ======================
+class ProjectPhaseFullOut(ProjectPhaseOut):
+    details: List[PhaseDetail] = []   # iç içe ağaç (children dolu)
+
+class ProjectFullOut(BaseModel):
+    """include ile istenmeyen bölümler null döner."""
+    project: ProjectOut
+    members: Optional[List[ProjectMemberOut]] = None
+    notes: Optional[List[ProjectNoteOut]] = None
+    phases: Optional[List[ProjectPhaseFullOut]] = None
+    budget: Optional[BudgetSummaryOut] = None
+    files: Optional[List[ProjectFileOut]] = None
+    expenses: Optional[List[ExpenseOut]] = None
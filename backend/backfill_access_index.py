@@ -0,0 +1,26 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import SessionLocal, engine, Base
+from app.models import UserProjectAccess
+from app.core.access_index import rebuild_access_index
+
+def backfill():
+    # user_project_access tablosu yoksa oluştur
+    Base.metadata.create_all(bind=engine, tables=[UserProjectAccess.__table__])
+    db = SessionLocal()
+    try:
+        count = rebuild_access_index(db)
+        db.commit()
+        print(f"user_project_access rebuilt: {count} rows.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,26 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import Base, SessionLocal, engine
+from app.models import PhaseDetailClosure
+from app.core.detail_closure import rebuild_detail_closure
+
+def rebuild():
+    """phase_detail_closure tablosunu (yoksa oluşturup) phase_details.parent_id'lerden yeniden kurar."""
+    Base.metadata.create_all(bind=engine, tables=[PhaseDetailClosure.__table__])
+    db = SessionLocal()
+    try:
+        count = rebuild_detail_closure(db)
+        db.commit()
+        print(f"Closure rebuilt: {count} rows.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
@@ -0,0 +1,24 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import SessionLocal
+from app.core.rollups import rebuild_rollups
+
+def rebuild():
+    """Detayların alt ağaç toplamlarını closure tablosundan yeniden yazar (önce rebuild_detail_closure.py)."""
+    db = SessionLocal()
+    try:
+        count = rebuild_rollups(db)
+        db.commit()
+        print(f"Rollups rebuilt for {count} details.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
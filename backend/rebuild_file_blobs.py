@@ -0,0 +1,81 @@
+import sys
+import os
+import hashlib
+from collections import Counter
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.getcwd())
+
+from sqlalchemy import delete
+from app.db import engine, SessionLocal
+from app.core.blobs import BLOB_ROOT, BLOB_TMP, blob_path
+from app.models import FileBlob, ProjectFile
+
+CHUNK_SIZE = 1024 * 1024
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def sweep_orphans(live: set) -> int:
+    """
+    Referansı olmayan blob dosyalarını ve yarım kalmış .part'ları siler
+    (başarısız commit'ten kalanlar). Uygulama kapalıyken çalıştırılmalı.
+    """
+    removed = 0
+    for root, _, files in os.walk(BLOB_ROOT):
+        for name in files:
+            path = os.path.join(root, name)
+            if root == BLOB_TMP or (path == blob_path(name) and name not in live):
+                os.remove(path)
+                removed += 1
+    return removed
+
+def rebuild():
+    """
+    Eski (projects/{pid}/<uuid>) dosyaları içerik adresli depoya taşır; aynı içerik
+    zaten varsa kopya silinir. Ardından file_blobs.ref_count'lar ProjectFile
+    satırlarından yeniden sayılır; referanssız satırlar ve blob dosyaları silinir.
+    """
+    FileBlob.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        moved = deduped = missing = 0
+        for pf in db.query(ProjectFile):
+            if not os.path.exists(pf.stored_path):
+                missing += 1
+                continue
+            sha = pf.sha256 or _sha256(pf.stored_path)
+            target = blob_path(sha)
+            if pf.stored_path != target:
+                if os.path.exists(target):
+                    os.remove(pf.stored_path)
+                    deduped += 1
+                else:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(pf.stored_path, target)
+                    moved += 1
+                pf.stored_path = target
+            pf.sha256 = sha
+            pf.size_bytes = os.path.getsize(target)
+        db.flush()
+
+        refs = Counter(
+            (sha, size) for sha, size, path in
+            db.query(ProjectFile.sha256, ProjectFile.size_bytes, ProjectFile.stored_path)
+            if sha and path == blob_path(sha)
+        )
+        db.execute(delete(FileBlob))
+        db.add_all(FileBlob(sha256=sha, size_bytes=size, ref_count=n) for (sha, size), n in refs.items())
+        db.commit()
+        swept = sweep_orphans({sha for sha, _ in refs})
+        print(f"{moved} moved, {deduped} duplicate(s) removed, {missing} missing on disk, "
+              f"{len(refs)} blob(s), {swept} orphan file(s) removed.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
@@ -0,0 +1,24 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import SessionLocal
+from app.core.progress import rebuild_progress
+
+def rebuild():
+    """Faz sayaçlarını detay/görev tablolarından yeniden sayar, Project.progress'i yeniden yazar."""
+    db = SessionLocal()
+    try:
+        count = rebuild_progress(db)
+        db.commit()
+        print(f"Progress rebuilt for {count} projects.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
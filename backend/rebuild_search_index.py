@@ -0,0 +1,26 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import SessionLocal, engine, Base
+from app.models import SearchDocument
+from app.core.search import rebuild_search_index
+
+def rebuild():
+    # search_documents (ve SQLite'ta FTS5 tablosu) yoksa oluştur
+    Base.metadata.create_all(bind=engine, tables=[SearchDocument.__table__])
+    db = SessionLocal()
+    try:
+        count = rebuild_search_index(db)
+        db.commit()
+        print(f"Search index rebuilt: {count} documents.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
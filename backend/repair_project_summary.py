@@ -0,0 +1,24 @@
+import sys
+import os
+
+# Add the current directory to sys.path to make imports work
+sys.path.append(os.getcwd())
+
+from app.db import SessionLocal
+from app.core.project_summary import repair_project_summaries
+
+def repair():
+    """projects.member_count / owner_name / department_name alanlarını toplu yeniden hesaplar."""
+    db = SessionLocal()
+    try:
+        count = repair_project_summaries(db)
+        db.commit()
+        print(f"Project summaries repaired: {count} projects.")
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    repair()
@@ -0,0 +1,36 @@
+# backend/tests/conftest.py
+"""Geçici SQLite veritabanı üzerinde TestClient; app import edilmeden önce ortam ayarlanır."""
+import os
+import sys
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="trex-tests-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_DB_DIR, "test.db")
+os.environ["DUE_SCAN_INTERVAL_SECONDS"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.auth import hash_password  # noqa: E402
+from app.db import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import User, UserRole  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        db = SessionLocal()
+        db.add(User(name="alice", email="alice@example.com", password_hash=hash_password("pw"), role=UserRole.member))
+        db.commit()
+        db.close()
+        yield c
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    r = client.post("/auth/login", data={"username": "alice@example.com", "password": "pw"})
+    assert r.status_code == 200, r.text
+    return {"Authorization": "Bearer " + r.json()["access_token"]}
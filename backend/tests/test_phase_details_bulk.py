@@ -0,0 +1,28 @@
+# backend/tests/test_phase_details_bulk.py
+import pytest
+
+
+@pytest.fixture
+def details(client, auth_headers):
+    pid = client.post("/projects", json={"title": "Bulk"}, headers=auth_headers).json()["id"]
+    phase_id = client.post(f"/projects/{pid}/phases", json={"name": "P"}, headers=auth_headers).json()["id"]
+    return [
+        client.post("/phase-details/", json={"title": t, "phase_id": phase_id}, headers=auth_headers).json()["id"]
+        for t in ("a", "b")
+    ]
+
+
+@pytest.mark.parametrize("field", ["is_completed", "item_type", "title", "unit", "priority"])
+def test_bulk_update_rejects_null_for_not_null_fields(client, auth_headers, details, field):
+    bad, good = details
+    r = client.patch("/phase-details/", json={"items": [
+        {"id": bad, field: None},
+        {"id": good, "is_completed": True},
+    ]}, headers=auth_headers)
+
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["updated"] == 1
+    assert body["results"][0]["status"] == "invalid"
+    assert field in body["results"][0]["detail"]
+    assert body["results"][1]["status"] == "updated"
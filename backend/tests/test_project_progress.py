@@ -0,0 +1,17 @@
+# backend/tests/test_project_progress.py
+
+
+def test_manual_progress_only_without_phases(client, auth_headers):
+    pid = client.post("/projects", json={"title": "Progress"}, headers=auth_headers).json()["id"]
+    r = client.patch(f"/projects/{pid}", json={"progress": 40}, headers=auth_headers)
+    assert r.status_code == 200 and r.json()["progress"] == 40
+
+    phase_id = client.post(f"/projects/{pid}/phases", json={"name": "P"}, headers=auth_headers).json()["id"]
+    detail_id = client.post("/phase-details/", json={"title": "a", "phase_id": phase_id}, headers=auth_headers).json()["id"]
+    client.put(f"/phase-details/{detail_id}", json={"is_completed": True}, headers=auth_headers)
+    computed = client.get(f"/projects/{pid}", headers=auth_headers).json()["progress"]
+
+    r = client.patch(f"/projects/{pid}", json={"progress": 10}, headers=auth_headers)
+    assert r.status_code == 409
+    r = client.patch(f"/projects/{pid}", json={"progress": computed, "title": "Progress 2"}, headers=auth_headers)
+    assert r.status_code == 200 and r.json()["progress"] == computed
@@ -0,0 +1,25 @@
+# backend/tests/test_project_versioning.py
+from app.db import SessionLocal
+from app.models import User
+
+
+def test_owner_rename_invalidates_project_etags(client, auth_headers):
+    pid = client.post("/projects", json={"title": "Rename"}, headers=auth_headers).json()["id"]
+    r = client.get(f"/projects/{pid}/members", headers=auth_headers)
+    etag = r.headers["ETag"]
+    assert client.get(f"/projects/{pid}/members", headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "alice@example.com").one()
+        old_name, user.name = user.name, "Alice Renamed"
+        db.commit()
+
+        r = client.get(f"/projects/{pid}/members", headers={**auth_headers, "If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.headers["ETag"] != etag
+        assert client.get(f"/projects/{pid}", headers=auth_headers).json()["owner_name"] == "Alice Renamed"
+    finally:
+        user.name = old_name
+        db.commit()
+        db.close()
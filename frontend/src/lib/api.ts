@@ -207,9 +207,12 @@ export async function getProjectById(
   return apiGet<ProjectDetailDTO>(`/projects/${projectId}`);
 }
 
-/** Dashboard listesi için /projects */
-export async function getProjects(): Promise<ProjectListItemDTO[]> {
-  return apiGet<ProjectListItemDTO[]>("/projects");
+/** Dashboard listesi için /projects (keyset sayfalı: { items, next_cursor }) */
+export async function getProjects(
+  cursor?: string,
+): Promise<{ items: ProjectListItemDTO[]; next_cursor: string | null }> {
+  const qs = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  return apiGet<{ items: ProjectListItemDTO[]; next_cursor: string | null }>(`/projects${qs}`);
 }
 
 // =====================================
@@ -267,6 +270,17 @@ export type BackendPhaseCreate = {
 
 export type BackendPhaseUpdate = Partial<BackendPhaseCreate>;
 
+export type BackendPhaseBatch = {
+  create?: BackendPhaseCreate[];
+  update?: Array<BackendPhaseUpdate & { id: number }>;
+  delete?: number[];
+};
+
+export type BackendPhaseBatchResult = {
+  phases: BackendPhase[];   // işlem sonrası tüm fazlar (sıralı)
+  created_ids: number[];    // create listesiyle aynı sırada
+};
+
 // --- Phase Detail Types ---
 export interface BackendPhaseDetail {
   id: number;
@@ -293,6 +307,16 @@ export interface BackendPhaseDetail {
   end_date?: string | null;
   priority?: string | null;
   completed_at?: string | null;
+
+  // Alt ağaç toplamları (sunucuda tutulur, kendisi dahil)
+  rollup_effort?: number;
+  rollup_total?: number;
+  rollup_done?: number;
+  rollup_start?: string | null;
+  rollup_end?: string | null;
+
+  // Not sayısı (rozet için; notların kendisi ayrıca sayfalı çekilir)
+  note_count?: number;
 }
 
 export interface BackendPhaseDetailCreate {
@@ -338,6 +362,7 @@ export interface BackendPhaseDetailUpdate {
 export interface BackendPhaseDetailNote {
   id: number;
   detail_id: number;
+  author_id: number | null;
   user: string;
   note: string;
   created_at: string;
@@ -345,13 +370,29 @@ export interface BackendPhaseDetailNote {
 
 export interface BackendPhaseDetailNoteCreate {
   detail_id: number;
-  user: string;
   note: string;
 }
 
+export interface BackendPhaseDetailNotePage {
+  items: BackendPhaseDetailNote[];
+  total: number;
+  next_cursor: string | null;
+}
+
 // --- Note Functions ---
-export async function getPhaseDetailNotes(detailId: string): Promise<BackendPhaseDetailNote[]> {
-  return apiFetch<BackendPhaseDetailNote[]>(`/phase-details/${detailId}/notes`);
+// En yeniden eskiye, sayfalı; sonraki sayfa için dönen next_cursor verilir
+export async function getPhaseDetailNotes(
+  detailId: string,
+  cursor?: string | null,
+  limit = 20
+): Promise<BackendPhaseDetailNotePage> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) params.set("cursor", cursor);
+  return apiFetch<BackendPhaseDetailNotePage>(`/phase-details/${detailId}/notes?${params.toString()}`);
+}
+
+export async function deletePhaseDetailNote(noteId: number): Promise<void> {
+  return apiFetch<void>(`/phase-details/notes/${noteId}`, { method: "DELETE" });
 }
 
 export async function createPhaseDetailNote(data: BackendPhaseDetailNoteCreate): Promise<BackendPhaseDetailNote> {
@@ -377,14 +418,279 @@ export async function updateProjectPhase(projectId: string, phaseId: string, dat
   });
 }
 
+/** Çoklu faz oluşturma/güncelleme/silme — tek istek, tek transaction */
+export async function batchProjectPhases(projectId: string, data: BackendPhaseBatch): Promise<BackendPhaseBatchResult> {
+  return apiFetch<BackendPhaseBatchResult>(`/projects/${projectId}/phases:batch`, {
+    method: "POST",
+    body: JSON.stringify(data),
+  });
+}
+
 export async function deleteProjectPhase(projectId: string, phaseId: string): Promise<void> {
   return apiFetch<void>(`/projects/${projectId}/phases/${phaseId}`, {
     method: "DELETE",
   });
 }
 
+// --- Project Full (tek istekte proje sayfası) ---
+
+export type ProjectFullSection = "members" | "notes" | "phases" | "budget" | "files" | "expenses";
+
+export type BackendProjectFull = {
+  project: {
+    id: number;
+    title: string;
+    status: string;
+    priority: string;
+    progress: number;
+    owner_id: number | null;
+    start_date: string | null;
+    end_date: string | null;
+    created_at: string;
+    team_size: number;
+  };
+  members: Array<{
+    id: number;
+    user_id: number;
+    role_in_project?: string | null;
+    user_name?: string | null;
+    user_email?: string | null;
+  }> | null;
+  notes: Array<{
+    id: number;
+    content: string;
+    created_at: string;
+    author_name?: string | null;
+  }> | null;
+  /** details: iç içe ağaç (children dolu) */
+  phases: Array<BackendPhase & { details: BackendPhaseDetail[] }> | null;
+  budget: {
+    total_budget: number | string;
+    spent_amount: number | string;
+    remaining: number | string;
+    percent_used: number;
+  } | null;
+  files: Array<{
+    id: number;
+    filename: string;
+    content_type?: string | null;
+    size_bytes?: number | null;
+    sha256?: string | null;
+    created_at: string;
+  }> | null;
+  expenses: Array<{
+    id: number;
+    amount: number | string;
+    note?: string | null;
+    created_at: string;
+  }> | null;
+};
+
+/** include verilmezse tüm bölümler döner */
+export async function getProjectFull(
+  projectId: string,
+  include?: ProjectFullSection[],
+): Promise<BackendProjectFull> {
+  const qs = include && include.length ? `?include=${include.join(",")}` : "";
+  return apiGet<BackendProjectFull>(`/projects/${projectId}/full${qs}`);
+}
+
 // --- Phase Detail Functions ---
 
+export interface BackendPhaseDetailGroup {
+  phase_id: number;
+  details: BackendPhaseDetail[];
+}
+
+// Projenin tüm fazlarının detay ağaçları tek istekte (faz sırasıyla)
+export async function getProjectPhaseDetails(projectId: string): Promise<BackendPhaseDetailGroup[]> {
+  return apiGet<BackendPhaseDetailGroup[]>(`/projects/${projectId}/phase-details`);
+}
+
+// Gantt akışı: sütunlu (paralel diziler), tarihler epoch saniye
+export interface BackendGantt {
+  project_id: number;
+  from: number | null;
+  to: number | null;
+  phases: {
+    ids: number[];
+    names: string[];
+    starts: (number | null)[];
+    ends: (number | null)[];
+    statuses: string[];
+    progress: number[];
+  };
+  items: {
+    ids: number[];
+    phase_ids: number[];
+    parent_ids: (number | null)[];
+    titles: string[];
+    starts: (number | null)[];
+    ends: (number | null)[];
+    completed: (0 | 1)[];
+    priorities: (string | null)[];
+    types: (string | null)[];
+  };
+}
+
+// from/to verilirse yalnızca pencereyle kesişen kayıtlar (ve ataları) döner
+export async function getProjectGantt(projectId: string, from?: Date, to?: Date): Promise<BackendGantt> {
+  const params = new URLSearchParams();
+  if (from) params.set("from", from.toISOString().slice(0, 19));
+  if (to) params.set("to", to.toISOString().slice(0, 19));
+  const qs = params.toString();
+  return apiGet<BackendGantt>(`/projects/${projectId}/gantt${qs ? `?${qs}` : ""}`);
+}
+
+// Detaylar arası bitiş→başlangıç bağımlılıkları ve kritik yol zamanlaması
+export interface BackendDependency {
+  id: number;
+  project_id: number;
+  predecessor_id: number;
+  successor_id: number;
+  lag_days: number;
+}
+
+export interface BackendScheduleItem {
+  id: number;
+  early_start: string;
+  early_finish: string;
+  late_start: string;
+  late_finish: string;
+  slack_days: number;
+  critical: boolean;
+}
+
+export interface BackendSchedule {
+  project_id: number;
+  version: number;
+  project_start: string | null;
+  project_finish: string | null;
+  critical_path: number[];
+  items: BackendScheduleItem[];
+}
+
+export async function getProjectDependencies(projectId: string): Promise<BackendDependency[]> {
+  return apiGet<BackendDependency[]>(`/projects/${projectId}/dependencies`);
+}
+
+export async function createDependency(
+  projectId: string,
+  predecessorId: number,
+  successorId: number,
+  lagDays = 0
+): Promise<BackendDependency> {
+  return apiFetch<BackendDependency>(`/projects/${projectId}/dependencies`, {
+    method: "POST",
+    body: JSON.stringify({ predecessor_id: predecessorId, successor_id: successorId, lag_days: lagDays }),
+  });
+}
+
+export async function updateDependencyLag(projectId: string, depId: number, lagDays: number): Promise<BackendDependency> {
+  return apiFetch<BackendDependency>(`/projects/${projectId}/dependencies/${depId}`, {
+    method: "PATCH",
+    body: JSON.stringify({ lag_days: lagDays }),
+  });
+}
+
+export async function deleteDependency(projectId: string, depId: number): Promise<void> {
+  return apiFetch<void>(`/projects/${projectId}/dependencies/${depId}`, { method: "DELETE" });
+}
+
+export async function getProjectSchedule(projectId: string): Promise<BackendSchedule> {
+  return apiGet<BackendSchedule>(`/projects/${projectId}/schedule`);
+}
+
+// Gecikmiş / yakında teslim özeti (sunucuda periyodik taramayla hazırlanır)
+export type BackendDueState = "overdue" | "due_soon";
+
+export interface BackendDueItem {
+  kind: "project" | "task" | "detail";
+  ref_id: number;
+  project_id: number;
+  phase_id: number | null;
+  assignee_id: number | null;
+  title: string;
+  due_at: string;
+  state: BackendDueState;
+  scanned_at: string;
+}
+
+export interface BackendDueSummary {
+  project_id: number;
+  overdue: number;
+  due_soon: number;
+}
+
+export async function getDueSummary(): Promise<BackendDueSummary[]> {
+  return apiGet<BackendDueSummary[]>(`/due/summary`);
+}
+
+export async function getMyDue(state?: BackendDueState): Promise<BackendDueItem[]> {
+  return apiGet<BackendDueItem[]>(`/me/due${state ? `?state=${state}` : ""}`);
+}
+
+export async function getProjectDue(projectId: string, state?: BackendDueState): Promise<BackendDueItem[]> {
+  return apiGet<BackendDueItem[]>(`/projects/${projectId}/due${state ? `?state=${state}` : ""}`);
+}
+
+// Kişiye atanmış görevler (tüm projelerde), due_date'e göre keyset sayfalı
+export type BackendTaskStatus = "todo" | "doing" | "done" | "canceled";
+
+export interface BackendAssignedTask {
+  id: number;
+  project_id: number;
+  phase_id: number;
+  title: string;
+  description?: string | null;
+  assignee_id?: number | null;
+  status: BackendTaskStatus;
+  order: number;
+  start_date?: string | null;
+  due_date?: string | null;
+  completed_at?: string | null;
+  created_at: string;
+  updated_at?: string | null;
+  project_title: string;
+  phase_name: string;
+}
+
+export interface BackendAssignedTaskPage {
+  items: BackendAssignedTask[];
+  next_cursor: string | null;
+}
+
+export interface AssignedTaskQuery {
+  status?: BackendTaskStatus[];
+  dueFrom?: string;
+  dueTo?: string;
+  sort?: "due_date" | "-due_date";
+  limit?: number;
+  cursor?: string | null;
+}
+
+function assignedTaskParams(q: AssignedTaskQuery): string {
+  const params = new URLSearchParams();
+  q.status?.forEach((s) => params.append("status", s));
+  if (q.dueFrom) params.set("due_from", q.dueFrom);
+  if (q.dueTo) params.set("due_to", q.dueTo);
+  if (q.sort) params.set("sort", q.sort);
+  if (q.limit) params.set("limit", String(q.limit));
+  if (q.cursor) params.set("cursor", q.cursor);
+  const qs = params.toString();
+  return qs ? `?${qs}` : "";
+}
+
+export async function getMyTasks(q: AssignedTaskQuery = {}): Promise<BackendAssignedTaskPage> {
+  return apiGet<BackendAssignedTaskPage>(`/me/tasks${assignedTaskParams(q)}`);
+}
+
+// Yöneticiler için: admin/departman başkanı tümünü, proje yöneticisi kendi projelerindekileri görür
+export async function getUserTasks(userId: number, q: AssignedTaskQuery = {}): Promise<BackendAssignedTaskPage> {
+  return apiGet<BackendAssignedTaskPage>(`/users/${userId}/tasks${assignedTaskParams(q)}`);
+}
+
+// Fazın detay ağacı: yalnızca kök düğümler, alt detaylar children içinde
 export async function getPhaseDetails(phaseId: string): Promise<BackendPhaseDetail[]> {
   return apiGet<BackendPhaseDetail[]>(`/phase-details/phase/${phaseId}`);
 }
@@ -403,6 +709,78 @@ export async function updatePhaseDetail(detailId: string, data: BackendPhaseDeta
   });
 }
 
+export type BackendPhaseDetailBulkItem = BackendPhaseDetailUpdate & { id: number };
+
+export interface BackendPhaseDetailBulkResult {
+  id: number;
+  status: "updated" | "not_found" | "forbidden" | "invalid";
+  detail?: string | null;
+  completed_at?: string | null;
+  updated_at?: string | null;
+}
+
+export async function bulkUpdatePhaseDetails(
+  items: BackendPhaseDetailBulkItem[]
+): Promise<{ results: BackendPhaseDetailBulkResult[]; updated: number }> {
+  return apiFetch<{ results: BackendPhaseDetailBulkResult[]; updated: number }>(`/phase-details/`, {
+    method: "PATCH",
+    body: JSON.stringify({ items }),
+  });
+}
+
+// Kısa aralıkla gelen detay güncellemelerini (Gantt sürükleme, art arda işaretleme)
+// tek PATCH isteğinde toplar; aynı detaya gelen alanlar birleştirilir.
+const pendingDetailUpdates = new Map<number, {
+  data: BackendPhaseDetailUpdate;
+  waiters: Array<{ resolve: (r: BackendPhaseDetailBulkResult) => void; reject: (e: unknown) => void }>;
+}>();
+let detailFlushTimer: ReturnType<typeof setTimeout> | null = null;
+
+async function flushDetailUpdates() {
+  detailFlushTimer = null;
+  const batch = Array.from(pendingDetailUpdates.entries());
+  pendingDetailUpdates.clear();
+  try {
+    const { results } = await bulkUpdatePhaseDetails(batch.map(([id, e]) => ({ id, ...e.data })));
+    const byId = new Map(results.map(r => [r.id, r]));
+    batch.forEach(([id, e]) => {
+      const r = byId.get(id);
+      e.waiters.forEach(w => r && r.status === "updated" ? w.resolve(r) : w.reject(r ?? new Error("No result")));
+    });
+  } catch (err) {
+    batch.forEach(([, e]) => e.waiters.forEach(w => w.reject(err)));
+  }
+}
+
+export function queuePhaseDetailUpdate(
+  detailId: string | number,
+  data: BackendPhaseDetailUpdate
+): Promise<BackendPhaseDetailBulkResult> {
+  return new Promise((resolve, reject) => {
+    const id = Number(detailId);
+    const entry = pendingDetailUpdates.get(id) ?? { data: {}, waiters: [] };
+    entry.data = { ...entry.data, ...data };
+    entry.waiters.push({ resolve, reject });
+    pendingDetailUpdates.set(id, entry);
+    if (!detailFlushTimer) detailFlushTimer = setTimeout(flushDetailUpdates, 150);
+  });
+}
+
+// Detayı kardeşleri arasında taşır: afterId'nin arkasına / beforeId'nin önüne (sunucuda tek satır yazılır)
+export async function movePhaseDetail(
+  detailId: string,
+  afterId?: string | null,
+  beforeId?: string | null
+): Promise<BackendPhaseDetail> {
+  return apiFetch<BackendPhaseDetail>(`/phase-details/${detailId}/move`, {
+    method: "POST",
+    body: JSON.stringify({
+      after_id: afterId ? Number(afterId) : null,
+      before_id: beforeId ? Number(beforeId) : null,
+    }),
+  });
+}
+
 export async function deletePhaseDetail(detailId: string): Promise<void> {
   return apiFetch<void>(`/phase-details/${detailId}`, {
     method: "DELETE",
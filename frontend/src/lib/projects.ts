@@ -43,6 +43,8 @@ export type ProjectQuery = {
   size?: number;
   skip?: number;
   limit?: number;
+  cursor?: string; // keyset sayfalama: önceki yanıttaki next_cursor
+  sort?: string;   // "-created_at" | "title" | "end_date" ...
 };
 
 export type CreateProjectInput = {
@@ -119,6 +121,7 @@ export async function fetchProjects(params: ProjectQuery = {}) {
   const items = list.map(adaptProject);
   return {
     items,            // CardProject[]
+    nextCursor: (raw?.next_cursor ?? null) as string | null, // null → son sayfa
     __debug_raw: raw, // istersen Network/Console'da bakarsın
   };
 }
@@ -10,6 +10,9 @@ import { fetchProjects, updateProject } from "@/lib/projects";
 import type { ApiProject } from "@/lib/projects";
 import { getProfileName, logout } from "@/lib/auth";
 
+/** /projects sayfa boyutu (backend en fazla 200 kabul eder) */
+const PAGE_SIZE = 50;
+
 /** Backend -> UI status dönüştürücü (UI'da "hold" için özel rozet yok; "risk" -> "at-risk") */
 const toUiStatus = (s?: string): CardProject["status"] => {
   if (!s) return "planning";
@@ -67,6 +70,8 @@ export default function Dashboard() {
 
   const [filter, setFilter] = useState<"all" | "active" | "important" | "done">("all");
   const [addOpen, setAddOpen] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     let alive = true;
@@ -76,12 +81,13 @@ export default function Dashboard() {
         setLoading(true);
         setError(null);
 
-        // Sayfalama istersen: fetchProjects({ page: 1, size: 50 })
-        const res = await fetchProjects({});
+        // Keyset sayfalama: ilk sayfa; devamı "Daha fazla" ile next_cursor'dan
+        const res = await fetchProjects({ limit: PAGE_SIZE });
         if (!alive) return;
 
         const items = (res.items ?? []).map(toCardProject);
         setProjects(items);
+        setNextCursor(res.nextCursor);
       } catch (e: any) {
         if (!alive) return;
         setError(e?.message || "Projeler alınamadı.");
@@ -106,6 +112,20 @@ export default function Dashboard() {
     });
   }, [projects, filter]);
 
+  async function handleLoadMore() {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const res = await fetchProjects({ limit: PAGE_SIZE, cursor: nextCursor });
+      setProjects((prev) => [...prev, ...(res.items ?? []).map(toCardProject)]);
+      setNextCursor(res.nextCursor);
+    } catch (e: any) {
+      setError(e?.message || "Projeler alınamadı.");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   function handleLogout() {
     logout();
     navigate("/login", { replace: true });
@@ -230,6 +250,12 @@ export default function Dashboard() {
                   "Proje bulunamadı."}
             </div>
           )}
+
+          {!loading && !error && nextCursor && (
+            <button className="btn soft" onClick={handleLoadMore} disabled={loadingMore}>
+              {loadingMore ? "Yükleniyor…" : "Daha fazla"}
+            </button>
+          )}
         </section>
 
         <CreateProjectPanel
@@ -29,12 +29,12 @@ import {
   apiFetch,
   createProjectPhase,
   updateProjectPhase,
+  batchProjectPhases,
   deleteProjectPhase,
-  getPhaseDetails,
+  getProjectFull,
   createPhaseDetail,
-  updatePhaseDetail,
+  queuePhaseDetailUpdate,
   deletePhaseDetail,
-  BackendPhase,
   BackendPhaseDetail,
   BackendPhaseDetailUpdate,
   createProjectNote,
@@ -237,6 +237,19 @@ function buildTree(items: BackendPhaseDetail[]): any[] {
   return roots;
 }
 
+// Helper: Flatten nested detail tree (children) into a flat list
+function flattenDetails(items: BackendPhaseDetail[]): BackendPhaseDetail[] {
+  const out: BackendPhaseDetail[] = [];
+  const walk = (nodes: BackendPhaseDetail[]) => {
+    for (const n of nodes) {
+      out.push(n);
+      if (n.children) walk(n.children);
+    }
+  };
+  walk(items);
+  return out;
+}
+
 // Helper: Recursive find and update
 function updateItemInTree(items: any[], itemId: string, updates: any): any[] {
   return items.map(item => {
@@ -313,22 +326,23 @@ function calculateProgress(phases: ExtendedPhase[]): number {
 
 /** Backend'leri tek seferde çekip UI şekline çevirir */
 async function fetchFullProject(id: string): Promise<FullProject> {
-  const [base, detail, phases, budget, files, expenses] = await Promise.all([
-    apiGet<BackendProject>(`/projects/${id}`),
-    apiGet<BackendProjectDetail>(`/projects/${id}/detail`).catch(() => null),
-    apiGet<BackendPhase[]>(`/projects/${id}/phases`).catch(() => []),
-    apiGet<BackendBudget>(`/projects/${id}/budget`).catch(() => null),
-    apiGet<BackendFile[]>(`/projects/${id}/files`).catch(() => []),
-    apiGet<BackendExpense[]>(`/projects/${id}/expenses`).catch(() => []),
-  ]);
-
-  // Fetch details for all phases in parallel
-  const phasesWithDetails = await Promise.all(
-    phases.map(async (p) => {
-      const details = await getPhaseDetails(String(p.id)).catch(() => []);
-      return { ...p, details };
-    })
-  );
+  // Tek istek: proje + üyeler + notlar + fazlar (detay ağaçlarıyla) + bütçe + dosyalar + harcamalar
+  const full = await getProjectFull(id);
+  const base: BackendProject = full.project;
+  const detail: BackendProjectDetail = {
+    ...full.project,
+    members: full.members ?? [],
+    notes: full.notes ?? [],
+  };
+  const budget: BackendBudget | null = full.budget;
+  const files: BackendFile[] = full.files ?? [];
+  const expenses: BackendExpense[] = full.expenses ?? [];
+
+  // buildTree düz liste bekler; sunucudan gelen iç içe ağacı düzleştir
+  const phasesWithDetails = (full.phases ?? []).map((p) => ({
+    ...p,
+    details: flattenDetails(p.details),
+  }));
 
   const members = detail?.members ?? [];
   const team: Member[] = members.map((m) => ({
@@ -404,8 +418,8 @@ async function fetchFullProject(id: string): Promise<FullProject> {
     detail?.status ?? base.status ?? "planning",
   );
 
-  // Calculate progress dynamically
-  const calculatedProgress = calculateProgress(phasesUi);
+  // İlerleme sunucuda detay/görev sayaçlarından tutulur; fazı yoksa yerel hesap
+  const calculatedProgress = full.phases?.length ? (base.progress ?? 0) : calculateProgress(phasesUi);
 
   return {
     id: String(detail?.id ?? base.id),
@@ -731,28 +745,26 @@ export default function ProjectDetail() {
     if (!hasDefaults) return currentPhases;
 
     try {
-      const newPhases = [...currentPhases];
+      // Tüm varsayılan fazlar tek batch isteğiyle (tek transaction) oluşturulur
+      const pending = currentPhases
+        .map((p, index) => ({ p, index }))
+        .filter(({ p }) => p.id.startsWith("def"));
+
+      const res = await batchProjectPhases(project.id, {
+        create: pending.map(({ p, index }) => ({
+          name: p.name,
+          start_date: p.start,
+          end_date: p.end,
+          status: p.status as any,
+          sort_order: index + 1,
+        })),
+      });
 
-      // We process sequentially or parallel? Parallel is faster but we need to be careful with order if backend relies on insertion order for something (though we send sort_order).
-      // Let's use Promise.all
-      await Promise.all(newPhases.map(async (p, index) => {
-        if (p.id.startsWith("def")) {
-          const res = await createProjectPhase(project.id, {
-            name: p.name,
-            start_date: p.start,
-            end_date: p.end,
-            status: p.status as any,
-            sort_order: index + 1
-          });
-
-          // Update with real ID
-          newPhases[index] = {
-            ...p,
-            id: String(res.id),
-            // Keep items if any (though defaults usually have none)
-          };
-        }
-      }));
+      // Update with real IDs (created_ids create listesiyle aynı sırada)
+      const newPhases = [...currentPhases];
+      pending.forEach(({ p, index }, i) => {
+        newPhases[index] = { ...p, id: String(res.created_ids[i]) };
+      });
 
       return newPhases;
     } catch (err) {
@@ -812,32 +824,12 @@ export default function ProjectDetail() {
       const index = project.phases.findIndex(p => p.id === id);
       if (index === -1) return;
 
-      const persisted = await persistDefaultPhases(project.phases);
+      // Güncellemeyi önce yerel listeye uygula; böylece kalıcılaştırma tek istekte olur
+      const withUpdate = project.phases.map((p, i) => i === index ? { ...p, ...updates } : p);
+      const persisted = await persistDefaultPhases(withUpdate);
       if (!persisted) return;
 
-      // Now apply the update to the specific phase (which now has a real ID)
-      const realPhase = persisted[index];
-      const newId = realPhase.id;
-
-      // Optimistic update on the already persisted list
-      const updatedList = persisted.map((p, i) => i === index ? { ...p, ...updates } : p);
-      setProject(prev => prev ? { ...prev, phases: updatedList } : prev);
-
-      try {
-        // Send the specific update to backend
-        const backendUpdates: any = {};
-        if (updates.name) backendUpdates.name = updates.name;
-        if (updates.start) backendUpdates.start_date = updates.start;
-        if (updates.end) backendUpdates.end_date = updates.end;
-        if (updates.status) backendUpdates.status = updates.status;
-
-        if (Object.keys(backendUpdates).length > 0) {
-          await updateProjectPhase(project.id, newId, backendUpdates);
-        }
-      } catch (err: any) {
-        console.error("Failed to update phase after persist", err);
-        alert("Faz güncellenemedi: " + (err.message || err));
-      }
+      setProject(prev => prev ? { ...prev, phases: persisted } : prev);
       return;
     }
 
@@ -889,24 +881,12 @@ export default function ProjectDetail() {
     }
   }
 
-  // Helper to calculate and save progress
-  async function updateProjectProgress(currentPhases: ExtendedPhase[]) {
+  // Helper: optimistic progress (sunucu detay/görev değişiminde kendi sayaçlarıyla günceller)
+  function updateProjectProgress(currentPhases: ExtendedPhase[]) {
     if (!project) return;
 
     const newProgress = calculateProgress(currentPhases);
-
-    // Optimistic update for progress
     setProject(prev => prev ? { ...prev, progress: newProgress } : prev);
-
-    // Save to backend
-    try {
-      await apiFetch(`/projects/${project.id}`, {
-        method: "PATCH",
-        body: JSON.stringify({ progress: newProgress })
-      });
-    } catch (err) {
-      console.error("Failed to update project progress", err);
-    }
   }
 
   // --- Item Handlers ---
@@ -979,7 +959,8 @@ export default function ProjectDetail() {
       if (updates.title) backendUpdates.title = updates.title;
       if (updates.completed !== undefined) backendUpdates.is_completed = updates.completed;
 
-      await updatePhaseDetail(itemId, backendUpdates);
+      // art arda işaretlemeler tek toplu istekte gider
+      await queuePhaseDetailUpdate(itemId, backendUpdates);
     } catch (err) {
       console.error("Failed to update item", err);
     }
@@ -4,13 +4,14 @@ import Navbar from "@/components/Navbar";
 import { ArrowLeft, Search, Layout, Plus, X, ChevronRight, ChevronLeft, ChevronDown, Filter, MessageSquare, Send, CheckCircle2, Check, Download } from "lucide-react";
 import { getProfileName } from "@/lib/auth";
 import {
-    apiGet,
     BackendPhase,
     BackendPhaseDetail,
-    getPhaseDetails,
+    getProjectFull,
     updatePhaseDetail,
     createPhaseDetail,
     deletePhaseDetail,
+    movePhaseDetail,
+    queuePhaseDetailUpdate,
     getPhaseDetailNotes,
     createPhaseDetailNote,
     BackendPhaseDetailNote,
@@ -437,6 +438,7 @@ export default function ProjectFullPlan() {
     // Notes State
     const [activeNoteItem, setActiveNoteItem] = useState<PlanItem | null>(null);
     const [notes, setNotes] = useState<BackendPhaseDetailNote[]>([]);
+    const [notesCursor, setNotesCursor] = useState<string | null>(null);
     const [newNote, setNewNote] = useState("");
 
     // Refs for Scroll Sync
@@ -475,50 +477,26 @@ export default function ProjectFullPlan() {
                     details: newDetails
                 };
                 setPhases(updatedPhases);
+                // Sunucuya yalnızca taşınan satırın yeni komşularını gönder
+                const prev = newDetails[newIndex - 1];
+                const next = newDetails[newIndex + 1];
+                movePhaseDetail(String(active.id), prev ? String(prev.id) : null, next ? String(next.id) : null)
+                    .catch(err => {
+                        console.error("Failed to move detail:", err);
+                        fetchData();
+                    });
             }
         }
     };
 
-    // Build tree from flat list
-    const buildPhaseTree = (details: BackendPhaseDetail[]): BackendPhaseDetail[] => {
-        const map = new Map<number, BackendPhaseDetail>();
-        const roots: BackendPhaseDetail[] = [];
-
-        // Initialize map and children array
-        details.forEach(item => {
-            map.set(item.id, { ...item, children: [] });
-        });
-
-        // Build tree
-        details.forEach(item => {
-            const node = map.get(item.id);
-            if (!node) return;
-
-            if (item.parent_id && map.has(item.parent_id)) {
-                const parent = map.get(item.parent_id);
-                parent?.children?.push(node);
-            } else {
-                roots.push(node);
-            }
-        });
-
-        return roots;
-    };
-
     // Fetch Data
     const fetchData = async () => {
         if (!id) return;
         setLoading(true);
         try {
-            const phasesData = await apiGet<BackendPhase[]>(`/projects/${id}/phases`);
-            const phasesWithDetails = await Promise.all(
-                phasesData.map(async (p) => {
-                    const details = await getPhaseDetails(String(p.id)).catch(() => []);
-                    // Convert flat list to tree
-                    const treeDetails = buildPhaseTree(details);
-                    return { ...p, details: treeDetails };
-                })
-            );
+            // Fazlar + detay ağaçları tek istekte (sunucu ağacı kurup gönderir)
+            const full = await getProjectFull(id, ["phases"]);
+            const phasesWithDetails: PhaseWithDetails[] = full.phases ?? [];
             setPhases(phasesWithDetails);
             if (!activePhaseId && phasesWithDetails.length > 0) {
                 setActivePhaseId(phasesWithDetails[0].id);
@@ -541,11 +519,28 @@ export default function ProjectFullPlan() {
     // Fetch notes when activeNoteItem changes
     useEffect(() => {
         if (activeNoteItem) {
-            getPhaseDetailNotes(activeNoteItem.id).then(setNotes).catch(console.error);
+            getPhaseDetailNotes(activeNoteItem.id)
+                .then(page => {
+                    setNotes(page.items);
+                    setNotesCursor(page.next_cursor);
+                })
+                .catch(console.error);
         } else {
             setNotes([]);
+            setNotesCursor(null);
+        }
+    }, [activeNoteItem?.id]);
+
+    const loadMoreNotes = async () => {
+        if (!activeNoteItem || !notesCursor) return;
+        try {
+            const page = await getPhaseDetailNotes(activeNoteItem.id, notesCursor);
+            setNotes(prev => [...prev, ...page.items]);
+            setNotesCursor(page.next_cursor);
+        } catch (err) {
+            console.error("Failed to load notes:", err);
         }
-    }, [activeNoteItem]);
+    };
 
     const activePhase = phases.find(p => p.id === activePhaseId);
 
@@ -554,6 +549,8 @@ export default function ProjectFullPlan() {
         let flatList: PlanItem[] = [];
         const traverse = (items: BackendPhaseDetail[]) => {
             items.forEach(item => {
+                // Alt başlıklar kendi değeri yoksa sunucudaki alt ağaç toplamlarını gösterir
+                const isGroup = item.item_type === "sub_phase";
                 flatList.push({
                     id: String(item.id),
                     action: item.title,
@@ -561,10 +558,10 @@ export default function ProjectFullPlan() {
                     scope: item.scope || "",
                     reference: item.reference || "",
                     responsible: item.responsible || "",
-                    effort: item.effort || 0,
+                    effort: item.effort || (isGroup ? item.rollup_effort || 0 : 0),
                     unit: item.unit || "Saat",
-                    start_date: item.start_date || null,
-                    end_date: item.end_date || null,
+                    start_date: item.start_date || (isGroup ? item.rollup_start || null : null),
+                    end_date: item.end_date || (isGroup ? item.rollup_end || null : null),
                     priority: item.priority || "Normal",
                     category: phaseName,
                     original: item,
@@ -689,7 +686,13 @@ export default function ProjectFullPlan() {
     const handleToggleComplete = async (item: PlanItem) => {
         try {
             const newStatus = !item.original.is_completed;
-            const updatedDetail = await updatePhaseDetail(item.id, { is_completed: newStatus });
+            const result = await queuePhaseDetailUpdate(item.id, { is_completed: newStatus });
+            const updatedDetail: BackendPhaseDetail = {
+                ...item.original,
+                is_completed: newStatus,
+                completed_at: result.completed_at ?? null,
+                updated_at: result.updated_at ?? item.original.updated_at,
+            };
 
             const updatedPhases = phases.map(p => {
                 if (p.id === activePhaseId) {
@@ -783,11 +786,17 @@ export default function ProjectFullPlan() {
         try {
             const note = await createPhaseDetailNote({
                 detail_id: parseInt(activeNoteItem.id),
-                user: username || "Unknown",
                 note: newNote
             });
-            setNotes([...notes, note]);
+            // liste en yeniden eskiye; rozet sayacı yerelde artırılır
+            setNotes([note, ...notes]);
             setNewNote("");
+            const noteCount = (activeNoteItem.original.note_count ?? 0) + 1;
+            setPhases(prev => prev.map(p => ({
+                ...p,
+                details: updateItemInTree(p.details, activeNoteItem.id, { note_count: noteCount })
+            })));
+            setActiveNoteItem({ ...activeNoteItem, original: { ...activeNoteItem.original, note_count: noteCount } });
         } catch (err) {
             console.error("Failed to add note:", err);
         }
@@ -811,7 +820,7 @@ export default function ProjectFullPlan() {
             });
             setPhases(updatedPhases);
 
-            await updatePhaseDetail(editingDates.itemId, {
+            await queuePhaseDetailUpdate(editingDates.itemId, {
                 start_date: editingDates.start,
                 end_date: editingDates.end
             });
@@ -1442,6 +1451,9 @@ export default function ProjectFullPlan() {
                                                         title="Notlar"
                                                     >
                                                         <MessageSquare size={14} />
+                                                        {(item.original.note_count ?? 0) > 0 && (
+                                                            <span style={{ fontSize: '10px', marginLeft: '2px' }}>{item.original.note_count}</span>
+                                                        )}
                                                     </button>
                                                 </div>
 
@@ -1550,6 +1562,11 @@ export default function ProjectFullPlan() {
                                     </div>
                                 ))
                             )}
+                            {notesCursor && (
+                                <button onClick={loadMoreNotes} style={{ ...styles.btnSoft, fontSize: '12px', width: '100%' }}>
+                                    Daha eski notlar
+                                </button>
+                            )}
                         </div>
                         <div style={styles.notesFooter}>
                             <input